@@ -0,0 +1,117 @@
+"""
+동시 스트림 벤치마크 - 한 워커에서 N개의 SSE 스트림이 병렬로 진행되는지 확인
+
+블로킹 Agent Engine 스트림(이벤트마다 time.sleep)을 흉내 낸 엔진으로
+1) 기존 방식: async 제너레이터 안에서 동기 stream_message() 순회
+2) 비동기 방식: astream_message() (스레드 브리지)
+를 비교한다. 동시에 10ms 주기의 프로브 태스크를 돌려 이벤트 루프 지연
+(= 같은 워커의 /health 응답 지연)을 측정한다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_concurrent_streams.py --streams 20 --events 30 --delay 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.chat_service import ChatService
+
+
+class SlowEngine:
+    """이벤트마다 블로킹 지연이 있는 가짜 Agent Engine"""
+
+    def __init__(self, events: int, delay: float):
+        self.events = events
+        self.delay = delay
+
+    def stream_query(self, user_id: str, session_id: str, message: str):
+        for i in range(self.events):
+            time.sleep(self.delay)
+            yield {"content": {"parts": [{"text": f"청크{i} "}]}}
+
+
+def make_service(events: int, delay: float) -> ChatService:
+    return ChatService(engine=SlowEngine(events, delay))
+
+
+async def blocking_stream(service: ChatService, idx: int):
+    """기존 라우터 방식 - async 제너레이터 안에서 동기 순회"""
+    for char in service.stream_message(f"u{idx}", f"s{idx}", "안녕"):
+        yield char
+
+
+async def consume(stream, start: float) -> dict:
+    """start(모든 요청이 도착한 시각) 기준으로 첫 청크/완료 시간 측정"""
+    first = None
+    count = 0
+    async for _ in stream:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+        await asyncio.sleep(0)  # 소켓 send 양보 흉내
+    return {"ttft": first or 0.0, "total": time.perf_counter() - start, "chunks": count}
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    """10ms 주기로 깨어나며 이벤트 루프 지연 측정"""
+    interval = 0.01
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - before - interval)
+
+
+async def run_mode(mode: str, streams: int, events: int, delay: float) -> dict:
+    service = make_service(events, delay)
+    stop = asyncio.Event()
+    lags: list = []
+    probe_task = asyncio.create_task(probe(stop, lags))
+
+    if mode == "blocking":
+        make = lambda i: blocking_stream(service, i)
+    else:
+        make = lambda i: service.astream_message(f"u{i}", f"s{i}", "안녕")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(consume(make(i), start) for i in range(streams)))
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+
+    ttfts = sorted(r["ttft"] for r in results)
+    return {
+        "mode": mode,
+        "wall": wall,
+        "ttft_p50": ttfts[len(ttfts) // 2],
+        "ttft_max": ttfts[-1],
+        "loop_lag_max": max(lags) if lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 SSE 스트림 벤치마크")
+    parser.add_argument("--streams", type=int, default=20, help="동시 스트림 수")
+    parser.add_argument("--events", type=int, default=30, help="스트림당 엔진 이벤트 수")
+    parser.add_argument("--delay", type=float, default=0.02, help="이벤트당 블로킹 지연 (초)")
+    args = parser.parse_args()
+
+    ideal = args.events * args.delay
+    print(f"streams={args.streams} events={args.events} delay={args.delay}s "
+          f"(스트림 1개 단독 소요 ≈ {ideal:.2f}s)\n")
+    print(f"{'mode':<10}{'wall(s)':>10}{'ttft p50':>12}{'ttft max':>12}{'loop lag max':>15}")
+
+    for mode in ("blocking", "async"):
+        r = asyncio.run(run_mode(mode, args.streams, args.events, args.delay))
+        print(f"{r['mode']:<10}{r['wall']:>10.2f}{r['ttft_p50']:>12.3f}"
+              f"{r['ttft_max']:>12.3f}{r['loop_lag_max']:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
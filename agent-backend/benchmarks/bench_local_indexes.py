@@ -0,0 +1,99 @@
+"""
+로컬 데이터 인덱스 조회 지연 벤치마크 - 도구 함수 호출 기준 (네트워크 없음)
+
+구조화된 조회 도구가 로컬 인덱스에서 응답할 때의 호출당 지연(p50 / p99)과 인덱스 로드 시간을 잰다.
+도구 함수를 그대로 호출하므로 응답 조립(local_response)까지 포함되며, 원격 검색으로 넘어간
+호출이 있으면 "remote" 열에 센다 (검색 클라이언트를 막아 두므로 네트워크는 나가지 않음).
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_local_indexes.py --iterations 5000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# goole_adk 패키지 (저장소 루트)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from goole_adk.agents.basic_info.tools import admin_directory
+from goole_adk.agents.basic_info.tools import facility_index
+from goole_adk.agents.basic_info.tools import search_tools as basic_info_tools
+from goole_adk.agents.graduation.tools import graduation_index
+from goole_adk.agents.graduation.tools import search_tools as graduation_tools
+from goole_adk.agents.professor.tools import professor_directory
+from goole_adk.agents.professor.tools import search_tools as professor_tools
+from goole_adk.search_client import get_search_client
+
+# (이름, 도구 함수, 인자)
+CASES: List[Tuple[str, Callable[..., Dict[str, Any]], Tuple[Any, ...]]] = [
+    ("graduation year+college", graduation_tools.search_by_year_and_college, ("2024", "공과대학")),
+    ("graduation department", graduation_tools.search_by_department, ("소프트웨어응용학부",)),
+    ("graduation available", graduation_tools.get_available_information, ()),
+    ("professor name", professor_tools.search_professor_by_name, ("양재형",)),
+    ("professor name prefix", professor_tools.search_professor_by_name, ("김",)),
+    ("professor department", professor_tools.search_professor_by_department, ("공과대학", "컴퓨터공학부")),
+    ("professor research", professor_tools.search_professor_by_research_field, ("인공지능",)),
+    ("building name", basic_info_tools.search_building_by_name, ("샬롬관",)),
+    ("facility location", basic_info_tools.search_facility_by_location, ("예술관", "B1")),
+    ("facility name", basic_info_tools.search_facility_by_name, ("학생식당",)),
+    ("facility room code", basic_info_tools.search_facility_by_name, ("예B101호",)),
+    ("admin department", basic_info_tools.search_department_by_name, ("교학1팀",)),
+    ("admin contact", basic_info_tools.search_contact_info, ("공과대학 교학팀 전화번호",)),
+    ("admin role", basic_info_tools.search_admin_department, ("수강신청 담당자",)),
+]
+
+# 인덱스 로드 (첫 호출 비용)
+LOADERS = [
+    ("graduation", graduation_index.GraduationIndex.load),
+    ("professor", professor_directory.ProfessorDirectory.load),
+    ("facility", facility_index.FacilityIndex.load),
+    ("admin", admin_directory.AdminDirectory.load),
+]
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 인덱스 도구 조회 지연")
+    parser.add_argument("--iterations", type=int, default=5000, help="케이스별 호출 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    # 원격으로 넘어가면 실패로 세도록 검색 클라이언트 차단
+    def blocked(endpoint, payload):
+        raise RuntimeError("remote fallback")
+    get_search_client().post_json = blocked
+
+    print(f"{'index':<12}{'load(ms)':>10}")
+    for name, load in LOADERS:
+        start = time.perf_counter()
+        load()
+        print(f"{name:<12}{(time.perf_counter() - start) * 1000:>10.2f}")
+
+    print(f"\n{'case':<26}{'p50(us)':>10}{'p99(us)':>10}{'remote':>8}")
+    for name, func, call_args in CASES:
+        func(*call_args)  # 인덱스 로드
+        durations, remote = [], 0
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            result = func(*call_args)
+            durations.append(time.perf_counter() - start)
+            remote += result.get("source") != "local_index" and "available_data" not in result
+        durations.sort()
+        print(
+            f"{name:<26}{percentile(durations, 0.5) * 1e6:>10.1f}"
+            f"{percentile(durations, 0.99) * 1e6:>10.1f}{remote:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
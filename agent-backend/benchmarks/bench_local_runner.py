@@ -0,0 +1,215 @@
+"""
+턴 지연 비교 - 로컬 ADK 런너(AGENT_RUNTIME=local) vs Agent Engine 경로
+
+goole_adk root_agent의 모든 에이전트 모델을 고정 지연 스텁 LLM으로 바꿔서
+네트워크 / 자격 증명 없이 같은 시나리오를 돌리고, ChatService.astream_message 기준
+TTFT와 턴 전체 시간, create_session 시간을 비교한다.
+
+  - local-memory: LocalAgentEngine + InMemorySessionService
+  - local-sqlite: LocalAgentEngine + SqliteSessionService (메모리 LRU + write-behind)
+  - local-adk-sqlite: LocalAgentEngine + ADK DatabaseSessionService (이벤트마다 기록)
+  - engine-sim:   Agent Engine이 배포하는 템플릿(vertexai AdkApp)을 이 프로세스에서 실행하고
+                  호출마다 --rtt-ms 만큼 원격 홉 지연을 더함 (실제 엔진의 네트워크 / 관리형
+                  세션 저장 비용은 근사값)
+  - engine:       --remote RESOURCE_ID를 주면 실제 Agent Engine 호출 (실제 LLM이라
+                  스텁과 직접 비교하려면 --llm-ms를 실측 LLM 시간에 맞출 것)
+
+스텁 LLM 흐름: 루트 에이전트가 질문 키워드로 transfer_to_agent 호출 → 하위 에이전트가
+고정 답변 반환 (같은 세션의 다음 턴은 ADK가 마지막 하위 에이전트로 바로 보내므로 1회).
+턴마다 (스텁 호출 수 x --llm-ms)를 뺀 나머지를 실행 경로 오버헤드로 보고한다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_local_runner.py --turns 30 --llm-ms 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# goole_adk 패키지 (저장소 루트)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+import config
+from services.chat_service import ChatService
+from services.local_engine import LocalAgentEngine, create_session_service, load_root_agent
+
+ANSWER = "2024학년도 공과대학 입학생의 졸업요건은 기초교양 17학점, 계열교양 12학점입니다. " * 4
+
+# 질문 키워드 → 위임할 하위 에이전트
+ROUTES = [
+    ("졸업", "graduation_agent"),
+    ("교수", "professor_agent"),
+    ("강의", "subject_agent"),
+    ("과목", "subject_agent"),
+    ("입학", "admission_agent"),
+]
+
+SCENARIO = [
+    "2024년 공과대학 졸업 요건 알려줘",
+    "김철주 교수님 알려줘",
+    "데이터베이스 강의계획서 보여줘",
+    "샬롬관 어디야?",
+]
+
+
+# 스텁 LLM 호출마다 지연을 기록 (턴별 순수 모델 시간 계산용)
+MODEL_SECONDS: List[float] = []
+
+
+class StubLlm(BaseLlm):
+    """고정 지연 후 라우팅(function_call) 또는 고정 답변을 돌려주는 스텁 모델"""
+
+    latency: float = 0.05
+    route: bool = False
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        MODEL_SECONDS.append(self.latency)
+        await asyncio.sleep(self.latency)
+
+        if self.route:
+            question = _last_user_text(llm_request)
+            target = next((agent for word, agent in ROUTES if word in question), "basic_info_agent")
+            part = types.Part(function_call=types.FunctionCall(
+                name="transfer_to_agent", args={"agent_name": target}
+            ))
+        else:
+            part = types.Part(text=ANSWER)
+
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def _last_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents or []):
+        if content.role == "user":
+            for part in content.parts or []:
+                if part.text:
+                    return part.text
+    return ""
+
+
+def stub_agent_tree(agent: Any, latency: float) -> None:
+    """루트 에이전트와 모든 하위 에이전트의 모델을 스텁으로 교체"""
+    agent.model = StubLlm(model="stub", latency=latency, route=bool(agent.sub_agents))
+    for sub_agent in agent.sub_agents:
+        stub_agent_tree(sub_agent, latency)
+
+
+class RemoteHop:
+    """엔진 호출마다 왕복 지연을 더하는 래퍼 (원격 Agent Engine 근사)"""
+
+    def __init__(self, engine: Any, rtt: float):
+        self.engine = engine
+        self.rtt = rtt
+
+    def create_session(self, user_id: str) -> Dict[str, Any]:
+        time.sleep(self.rtt)
+        session = self.engine.create_session(user_id=user_id)
+        # AdkApp은 Session 객체를 반환
+        return session if isinstance(session, dict) else {"id": session.id}
+
+    def stream_query(self, user_id: str, session_id: str, message: str):
+        time.sleep(self.rtt)
+        yield from self.engine.stream_query(user_id=user_id, session_id=session_id, message=message)
+
+
+def make_engine(mode: str, agent: Any, args) -> Any:
+    if mode.startswith("local-"):
+        # local-memory / local-sqlite / local-adk-sqlite
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-sessions-"), "sessions.db")
+        return LocalAgentEngine(agent, create_session_service(mode[len("local-"):], path), config.LOCAL_APP_NAME)
+
+    if mode == "engine-sim":
+        from vertexai.preview.reasoning_engines import AdkApp
+        app = AdkApp(agent=agent)
+        app.set_up()
+        return RemoteHop(app, args.rtt_ms / 1000)
+
+    if mode == "engine":
+        from vertexai import agent_engines
+        return agent_engines.get(args.remote)
+
+    raise ValueError(mode)
+
+
+async def run_mode(service: ChatService, turns: int) -> Dict[str, List[float]]:
+    result: Dict[str, List[float]] = {"session": [], "ttft": [], "total": [], "overhead": []}
+
+    for i in range(turns):
+        if i % len(SCENARIO) == 0:
+            start = time.perf_counter()
+            chat = await asyncio.to_thread(service.create_new_chat)
+            result["session"].append(time.perf_counter() - start)
+
+        MODEL_SECONDS.clear()
+        start = time.perf_counter()
+        first: Optional[float] = None
+        async for _ in service.astream_message(chat["user_id"], chat["session_id"], SCENARIO[i % len(SCENARIO)]):
+            if first is None:
+                first = time.perf_counter() - start
+        total = time.perf_counter() - start
+        result["total"].append(total)
+        result["ttft"].append(first or 0.0)
+        result["overhead"].append(total - sum(MODEL_SECONDS))
+
+    return result
+
+
+def p(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 ADK 런너 vs Agent Engine 턴 지연 비교")
+    parser.add_argument("--turns", type=int, default=40, help="모드별 턴 수")
+    parser.add_argument("--llm-ms", type=float, default=50, help="스텁 LLM 호출당 지연 (ms)")
+    parser.add_argument("--rtt-ms", type=float, default=30, help="engine-sim 호출당 원격 왕복 지연 (ms)")
+    parser.add_argument("--modes", default="local-memory,local-sqlite,local-adk-sqlite,engine-sim",
+                        help="비교할 모드 (쉼표 구분, engine은 --remote 필요)")
+    parser.add_argument("--remote", help="실제 Agent Engine 리소스 ID (engine 모드)")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    if args.remote and "engine" not in modes:
+        modes.append("engine")
+
+    agent = load_root_agent()
+    stub_agent_tree(agent, args.llm_ms / 1000)
+    # 응답 캐시가 같은 첫 질문을 엔진 없이 답하지 않도록 비활성화
+    config.RESPONSE_CACHE_MAX_ENTRIES = 0
+
+    # ADK 스키마 경고 / 실험 기능 경고 숨김
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    print(f"턴 {args.turns}회, 스텁 LLM 호출당 {args.llm_ms:.0f}ms, engine-sim 왕복 {args.rtt_ms:.0f}ms\n")
+    print(f"{'mode':<18}{'session(ms)':>12}{'ttft p50':>10}{'p95':>8}"
+          f"{'total p50':>11}{'p95':>8}{'overhead p50':>14}{'p95':>8}")
+
+    for mode in modes:
+        service = ChatService(engine=make_engine(mode, agent, args))
+        asyncio.run(run_mode(service, len(SCENARIO)))  # 워밍업
+        r = asyncio.run(run_mode(service, args.turns))
+        print(f"{mode:<18}{statistics.mean(r['session']) * 1000:>12.1f}"
+              f"{p(r['ttft'], 0.5):>10.1f}{p(r['ttft'], 0.95):>8.1f}"
+              f"{p(r['total'], 0.5):>11.1f}{p(r['total'], 0.95):>8.1f}"
+              f"{p(r['overhead'], 0.5):>14.1f}{p(r['overhead'], 0.95):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
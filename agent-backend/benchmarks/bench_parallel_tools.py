@@ -0,0 +1,179 @@
+"""
+도구 병렬 실행 벤치마크 - 한 단계에서 검색 도구 3개를 호출할 때의 벽시계 시간
+
+스텁 LLM이 한 응답에 function_call 3개(졸업요건 / 교수 / 건물 검색)를 내고, 검색 엔드포인트는
+고정 지연(--search-ms)으로 응답하는 로컬 HTTP 서버로 바꿔서 두 구성을 비교한다.
+
+  - sync:  동기 도구 (FunctionTool(search_graduation_requirements) ...) - 이벤트 루프를 막아 하나씩 실행
+  - async: 비동기 도구 (async_tools.async_tool) - ADK가 gather로 동시에 실행
+
+측정 구간은 function_call 이벤트부터 function_response 이벤트까지(도구 단계)이며,
+검색 요청은 실제 경로(공용 검색 클라이언트의 연결 풀, 재시도, 트레이싱 래퍼)를 그대로 거친다.
+자격 증명은 발급 왕복 없이 캐시된 토큰을 쓰도록 미리 채운다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_parallel_tools.py --steps 20 --search-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import AsyncGenerator, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# goole_adk 패키지 (저장소 루트)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+from goole_adk.agents.basic_info.tools import search_tools as basic_info_tools
+from goole_adk.agents.graduation.tools import search_tools as graduation_tools
+from goole_adk.agents.professor.tools import search_tools as professor_tools
+from goole_adk.auth import get_credential_provider
+from goole_adk.search_cache import get_search_cache
+
+# 한 단계에서 호출할 도구 (이름, 인자)
+CALLS = [
+    ("search_graduation_requirements", {"query": "2024년 공과대학 졸업요건"}),
+    ("search_professor_info", {"query": "인공지능 연구 교수"}),
+    ("search_building_info", {"query": "샬롬관"}),
+]
+
+SEARCH_RESPONSE = json.dumps({
+    "results": [
+        {"document": {"id": f"doc-{i}", "structData": {"content": "검색 결과 " * 30, "metadata": {}}}}
+        for i in range(5)
+    ]
+}).encode("utf-8")
+
+
+def start_search_server(latency: float) -> str:
+    """고정 지연 후 Discovery Engine 형식으로 응답하는 로컬 서버 (keep-alive 지원)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더 / 본문이 따로 나가므로 Nagle + 지연 ACK(~40ms)가 측정에 끼지 않도록
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(SEARCH_RESPONSE)))
+            self.end_headers()
+            self.wfile.write(SEARCH_RESPONSE)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/search"
+
+
+class StubLlm(BaseLlm):
+    """첫 호출은 function_call 3개, 도구 결과를 받은 뒤에는 고정 답변"""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        last = llm_request.contents[-1] if llm_request.contents else None
+        answered = last is not None and any(part.function_response for part in last.parts or [])
+        if answered:
+            parts = [types.Part(text="검색 결과를 정리했습니다.")]
+        else:
+            parts = [
+                types.Part(function_call=types.FunctionCall(id=f"call-{i}", name=name, args=args))
+                for i, (name, args) in enumerate(CALLS)
+            ]
+        yield LlmResponse(content=types.Content(role="model", parts=parts))
+
+
+def build_tools(mode: str) -> List[FunctionTool]:
+    if mode == "sync":
+        funcs = [
+            graduation_tools.search_graduation_requirements,
+            professor_tools.search_professor_info,
+            basic_info_tools.search_building_info,
+        ]
+        return [FunctionTool(func) for func in funcs]
+    return [
+        graduation_tools.search_graduation_requirements_tool,
+        professor_tools.search_professor_info_tool,
+        basic_info_tools.search_building_info_tool,
+    ]
+
+
+async def run_mode(mode: str, steps: int) -> List[float]:
+    agent = LlmAgent(name="bench_agent", model=StubLlm(model="stub"), tools=build_tools(mode))
+    service = InMemorySessionService()
+    runner = Runner(app_name="bench", agent=agent, session_service=service)
+    session = await service.create_session(app_name="bench", user_id="bench")
+
+    durations = []
+    for i in range(steps):
+        called_at = None
+        async for event in runner.run_async(
+            user_id="bench",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=f"질문 {i}")]),
+        ):
+            if event.get_function_calls():
+                called_at = time.perf_counter()
+            elif event.get_function_responses() and called_at is not None:
+                durations.append(time.perf_counter() - called_at)
+    return durations
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "p50": statistics.median(ordered) * 1000,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한 단계 도구 3개 호출: 동기 vs 비동기 도구")
+    parser.add_argument("--steps", type=int, default=20, help="모드별 측정 단계 수")
+    parser.add_argument("--search-ms", type=float, default=200, help="검색 API 응답 지연 (ms)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    endpoint = start_search_server(args.search_ms / 1000)
+    graduation_tools.VERTEX_SEARCH_ENDPOINT = endpoint
+    professor_tools.VERTEX_SEARCH_ENDPOINT = endpoint
+    basic_info_tools.BUILDING_SEARCH_ENDPOINT = endpoint
+    # 토큰 발급 왕복 없이 캐시 토큰 사용
+    get_credential_provider()._cached = ("bench-token", time.time() + 3600)
+    # 매 단계 같은 검색어이므로 검색 결과 캐시는 끔 (도구 실행 자체를 측정)
+    get_search_cache().max_entries = 0
+
+    print(f"도구 {len(CALLS)}개 / 단계, 검색 지연 {args.search_ms:.0f}ms, 단계 {args.steps}회\n")
+    print(f"{'mode':<8}{'step p50(ms)':>14}{'p95':>10}")
+    for mode in ("sync", "async"):
+        asyncio.run(run_mode(mode, 2))  # 워밍업 (연결 풀 채우기)
+        result = summarize(asyncio.run(run_mode(mode, args.steps)))
+        print(f"{mode:<8}{result['p50']:>14.1f}{result['p95']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
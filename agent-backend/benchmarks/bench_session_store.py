@@ -0,0 +1,165 @@
+"""
+세션 저장소 벤치마크 - SqliteSessionService의 append / load 지연 (세션 1만 / 10만 개)
+
+세션 N개에 턴 하나(사용자 메시지, function_call, 약 2KB function_response, 답변 텍스트)씩
+채운 DB를 만든 뒤, 저장소를 다시 열어(메모리 LRU 비어 있음) 측정한다.
+
+  - load cold: LRU에 없는 세션 get_session (SQLite 읽기 + 이벤트 역직렬화)
+  - load hot:  LRU에 있는 세션 get_session (메모리 사본)
+  - append:    append_event (메모리 갱신 + write-behind 대기열, 디스크 기록 없음)
+  - flush:     쌓인 변경분 한 트랜잭션 기록 (백그라운드 스레드 비용)
+
+--compare-adk를 주면 ADK DatabaseSessionService(이벤트마다 동기 기록)를 같은 방식으로 측정한다.
+ADK 쪽은 채우는 데 오래 걸리므로 세션 수를 --adk-sessions로 제한한다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_session_store.py --sessions 10000,100000 --compare-adk
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.genai import types
+
+from services.session_store import SqliteSessionService
+
+APP = "bench"
+RESULT = {"status": "success", "count": 5, "results": [{"title": f"과목 {i}", "content": "강의 내용 " * 40} for i in range(5)]}
+
+
+def turn_events(turn: int) -> List[Event]:
+    """턴 하나 분량의 이벤트 (사용자 → 도구 호출 → 도구 결과 → 답변)"""
+    invocation = f"e-{turn}-{random.random()}"
+    return [
+        Event(author="user", invocation_id=invocation, content=types.Content(
+            role="user", parts=[types.Part(text=f"{turn}번째 질문: 데이터베이스 강의계획서 보여줘")])),
+        Event(author="subject_agent", invocation_id=invocation, content=types.Content(
+            role="model", parts=[types.Part(function_call=types.FunctionCall(
+                name="search_subject_list", args={"query": "데이터베이스"}))])),
+        Event(author="subject_agent", invocation_id=invocation, content=types.Content(
+            role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                name="search_subject_list", response=RESULT))]),
+            actions=EventActions(state_delta={"user:last_subject_search": {"query": "데이터베이스"}})),
+        Event(author="subject_agent", invocation_id=invocation, content=types.Content(
+            role="model", parts=[types.Part(text="데이터베이스 강의계획서입니다. " * 20)])),
+    ]
+
+
+async def populate(service, sessions: int) -> List[tuple]:
+    keys = []
+    for i in range(sessions):
+        session = await service.create_session(app_name=APP, user_id=f"user{i}")
+        for event in turn_events(0):
+            await service.append_event(session, event)
+        keys.append((session.user_id, session.id))
+    return keys
+
+
+async def timed(samples: int, make: Callable) -> List[float]:
+    values = []
+    for i in range(samples):
+        call = make(i)
+        start = time.perf_counter()
+        await call()
+        values.append(time.perf_counter() - start)
+    return values
+
+
+def summary(name: str, values: List[float]) -> str:
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+    return f"  {name:<18}{pick(0.5):>9.3f}{pick(0.95):>9.3f}{pick(0.99):>9.3f}"
+
+
+async def measure(service, keys: List[tuple], samples: int) -> List[str]:
+    rng = random.Random(1)
+    cold_keys = rng.sample(keys, min(samples, len(keys)))
+
+    def get(key):
+        return lambda: service.get_session(app_name=APP, user_id=key[0], session_id=key[1])
+
+    lines = [summary("load cold", await timed(len(cold_keys), lambda i: get(cold_keys[i])))]
+    hot_keys = cold_keys[-min(100, len(cold_keys)):]
+    lines.append(summary("load hot", await timed(samples, lambda i: get(hot_keys[i % len(hot_keys)]))))
+
+    sessions = [await get(key)() for key in hot_keys]
+    events = [event for turn in range(samples // 4 + 1) for event in turn_events(turn + 1)]
+
+    def append(i):
+        return lambda: service.append_event(sessions[i % len(sessions)], events[i])
+
+    lines.append(summary("append", await timed(samples, append)))
+    return lines
+
+
+def run_store(sessions: int, samples: int, directory: str) -> None:
+    path = os.path.join(directory, f"store-{sessions}.db")
+
+    # 채우기: 자동 flush 없이 모아서 기록
+    store = SqliteSessionService(path, hot_sessions=1000, flush_interval=3600, flush_batch=10 ** 9)
+    start = time.perf_counter()
+    keys = asyncio.run(populate(store, sessions))
+    store.close()
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+
+    print(f"\nSqliteSessionService - 세션 {sessions:,}개 (채우기 {elapsed:.1f}s, DB {size_mb:.0f}MB)")
+    print(f"  {'':<18}{'p50(ms)':>9}{'p95':>9}{'p99':>9}")
+
+    # 다시 열어서 LRU가 빈 상태로 측정 (flush는 수동)
+    store = SqliteSessionService(path, hot_sessions=1000, flush_interval=3600, flush_batch=10 ** 9)
+    for line in asyncio.run(measure(store, keys, samples)):
+        print(line)
+    start = time.perf_counter()
+    store.flush()
+    print(f"  flush ({samples}개 이벤트 한 트랜잭션) {(time.perf_counter() - start) * 1000:.1f}ms")
+    store.close()
+
+
+def run_adk(sessions: int, samples: int, directory: str) -> None:
+    path = os.path.join(directory, f"adk-{sessions}.db")
+    service = DatabaseSessionService(db_url=f"sqlite:///{path}")
+
+    start = time.perf_counter()
+    keys = asyncio.run(populate(service, sessions))
+    elapsed = time.perf_counter() - start
+
+    print(f"\nADK DatabaseSessionService - 세션 {sessions:,}개 (채우기 {elapsed:.1f}s)")
+    print(f"  {'':<18}{'p50(ms)':>9}{'p95':>9}{'p99':>9}")
+    for line in asyncio.run(measure(service, keys, samples)):
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 저장소 append / load 지연")
+    parser.add_argument("--sessions", default="10000,100000", help="세션 수 (쉼표 구분)")
+    parser.add_argument("--samples", type=int, default=2000, help="측정 횟수")
+    parser.add_argument("--compare-adk", action="store_true", help="ADK DatabaseSessionService도 측정")
+    parser.add_argument("--adk-sessions", type=int, default=2000, help="ADK 쪽 세션 수")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory(prefix="bench-session-store-") as directory:
+        for sessions in (int(n) for n in args.sessions.split(",")):
+            run_store(sessions, args.samples, directory)
+        if args.compare_adk:
+            run_adk(args.adk_sessions, min(args.samples, args.adk_sessions), directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+SSE 프레이밍 마이크로 벤치마크 - 글자 단위 vs 청크 묶음
+
+같은 답변(기본 1,500자 한국어)을 두 가지 STREAM_FRAMING 모드로
+astream_message() → sse_event() 까지 흘려 보내고,
+답변 1개당 CPU 시간, SSE 이벤트 수, 전송 바이트를 비교한다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_sse_framing.py --chars 1500 --event-chars 40 --answers 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services.chat_service import ChatService
+from services.streaming import sse_event
+
+SAMPLE = "2024학년도 공과대학 입학생의 졸업요건은 기초교양 17학점, 계열교양 12학점입니다. "
+
+
+class FixedEngine:
+    """고정 답변을 event_chars 글자씩 나눠 내보내는 가짜 Agent Engine"""
+
+    def __init__(self, answer: str, event_chars: int):
+        self.parts = [answer[i:i + event_chars] for i in range(0, len(answer), event_chars)]
+
+    def stream_query(self, user_id: str, session_id: str, message: str):
+        for text in self.parts:
+            yield {"content": {"parts": [{"text": text}]}}
+
+
+async def run_answer(service: ChatService) -> tuple:
+    events = 0
+    wire = 0
+    async for chunk in service.astream_message("u", "s", "졸업요건"):
+        wire += len(sse_event({"text": chunk, "done": False}).encode("utf-8"))
+        events += 1
+    wire += len(sse_event({"text": "", "done": True}).encode("utf-8"))
+    return events + 1, wire
+
+
+async def run_mode(mode: str, service: ChatService, answers: int) -> dict:
+    config.STREAM_FRAMING = mode
+    await run_answer(service)  # 워밍업 (스레드 풀 생성 등)
+
+    cpu_start = time.process_time()
+    for _ in range(answers):
+        events, wire = await run_answer(service)
+    cpu = (time.process_time() - cpu_start) / answers
+
+    return {"mode": mode, "cpu_ms": cpu * 1000, "events": events, "bytes": wire}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE 프레이밍 비교")
+    parser.add_argument("--chars", type=int, default=1500, help="답변 길이 (글자)")
+    parser.add_argument("--event-chars", type=int, default=40, help="엔진 이벤트당 글자 수")
+    parser.add_argument("--answers", type=int, default=50, help="모드별 반복 횟수")
+    args = parser.parse_args()
+
+    answer = (SAMPLE * (args.chars // len(SAMPLE) + 1))[:args.chars]
+    payload = len(answer.encode("utf-8"))
+
+    service = ChatService(engine=FixedEngine(answer, args.event_chars))
+
+    print(f"답변 {args.chars}자 ({payload:,} bytes), 엔진 이벤트당 {args.event_chars}자, "
+          f"flush={config.STREAM_FLUSH_BYTES}B/{config.STREAM_FLUSH_INTERVAL_MS}ms\n")
+    print(f"{'mode':<10}{'cpu/answer(ms)':>16}{'sse events':>12}{'wire bytes':>12}{'overhead':>10}")
+
+    for mode in ("char", "coalesce"):
+        r = asyncio.run(run_mode(mode, service, args.answers))
+        overhead = r["bytes"] / payload
+        print(f"{r['mode']:<10}{r['cpu_ms']:>16.2f}{r['events']:>12}{r['bytes']:>12,}{overhead:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
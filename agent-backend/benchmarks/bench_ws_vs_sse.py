@@ -0,0 +1,144 @@
+"""
+턴당 오버헤드 벤치마크 - POST /chat/message (SSE) vs /chat/ws (WebSocket)
+
+지연 없는 가짜 엔진으로 실제 uvicorn 서버를 띄우고, 같은 세션에서 N턴을 순서대로 보낸다.
+엔진 시간이 0이므로 측정값은 거의 전부 전송 계층 오버헤드다.
+
+  - sse: keep-alive HTTP 클라이언트로 턴마다 POST + SSE 응답 전체 수신
+  - ws: 연결 한 번, 턴마다 message 프레임 전송 → done 프레임까지 수신
+  - ws-binary: 위와 같고 청크를 바이너리 프레임으로 수신
+
+클라이언트와 서버가 같은 프로세스에 있으므로 CPU 시간은 양쪽 합계다.
+
+실행:
+    cd agent-backend
+    python benchmarks/bench_ws_vs_sse.py --turns 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+import websockets
+
+import services.chat_service as chat_service_module
+from services.chat_service import ChatService
+
+ANSWER = "2024학년도 공과대학 입학생의 졸업요건은 기초교양 17학점, 계열교양 12학점입니다. " * 4
+
+
+class InstantEngine:
+    """고정 답변을 지연 없이 3개 이벤트로 내보내는 가짜 Agent Engine"""
+
+    def create_session(self, user_id: str):
+        return {"id": f"bench-{user_id}"}
+
+    def stream_query(self, user_id: str, session_id: str, message: str):
+        third = len(ANSWER) // 3
+        for i in range(3):
+            yield {"content": {"parts": [{"text": ANSWER[i * third:(i + 1) * third]}]}}
+
+
+def start_server() -> tuple:
+    """uvicorn 서버를 백그라운드 스레드로 시작하고 (server, port) 반환"""
+    chat_service_module._chat_service_instance = ChatService(engine=InstantEngine())
+    from main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, port
+
+
+async def run_sse(port: int, turns: int) -> list:
+    latencies = []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+        for i in range(turns):
+            start = time.perf_counter()
+            async with client.stream("POST", "/chat/message", json={
+                "user_id": "sse", "session_id": "sse", "message": f"질문 {i}"
+            }) as response:
+                async for line in response.aiter_lines():
+                    if line.startswith("data: ") and json.loads(line[6:]).get("done"):
+                        break
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_ws(port: int, turns: int, binary: bool) -> list:
+    latencies = []
+    url = f"ws://127.0.0.1:{port}/chat/ws?user_id=ws&session_id=ws"
+    if binary:
+        url += "&format=binary"
+
+    async with websockets.connect(url) as ws:
+        for i in range(turns):
+            start = time.perf_counter()
+            await ws.send(json.dumps({"type": "message", "id": i, "text": f"질문 {i}"}))
+            while True:
+                frame = await ws.recv()
+                if isinstance(frame, str) and json.loads(frame).get("done"):
+                    break
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_mode(mode: str, port: int, turns: int) -> dict:
+    runner = {
+        "sse": lambda n: run_sse(port, n),
+        "ws": lambda n: run_ws(port, n, binary=False),
+        "ws-binary": lambda n: run_ws(port, n, binary=True),
+    }[mode]
+
+    await runner(10)  # 워밍업 (연결 / 스레드 풀 생성)
+
+    cpu_start = time.process_time()
+    latencies = await runner(turns)
+    cpu = (time.process_time() - cpu_start) / turns
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "cpu_ms": cpu * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE vs WebSocket 턴당 오버헤드 비교")
+    parser.add_argument("--turns", type=int, default=300, help="모드별 턴 수")
+    args = parser.parse_args()
+
+    server, port = start_server()
+
+    print(f"답변 {len(ANSWER)}자, 턴 {args.turns}회, 엔진 지연 0\n")
+    print(f"{'mode':<12}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'cpu/turn(ms)':>14}")
+
+    try:
+        for mode in ("sse", "ws", "ws-binary"):
+            r = asyncio.run(run_mode(mode, port, args.turns))
+            print(f"{r['mode']:<12}{r['mean_ms']:>10.2f}{r['p50_ms']:>10.2f}"
+                  f"{r['p95_ms']:>10.2f}{r['cpu_ms']:>14.2f}")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
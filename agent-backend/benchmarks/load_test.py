@@ -0,0 +1,315 @@
+"""
+부하 테스트 드라이버 - /chat/new + /chat/message 시나리오 재생
+
+가상 사용자 N명이 시나리오의 대화를 돌아가며 재생한다.
+대화 하나 = POST /chat/new 한 번 + 턴마다 POST /chat/message (SSE 끝까지 수신).
+
+측정:
+  - TTFB: 요청 전송부터 첫 SSE 이벤트(첫 청크)까지 (/chat/new는 응답 수신까지)
+  - 처리량: 완료된 턴 / 초
+  - 오류율: HTTP 오류(429 별도 집계), 스트림 안의 오류 이벤트, 연결 실패
+
+시나리오 파일 (--scenario):
+  - JSONL: 한 줄에 대화 하나 - {"turns": ["질문1", "질문2"]} 또는 {"message": "..."}
+           (requests.jsonl처럼 message가 없으면 title / body / text 필드를 한 턴으로 사용)
+  - JSON: 대화 목록 - [["질문1", "질문2"], ["질문"]] 또는 위 객체들의 리스트
+
+실행:
+    # 가짜 엔진으로 서버를 이 프로세스 안에 띄워서 테스트
+    python benchmarks/load_test.py --local --users 50 --conversations 200
+
+    # 이미 떠 있는 서버 대상 (예: FAKE_AGENT_ENGINE=true uvicorn main:app --port 8080)
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --scenario ../requests.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+# 기본 시나리오 - 같은 첫 질문이 반복되도록 구성 (응답 캐시 / 싱글 플라이트 경로 포함)
+DEFAULT_SCENARIO = [
+    ["2024년 공과대학 졸업 요건 알려줘", "기초교양은 몇 학점이야?"],
+    ["샬롬관 어디야?"],
+    ["김철주 교수님 알려줘", "교수님이 하는 강의 알려줘"],
+    ["2024년 공과대학 졸업 요건 알려줘"],
+    ["교학1팀 전화번호 알려줘"],
+    ["데이터베이스 강의계획서 보여줘", "평가 방법은?"],
+]
+
+
+def load_scenario(path: Optional[str]) -> List[List[str]]:
+    """시나리오 파일 → 대화(턴 목록) 리스트"""
+    if not path:
+        return DEFAULT_SCENARIO
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    if path.endswith(".jsonl"):
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        items = json.loads(text)
+
+    conversations = []
+    for item in items:
+        turns = _turns(item)
+        if turns:
+            conversations.append(turns)
+
+    if not conversations:
+        raise ValueError(f"시나리오에 재생할 대화가 없습니다: {path}")
+    return conversations
+
+
+def _turns(item: Any) -> List[str]:
+    if isinstance(item, str):
+        return [item]
+    if isinstance(item, list):
+        return [str(turn) for turn in item if turn]
+    if isinstance(item, dict):
+        if item.get("turns"):
+            return [str(turn) for turn in item["turns"] if turn]
+        for key in ("message", "text", "title", "body"):
+            if item.get(key):
+                return [str(item[key])]
+    return []
+
+
+def percentile(values: List[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Stats:
+    """엔드포인트별 측정값"""
+
+    def __init__(self):
+        self.ttfb: Dict[str, List[float]] = {"/chat/new": [], "/chat/message": []}
+        self.total: List[float] = []  # /chat/message 턴 전체 시간
+        self.requests: Counter = Counter()
+        self.errors: Dict[str, Counter] = {"/chat/new": Counter(), "/chat/message": Counter()}
+
+    def error(self, endpoint: str, kind: str) -> None:
+        self.errors[endpoint][kind] += 1
+
+
+async def new_chat(client: httpx.AsyncClient, stats: Stats) -> Optional[Dict[str, str]]:
+    stats.requests["/chat/new"] += 1
+    start = time.perf_counter()
+    try:
+        response = await client.post("/chat/new")
+    except httpx.HTTPError as e:
+        stats.error("/chat/new", type(e).__name__)
+        return None
+
+    if response.status_code != 200:
+        stats.error("/chat/new", f"http_{response.status_code}")
+        return None
+
+    stats.ttfb["/chat/new"].append(time.perf_counter() - start)
+    return response.json()
+
+
+async def send_message(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    chat: Dict[str, str],
+    message: str
+) -> None:
+    stats.requests["/chat/message"] += 1
+    start = time.perf_counter()
+    first = None
+    failed = None
+
+    try:
+        async with client.stream("POST", "/chat/message", json={
+            "user_id": chat["user_id"],
+            "session_id": chat["session_id"],
+            "message": message,
+        }) as response:
+            if response.status_code != 200:
+                stats.error("/chat/message", f"http_{response.status_code}")
+                return
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                if first is None:
+                    first = time.perf_counter()
+                event = json.loads(line[6:])
+                if event.get("error") or "[오류]" in event.get("text", ""):
+                    failed = "stream_error"
+                if event.get("done"):
+                    break
+    except httpx.HTTPError as e:
+        stats.error("/chat/message", type(e).__name__)
+        return
+
+    if failed:
+        stats.error("/chat/message", failed)
+        return
+    if first is not None:
+        stats.ttfb["/chat/message"].append(first - start)
+    stats.total.append(time.perf_counter() - start)
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    scenario: List[List[str]],
+    next_index,
+    deadline: float,
+    think_time: float
+) -> None:
+    while time.perf_counter() < deadline:
+        index = next_index()
+        if index is None:
+            return
+
+        chat = await new_chat(client, stats)
+        if chat is None:
+            continue
+
+        for message in scenario[index % len(scenario)]:
+            await send_message(client, stats, chat, message)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+
+async def run(args, scenario: List[List[str]]) -> Dict[str, Any]:
+    stats = Stats()
+    issued = 0
+
+    def next_index() -> Optional[int]:
+        nonlocal issued
+        if args.conversations and issued >= args.conversations:
+            return None
+        issued += 1
+        return issued - 1
+
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    timeout = httpx.Timeout(args.timeout)
+    deadline = time.perf_counter() + (args.duration or float("inf"))
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(client, stats, scenario, next_index, deadline, args.think_time / 1000)
+            for _ in range(args.users)
+        ))
+        elapsed = time.perf_counter() - start
+
+    return summarize(stats, elapsed)
+
+
+def summarize(stats: Stats, elapsed: float) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"elapsed_s": elapsed, "endpoints": {}}
+    for endpoint, ttfb in stats.ttfb.items():
+        requests = stats.requests[endpoint]
+        errors = sum(stats.errors[endpoint].values())
+        report["endpoints"][endpoint] = {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": errors / requests if requests else 0.0,
+            "error_kinds": dict(stats.errors[endpoint]),
+            "ttfb_ms": {
+                "p50": percentile(ttfb, 50) * 1000,
+                "p95": percentile(ttfb, 95) * 1000,
+                "p99": percentile(ttfb, 99) * 1000,
+            },
+        }
+    report["turns_completed"] = len(stats.total)
+    report["throughput_turns_per_s"] = len(stats.total) / elapsed if elapsed else 0.0
+    report["turn_total_ms"] = {
+        "p50": percentile(stats.total, 50) * 1000,
+        "p95": percentile(stats.total, 95) * 1000,
+        "p99": percentile(stats.total, 99) * 1000,
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n경과 {report['elapsed_s']:.1f}s, 완료 턴 {report['turns_completed']}, "
+          f"처리량 {report['throughput_turns_per_s']:.1f} turns/s\n")
+    print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'err%':>7}"
+          f"{'ttfb p50':>10}{'p95':>9}{'p99':>9}  (ms)")
+    for endpoint, r in report["endpoints"].items():
+        t = r["ttfb_ms"]
+        print(f"{endpoint:<16}{r['requests']:>10}{r['errors']:>8}{r['error_rate'] * 100:>6.1f}%"
+              f"{t['p50']:>10.0f}{t['p95']:>9.0f}{t['p99']:>9.0f}")
+        if r["error_kinds"]:
+            print(f"{'':<16}오류 종류: {r['error_kinds']}")
+    t = report["turn_total_ms"]
+    print(f"\n/chat/message 턴 전체 시간 p50 {t['p50']:.0f} / p95 {t['p95']:.0f} / p99 {t['p99']:.0f} ms")
+
+
+def start_local_server() -> str:
+    """가짜 엔진으로 uvicorn 서버를 백그라운드 스레드에서 시작하고 base URL 반환"""
+    import uvicorn
+    import config
+
+    config.FAKE_AGENT_ENGINE = True
+    from main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="agent-backend 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="대상 서버 URL")
+    parser.add_argument("--local", action="store_true",
+                        help="가짜 엔진(FAKE_ENGINE_* 설정)으로 서버를 이 프로세스 안에 띄워서 테스트")
+    parser.add_argument("--scenario", help="시나리오 파일 (.jsonl / .json), 없으면 기본 시나리오")
+    parser.add_argument("--users", type=int, default=20, help="동시 가상 사용자 수")
+    parser.add_argument("--conversations", type=int, default=0,
+                        help="재생할 대화 수 (0이면 시나리오 길이, --duration과 함께 쓰면 무제한)")
+    parser.add_argument("--duration", type=float, default=0, help="최대 실행 시간 (초, 0이면 제한 없음)")
+    parser.add_argument("--think-time", type=float, default=0, help="턴 사이 대기 (ms)")
+    parser.add_argument("--timeout", type=float, default=60, help="요청 타임아웃 (초)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if not args.conversations and not args.duration:
+        args.conversations = len(scenario)
+
+    if args.local:
+        args.url = start_local_server()
+
+    print(f"대상 {args.url}, 가상 사용자 {args.users}, 대화 {args.conversations or '무제한'}"
+          f"{f', 최대 {args.duration:.0f}s' if args.duration else ''}, 시나리오 {len(scenario)}개")
+
+    report = asyncio.run(run(args, scenario))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
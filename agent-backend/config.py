@@ -18,14 +18,117 @@ AGENT_RESOURCE_ID = os.getenv(
 GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT", "kangnam-backend")
 VERTEX_AI_LOCATION = os.getenv("VERTEX_AI_LOCATION", "us-east4")
 
+# 시작 설정
+# true면 Agent Engine 연결을 백그라운드에서 진행하고 포트를 먼저 연다 (/ready로 준비 상태 확인)
+# false면 연결이 끝난 뒤에 요청을 받기 시작한다
+STARTUP_BACKGROUND_INIT = os.getenv("STARTUP_BACKGROUND_INIT", "false").lower() == "true"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# 스트리밍 설정
+# Agent Engine 스트림은 동기 gRPC라 전용 스레드 풀에서 소비 (인스턴스당 동시 스트림 상한)
+STREAM_WORKER_THREADS = int(os.getenv("STREAM_WORKER_THREADS", "32"))
+# 스레드 → 이벤트 루프 사이 큐 크기 (가득 차면 업스트림 소비를 잠시 멈춤)
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "64"))
+# SSE 프레이밍: "coalesce" (청크를 모아서 전송) 또는 "char" (한 글자당 이벤트 1개, 기존 방식)
+STREAM_FRAMING = os.getenv("STREAM_FRAMING", "coalesce")
+# coalesce 모드에서 버퍼가 이 크기(UTF-8 바이트)에 도달하면 즉시 전송
+STREAM_FLUSH_BYTES = int(os.getenv("STREAM_FLUSH_BYTES", "512"))
+# coalesce 모드에서 첫 청크를 받은 뒤 최대 대기 시간 (ms)
+STREAM_FLUSH_INTERVAL_MS = int(os.getenv("STREAM_FLUSH_INTERVAL_MS", "30"))
+# SSE 클라이언트 연결 끊김 확인 주기 (ms) - 끊기면 업스트림 스트림을 중단
+DISCONNECT_POLL_INTERVAL_MS = int(os.getenv("DISCONNECT_POLL_INTERVAL_MS", "250"))
+
+# 세션 풀 설정 (/chat/new 응답용으로 미리 만들어 두는 익명 세션)
+# 풀 크기가 MIN_SIZE 아래로 내려가면 MAX_SIZE까지 백그라운드에서 채움 (MAX_SIZE=0이면 비활성화)
+SESSION_POOL_MIN_SIZE = int(os.getenv("SESSION_POOL_MIN_SIZE", "2"))
+SESSION_POOL_MAX_SIZE = int(os.getenv("SESSION_POOL_MAX_SIZE", "5"))
+# 미리 만든 세션의 최대 보관 시간 (초)
+SESSION_POOL_TTL_SECONDS = float(os.getenv("SESSION_POOL_TTL_SECONDS", "1800"))
+
+# 응답 캐시 설정 (맥락 없는 첫 턴 답변 재사용, MAX_ENTRIES=0이면 비활성화)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+
+# 싱글 플라이트: 동시에 들어온 같은 첫 질문은 업스트림 스트림 하나를 공유
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# 어드미션 컨트롤 (인스턴스당 동시 /chat/message 스트림 수 제한)
+# 기본값은 스트림 스레드 수와 같게 두어 스레드 풀이 포화되지 않도록 함
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", str(STREAM_WORKER_THREADS)))
+# 자리가 날 때까지 기다릴 수 있는 요청 수 (가득 차면 즉시 429)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+# 대기열에서 기다리는 최대 시간 (초, 초과 시 429)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+# 429 응답의 Retry-After 값 (초)
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+# 요청 빈도 제한 (user_id / 클라이언트 IP별 토큰 버킷, 초과 시 429)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# user_id당 분당 메시지 수 / 연속 허용 수
+RATE_LIMIT_USER_PER_MINUTE = float(os.getenv("RATE_LIMIT_USER_PER_MINUTE", "10"))
+RATE_LIMIT_USER_BURST = int(os.getenv("RATE_LIMIT_USER_BURST", "5"))
+# IP당 분당 요청 수 / 연속 허용 수 (캠퍼스 NAT 뒤 여러 사용자가 같은 IP를 쓰므로 넉넉하게)
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "120"))
+RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", "40"))
+# 메모리에 보관할 버킷 수 상한
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# 비어 있지 않으면 이 SQLite 파일로 같은 호스트의 워커 간 버킷 공유
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "")
+# X-Forwarded-For에서 신뢰하는 프록시가 붙인 주소를 클라이언트 IP로 사용 (Cloud Run / 로드밸런서 뒤에서만 true)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+# X-Forwarded-For에 주소를 붙이는 신뢰하는 프록시 수 (Cloud Run 1, 외부 HTTPS LB + Cloud Run 2)
+RATE_LIMIT_TRUSTED_PROXY_HOPS = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "1"))
+
+# 트레이싱 - span을 기록할 파일 경로 (비어 있으면 비활성화)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+# "jsonl" (span당 평탄한 JSON 한 줄) 또는 "otlp" (OTLP/JSON 한 줄)
+TRACE_EXPORT_FORMAT = os.getenv("TRACE_EXPORT_FORMAT", "jsonl")
+
+# 로컬 부하 테스트용 가짜 Agent Engine (services/fake_engine.py)
+# FAKE_AGENT_ENGINE=true 또는 AGENT_RESOURCE_ID=fake 이면 실제 엔진 대신 사용 (쿼터 소모 없음)
+FAKE_AGENT_ENGINE = (
+    os.getenv("FAKE_AGENT_ENGINE", "false").lower() == "true" or AGENT_RESOURCE_ID == "fake"
+)
+# 메시지 수신부터 첫 텍스트 토큰까지 지연 (라우팅 + 도구 호출 흉내)
+FAKE_ENGINE_FIRST_TOKEN_DELAY_MS = int(os.getenv("FAKE_ENGINE_FIRST_TOKEN_DELAY_MS", "800"))
+# 초당 텍스트 토큰(이벤트) 수 / 토큰당 글자 수
+FAKE_ENGINE_TOKENS_PER_SECOND = float(os.getenv("FAKE_ENGINE_TOKENS_PER_SECOND", "40"))
+FAKE_ENGINE_CHARS_PER_TOKEN = int(os.getenv("FAKE_ENGINE_CHARS_PER_TOKEN", "3"))
+# 답변 길이 (글자)
+FAKE_ENGINE_ANSWER_CHARS = int(os.getenv("FAKE_ENGINE_ANSWER_CHARS", "400"))
+# create_session 지연
+FAKE_ENGINE_SESSION_DELAY_MS = int(os.getenv("FAKE_ENGINE_SESSION_DELAY_MS", "300"))
+# 호출마다 오류를 낼 확률 (0~1, create_session / stream_query 공통)
+FAKE_ENGINE_ERROR_RATE = float(os.getenv("FAKE_ENGINE_ERROR_RATE", "0"))
+
+# 에이전트 실행 방식
+# "engine": 배포된 Vertex AI Agent Engine 호출 (기본)
+# "local": goole_adk root_agent를 이 프로세스에서 ADK Runner로 실행 (원격 홉 없음, services/local_engine.py)
+AGENT_RUNTIME = os.getenv("AGENT_RUNTIME", "engine")
+# local 모드 세션 저장소: "memory" (프로세스 메모리, 재시작 시 사라짐),
+# "sqlite" (write-behind SQLite + 메모리 LRU), "adk-sqlite" (ADK DatabaseSessionService, 이벤트마다 기록)
+LOCAL_SESSION_BACKEND = os.getenv("LOCAL_SESSION_BACKEND", "memory")
+# local 모드 sqlite 세션 DB 경로
+LOCAL_SESSION_DB_PATH = os.getenv("LOCAL_SESSION_DB_PATH", "sessions.db")
+# sqlite 세션 저장소 (services/session_store.py): 메모리에 둘 세션 수
+SESSION_STORE_HOT_SESSIONS = int(os.getenv("SESSION_STORE_HOT_SESSIONS", "1000"))
+# 세션당 보관할 이벤트 수 상한 (넘으면 오래된 턴부터 제거, 0이면 무제한)
+SESSION_STORE_MAX_EVENTS = int(os.getenv("SESSION_STORE_MAX_EVENTS", "200"))
+# write-behind 주기 (ms, 0이면 이벤트마다 즉시 기록)
+SESSION_STORE_FLUSH_INTERVAL_MS = int(os.getenv("SESSION_STORE_FLUSH_INTERVAL_MS", "200"))
+# local 모드 ADK 앱 이름 (세션 저장소의 app_name)
+LOCAL_APP_NAME = os.getenv("LOCAL_APP_NAME", "kangnam_assistant")
+
 # 환경 확인
 def check_config():
     """환경 변수 확인"""
     required_vars = {
-        "AGENT_RESOURCE_ID": AGENT_RESOURCE_ID,
         "GOOGLE_CLOUD_PROJECT": GOOGLE_CLOUD_PROJECT,
         "VERTEX_AI_LOCATION": VERTEX_AI_LOCATION,
     }
+    if AGENT_RUNTIME != "local":
+        required_vars["AGENT_RESOURCE_ID"] = AGENT_RESOURCE_ID
     
     missing = [k for k, v in required_vars.items() if not v]
     
@@ -86,7 +86,7 @@ gcloud run deploy "$SERVICE_NAME" \
   --region="$REGION" \
   --project="$PROJECT" \
   --allow-unauthenticated \
-  --set-env-vars="AGENT_RESOURCE_ID=$AGENT_RESOURCE_ID,GOOGLE_CLOUD_PROJECT=$PROJECT,VERTEX_AI_LOCATION=$REGION" \
+  --set-env-vars="AGENT_RESOURCE_ID=$AGENT_RESOURCE_ID,GOOGLE_CLOUD_PROJECT=$PROJECT,VERTEX_AI_LOCATION=$REGION,RATE_LIMIT_TRUST_FORWARDED=true" \
   --min-instances=0 \
   --max-instances=10 \
   --timeout=300 \
@@ -4,16 +4,116 @@ Agent Backend API
 FastAPI 백엔드 - Agent Engine과 연동
 """
 
+import time
+
+# 콜드 스타트 추적: 무거운 import(fastapi, vertexai 등) 소요 시간 측정
+_import_start = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from routers import chat
+from services import metrics
+from services.admission import get_admission_controller
+from services.chat_service import init_chat_service, peek_chat_service
+from services.rate_limit import get_rate_limiter
 import config
 
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
+logging.basicConfig(
+    level=config.LOG_LEVEL,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("agent-backend")
+
+# 시작 단계별 소요 시간 (ms) - /ready 응답과 부팅 로그에 사용
+startup_timings = {"imports_ms": IMPORT_SECONDS * 1000}
+startup_error = None
+
+# 스크레이프 시점에 읽는 게이지
+metrics.REGISTRY.gauge(
+    "chat_admission_active_streams", "진행 중인 /chat/message 스트림 수",
+    lambda: get_admission_controller().active
+)
+metrics.REGISTRY.gauge(
+    "chat_admission_queue_depth", "동시 스트림 대기열에서 기다리는 요청 수",
+    lambda: get_admission_controller().waiting
+)
+metrics.REGISTRY.gauge(
+    "chat_rate_limit_buckets", "user_id / IP 토큰 버킷 수 (다시 가득 찬 버킷은 정리됨)",
+    lambda: len(get_rate_limiter().store)
+)
+metrics.REGISTRY.gauge(
+    "chat_session_pool_size", "미리 생성되어 대기 중인 세션 수",
+    lambda: peek_chat_service().session_pool.size
+)
+metrics.REGISTRY.gauge(
+    "chat_session_pool_hit_ratio", "/chat/new 요청 중 세션 풀에서 바로 꺼낸 비율",
+    lambda: peek_chat_service().session_pool.stats()["hit_rate"]
+)
+metrics.REGISTRY.gauge(
+    "chat_response_cache_hit_ratio", "첫 턴 응답 캐시 히트 비율",
+    lambda: peek_chat_service().response_cache.stats()["hit_ratio"]
+)
+
+async def initialize_chat_service():
+    """Vertex AI 초기화 + Agent Engine 핸들 획득 + 세션 풀 시작"""
+    global startup_error
+    
+    start = time.perf_counter()
+    try:
+        service = await asyncio.to_thread(init_chat_service)
+    except Exception as e:
+        startup_error = str(e)
+        logger.exception("[Startup] ChatService 초기화 실패")
+        return
+    
+    startup_error = None
+    for name, seconds in service.startup_timings.items():
+        startup_timings[f"{name}_ms"] = seconds * 1000
+    startup_timings["service_init_ms"] = (time.perf_counter() - start) * 1000
+    
+    service.session_pool.start()
+    
+    if config.FAKE_AGENT_ENGINE:
+        logger.warning("[Startup] FAKE_AGENT_ENGINE 사용 중 - 실제 Agent Engine에 연결하지 않음")
+    elif config.AGENT_RUNTIME == "local":
+        logger.info(
+            f"[Startup] AGENT_RUNTIME=local - root_agent를 이 프로세스에서 실행 "
+            f"(세션 저장소: {config.LOCAL_SESSION_BACKEND})"
+        )
+    logger.info(
+        "[Startup] " + " ".join(f"{k}={v:.0f}" for k, v in startup_timings.items())
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 ChatService를 미리 만들어 첫 요청이 콜드 스타트 비용을 내지 않게 함"""
+    init_task = None
+    if config.STARTUP_BACKGROUND_INIT:
+        init_task = asyncio.create_task(initialize_chat_service())
+    else:
+        await initialize_chat_service()
+    
+    yield
+    
+    if init_task is not None and not init_task.done():
+        init_task.cancel()
+    
+    service = peek_chat_service()
+    if service is not None:
+        await service.session_pool.stop()
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="Kangnam Agent API",
     description="강남대학교 Multi-Agent 챗봇 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정 (프론트엔드 연동용)
@@ -34,6 +134,28 @@ async def health_check():
     """헬스체크 엔드포인트"""
     return {"status": "ok", "service": "agent-backend-api"}
 
+# 준비 상태 확인 (Agent Engine 핸들이 생길 때까지 503)
+@app.get("/ready")
+async def readiness_check():
+    """레디니스 엔드포인트"""
+    if peek_chat_service() is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "error" if startup_error else "initializing",
+                "error": startup_error,
+                "startup": startup_timings,
+            }
+        )
+    
+    return {"status": "ready", "startup": startup_timings}
+
+# Prometheus 메트릭
+@app.get("/metrics")
+async def metrics_endpoint():
+    """메트릭 엔드포인트 (Prometheus 텍스트 포맷)"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 # 루트 엔드포인트
 @app.get("/")
 async def root():
@@ -43,12 +165,14 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
             "new_chat": "POST /chat/new",
-            "send_message": "POST /chat/message"
+            "send_message": "POST /chat/message",
+            "websocket": "WS /chat/ws"
         }
     }
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
-
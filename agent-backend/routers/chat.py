@@ -2,11 +2,21 @@
 채팅 API 라우터
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+import time
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from services.admission import AdmissionController, AdmissionRejected, get_admission_controller
+from services import metrics
 from services.chat_service import ChatService, get_chat_service
-import json
+from services.rate_limit import RateLimited, RateLimiter, client_ip, get_rate_limiter
+from services.streaming import ClientDisconnected, cancel_on_disconnect, sse_event, ws_frame
+from services.tracing import get_tracer, trace_id_for_session
 
 router = APIRouter()
 
@@ -41,20 +51,39 @@ class NewChatResponse(BaseModel):
 
 @router.post("/new", response_model=NewChatResponse)
 async def create_new_chat(
-    chat_service: ChatService = Depends(get_chat_service)
+    http_request: Request,
+    chat_service: ChatService = Depends(get_chat_service),
+    limiter: RateLimiter = Depends(get_rate_limiter)
 ):
     """
     새 채팅 시작
     
     - 익명 user_id 자동 생성
-    - Agent Engine에 새 세션 생성
+    - 미리 생성된 세션 풀에서 꺼내고, 비어 있으면 Agent Engine에 새 세션 생성
     - user_id와 session_id 반환
+    - user_id를 계속 새로 받아 제한을 피하지 못하도록 클라이언트 IP 버킷을 적용 (초과 시 429)
     
     프론트엔드는 이 정보를 저장해서 메시지 전송 시 사용
     """
+    start = time.perf_counter()
+    start_ns = time.time_ns()
     try:
-        result = chat_service.create_new_chat()
+        await limiter.check(None, _client_ip(http_request))
+    except RateLimited as e:
+        _reject_rate_limited("/chat/new", start, e)
+    
+    try:
+        result = await chat_service.acreate_new_chat()
         
+        metrics.REQUEST_DURATION.observe(
+            time.perf_counter() - start, endpoint="/chat/new", status="200"
+        )
+        get_tracer().start_span(
+            "POST /chat/new",
+            trace_id=trace_id_for_session(result["session_id"]),
+            start_ns=start_ns,
+            attributes={"user_id": result["user_id"], "session_id": result["session_id"]}
+        ).end()
         return NewChatResponse(
             user_id=result["user_id"],
             session_id=result["session_id"],
@@ -62,6 +91,11 @@ async def create_new_chat(
         )
     
     except Exception as e:
+        metrics.REQUEST_DURATION.observe(
+            time.perf_counter() - start, endpoint="/chat/new", status="500"
+        )
+        with get_tracer().start_span("POST /chat/new", start_ns=start_ns) as span:
+            span.record_error(e)
         raise HTTPException(
             status_code=500,
             detail=f"세션 생성 실패: {str(e)}"
@@ -70,7 +104,10 @@ async def create_new_chat(
 @router.post("/message")
 async def send_message(
     request: MessageRequest,
-    chat_service: ChatService = Depends(get_chat_service)
+    http_request: Request,
+    chat_service: ChatService = Depends(get_chat_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+    limiter: RateLimiter = Depends(get_rate_limiter)
 ):
     """
     메시지 전송 및 스트리밍 응답
@@ -78,39 +115,95 @@ async def send_message(
     - Agent Engine에 메시지 전송
     - SSE (Server-Sent Events) 방식으로 스트리밍 응답
     - 프론트엔드는 EventSource 또는 fetch로 수신
+    - 동시 스트림 수가 상한이면 대기열에서 기다리고, 대기열이 가득 차거나
+      대기 시간이 초과되면 429 + Retry-After 반환
+    - 클라이언트가 응답 도중 연결을 끊으면 업스트림 스트림을 중단하고 슬롯 반환
+    - user_id / 클라이언트 IP별 토큰 버킷이 비어 있으면 대기열에 들어가기 전에
+      429 + Retry-After 반환
     
-    응답 포맷:
+    응답 포맷 (text는 여러 글자가 묶인 청크, 타자기 효과는 프론트엔드 처리):
         data: {"text": "응답 텍스트", "done": false}
         data: {"text": "", "done": true}
     """
+    start = time.perf_counter()
+    # 요청 전체 구간 (대기열 대기 + 스트리밍) - 세션 단위 trace ID 사용
+    span = get_tracer().start_span(
+        "POST /chat/message",
+        trace_id=trace_id_for_session(request.session_id),
+        attributes={"user_id": request.user_id, "session_id": request.session_id}
+    )
+    try:
+        await limiter.check(request.user_id, _client_ip(http_request))
+    except RateLimited as e:
+        span.set_attributes({"http.status_code": 429, "rate_limited": e.scope})
+        span.end()
+        _reject_rate_limited("/chat/message", start, e)
+    
+    try:
+        slot = await admission.acquire()
+    except AdmissionRejected as e:
+        metrics.ADMISSION_REJECTED.inc(reason=e.reason)
+        metrics.REQUEST_DURATION.observe(
+            time.perf_counter() - start, endpoint="/chat/message", status="429"
+        )
+        span.set_attributes({"http.status_code": 429, "admission.rejected": e.reason})
+        span.end()
+        raise HTTPException(
+            status_code=429,
+            detail=f"요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({e.reason})",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    metrics.ADMISSION_WAIT.observe(slot.waited)
+    span.set_attribute("admission.wait_ms", slot.waited * 1000)
+    
+    def finish():
+        """슬롯 반환 + 요청 span 종료 (둘 다 여러 번 호출해도 안전)"""
+        slot.release()
+        span.end()
+    
     try:
         async def event_generator():
             """SSE 이벤트 생성기"""
+            status = "200"
             try:
-                # Agent Engine에서 스트리밍 응답 받기
-                for text_chunk in chat_service.stream_message(
+                # Agent Engine에서 스트리밍 응답 받기 (이벤트 루프 비차단)
+                async with aclosing(chat_service.astream_message(
                     user_id=request.user_id,
                     session_id=request.session_id,
-                    message=request.message
-                ):
-                    # SSE 포맷으로 전송
-                    event_data = {
-                        "text": text_chunk,
-                        "done": False
-                    }
-                    yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+                    message=request.message,
+                    parent=span
+                )) as chunks:
+                    # 연결이 끊기면 ClientDisconnected → 업스트림 중단
+                    async for text_chunk in cancel_on_disconnect(chunks, http_request.is_disconnected):
+                        # SSE 포맷으로 전송
+                        yield sse_event({"text": text_chunk, "done": False})
                 
                 # 스트림 종료 신호
-                yield f"data: {json.dumps({'text': '', 'done': True})}\n\n"
+                yield sse_event({"text": "", "done": True})
+            
+            except (ClientDisconnected, asyncio.CancelledError) as e:
+                # 클라이언트 이탈 (서버가 먼저 감지하면 CancelledError로 들어옴)
+                status = "499"
+                metrics.CLIENT_DISCONNECTS.inc(endpoint="/chat/message")
+                span.set_attribute("client_disconnected", True)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
             
             except Exception as e:
                 # 에러 발생 시
-                error_data = {
+                span.record_error(e)
+                yield sse_event({
                     "text": f"[오류] {str(e)}",
                     "done": True,
                     "error": True
-                }
-                yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+                })
+            
+            finally:
+                finish()
+                metrics.REQUEST_DURATION.observe(
+                    time.perf_counter() - start, endpoint="/chat/message", status=status
+                )
         
         return StreamingResponse(
             event_generator(),
@@ -119,12 +212,266 @@ async def send_message(
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
                 "X-Accel-Buffering": "no",  # Nginx 버퍼링 비활성화
-            }
+            },
+            # 제너레이터가 시작도 못 하고 끝난 경우에도 슬롯 반환
+            background=BackgroundTask(finish)
         )
     
     except Exception as e:
+        span.record_error(e)
+        finish()
         raise HTTPException(
             status_code=500,
             detail=f"메시지 전송 실패: {str(e)}"
         )
 
+
+def _client_ip(connection) -> Optional[str]:
+    """Request / WebSocket의 클라이언트 IP"""
+    return client_ip(connection.headers, connection.client.host if connection.client else None)
+
+
+def _reject_rate_limited(endpoint: str, start: float, e: RateLimited) -> None:
+    """빈도 제한 거절 기록 후 429"""
+    metrics.RATE_LIMITED.inc(endpoint=endpoint, scope=e.scope)
+    metrics.REQUEST_DURATION.observe(
+        time.perf_counter() - start, endpoint=endpoint, status="429"
+    )
+    raise HTTPException(
+        status_code=429,
+        detail=f"요청이 너무 잦습니다. {e.retry_after_header}초 후 다시 시도해주세요. ({e.scope})",
+        headers={"Retry-After": e.retry_after_header}
+    )
+
+
+@router.get("/stats")
+async def get_stats(
+    chat_service: ChatService = Depends(get_chat_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+    limiter: RateLimiter = Depends(get_rate_limiter)
+):
+    """
+    채팅 서비스 통계
+    
+    - session_pool: 세션 풀 크기, 히트율, 리필 지연(ms)
+    - response_cache / single_flight: 첫 턴 캐시 히트율, 공유된 스트림 수
+    - admission: 동시 스트림 수, 대기열 깊이, 대기 시간(ms), 거절 수
+    - rate_limit: 토큰 버킷 수, 허용 / 거절(user, ip) 수
+    """
+    return {**chat_service.stats(), "admission": admission.stats(), "rate_limit": limiter.stats()}
+
+
+# ============================================================================
+# WebSocket (한 연결로 여러 턴)
+# ============================================================================
+
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    user_id: str,
+    session_id: str,
+    format: str = "json",
+    chat_service: ChatService = Depends(get_chat_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+    limiter: RateLimiter = Depends(get_rate_limiter)
+):
+    """
+    WebSocket 채팅 - /chat/ws?user_id=...&session_id=...[&format=binary]
+    
+    연결 하나가 user_id / session_id에 묶이고, 턴마다 새 HTTP 요청 / SSE 설정 없이
+    같은 연결로 메시지를 주고받는다. 한 번에 한 턴만 진행된다.
+    
+    클라이언트 → 서버 (JSON 텍스트 프레임):
+        {"type": "message", "id": 1, "text": "졸업요건 알려줘"}
+        {"type": "cancel"}                      # 진행 중인 턴 중단
+        {"type": "ping"}
+    그 외 프레임(바이너리, JSON 객체가 아닌 텍스트)은 error 프레임으로 답하고 연결과 진행 중인 턴은 유지한다.
+    
+    서버 → 클라이언트 (compact JSON, SSE data와 같은 필드 + 턴 id):
+        {"id":1,"text":"응답 텍스트","done":false}   # format=binary면 UTF-8 바이너리 프레임
+        {"id":1,"text":"","done":true}
+        {"id":1,"done":true,"cancelled":true,"reason":"client"}
+        {"id":1,"text":"[오류] ...","done":true,"error":true}
+    
+    진행 중인 턴은 서버가 중단할 수 있다: 클라이언트 cancel(client), 새 메시지 도착(superseded).
+    동시 스트림 상한은 POST /chat/message와 같은 AdmissionController를 쓰며,
+    초과 시 해당 턴만 error + retry_after로 거절한다.
+    빈도 제한(user_id / IP 토큰 버킷)도 메시지마다 적용되며, 거절된 메시지는
+    진행 중인 턴을 중단하지 않는다.
+    """
+    await websocket.accept()
+    peer_ip = _client_ip(websocket)
+    connection = _ChatConnection(websocket, user_id, session_id, format == "binary", chat_service, admission)
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            # 바이너리 프레임 / JSON 객체가 아닌 프레임은 오류 프레임으로 답하고 연결(진행 중인 턴)은 유지
+            try:
+                frame = json.loads(message["text"]) if message.get("text") is not None else None
+            except json.JSONDecodeError:
+                frame = None
+            if not isinstance(frame, dict):
+                await connection.send({"done": True, "error": True, "text": "[오류] JSON 객체 텍스트 프레임이 아닙니다."})
+                continue
+            
+            kind = frame.get("type")
+            if kind == "message":
+                try:
+                    await limiter.check(user_id, peer_ip)
+                except RateLimited as e:
+                    metrics.RATE_LIMITED.inc(endpoint="/chat/ws", scope=e.scope)
+                    await connection.send({
+                        "id": frame.get("id"),
+                        "text": f"요청이 너무 잦습니다. {e.retry_after_header}초 후 다시 시도해주세요. ({e.scope})",
+                        "done": True,
+                        "error": True,
+                        "retry_after": int(e.retry_after_header)
+                    })
+                    continue
+                await connection.cancel("superseded")
+                connection.start(frame.get("id"), str(frame.get("text", "")))
+            elif kind == "cancel":
+                await connection.cancel("client")
+            elif kind == "ping":
+                await connection.send({"type": "pong"})
+    
+    except WebSocketDisconnect:
+        if connection.busy:
+            metrics.CLIENT_DISCONNECTS.inc(endpoint="/chat/ws")
+    
+    finally:
+        await connection.cancel(None)
+
+
+class _ChatConnection:
+    """WebSocket 연결 하나의 턴 실행 상태"""
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        session_id: str,
+        binary: bool,
+        chat_service: ChatService,
+        admission: AdmissionController
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.session_id = session_id
+        self.binary = binary
+        self.chat_service = chat_service
+        self.admission = admission
+        
+        self._turn: Optional[asyncio.Task] = None
+        self._turn_id = None
+        self._turns = 0
+        # 턴 태스크와 수신 루프가 같은 소켓에 보내므로 프레임 단위로 직렬화
+        self._send_lock = asyncio.Lock()
+    
+    async def send(self, data: dict) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(ws_frame(data))
+    
+    async def send_chunk(self, turn_id, text: str) -> None:
+        async with self._send_lock:
+            if self.binary:
+                await self.websocket.send_bytes(text.encode("utf-8"))
+            else:
+                await self.websocket.send_text(ws_frame({"id": turn_id, "text": text, "done": False}))
+    
+    @property
+    def busy(self) -> bool:
+        """진행 중인 턴이 있는지"""
+        return self._turn is not None and not self._turn.done()
+    
+    def start(self, turn_id, message: str) -> None:
+        """새 턴 시작 (id가 없으면 연결 안에서 순번 부여)"""
+        self._turns += 1
+        self._turn_id = turn_id if turn_id is not None else self._turns
+        self._turn = asyncio.create_task(self._run(self._turn_id, message))
+    
+    async def cancel(self, reason: Optional[str]) -> None:
+        """
+        진행 중인 턴 중단 - 업스트림 스트림까지 닫은 뒤 cancelled 프레임 전송
+        
+        reason이 None이면 (연결 종료) 프레임을 보내지 않는다.
+        """
+        turn = self._turn
+        self._turn = None
+        if turn is None or turn.done():
+            return
+        
+        turn.cancel()
+        try:
+            await turn
+        except (asyncio.CancelledError, Exception):
+            pass
+        
+        if reason is not None:
+            await self.send({"id": self._turn_id, "done": True, "cancelled": True, "reason": reason})
+    
+    async def _run(self, turn_id, message: str) -> None:
+        """턴 하나: 슬롯 확보 → astream_message 중계 → done"""
+        start = time.perf_counter()
+        span = get_tracer().start_span(
+            "WS /chat/ws",
+            trace_id=trace_id_for_session(self.session_id),
+            attributes={"user_id": self.user_id, "session_id": self.session_id, "turn_id": str(turn_id)}
+        )
+        
+        try:
+            slot = await self.admission.acquire()
+        except AdmissionRejected as e:
+            metrics.ADMISSION_REJECTED.inc(reason=e.reason)
+            metrics.REQUEST_DURATION.observe(
+                time.perf_counter() - start, endpoint="/chat/ws", status="429"
+            )
+            span.set_attributes({"admission.rejected": e.reason})
+            span.end()
+            await self.send({
+                "id": turn_id,
+                "text": f"요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({e.reason})",
+                "done": True,
+                "error": True,
+                "retry_after": e.retry_after
+            })
+            return
+        
+        metrics.ADMISSION_WAIT.observe(slot.waited)
+        span.set_attribute("admission.wait_ms", slot.waited * 1000)
+        
+        try:
+            async with aclosing(self.chat_service.astream_message(
+                user_id=self.user_id,
+                session_id=self.session_id,
+                message=message,
+                parent=span
+            )) as chunks:
+                async for text_chunk in chunks:
+                    await self.send_chunk(turn_id, text_chunk)
+            
+            await self.send({"id": turn_id, "text": "", "done": True})
+        
+        except asyncio.CancelledError:
+            span.set_attribute("cancelled", True)
+            raise
+        
+        except WebSocketDisconnect:
+            span.set_attribute("cancelled", True)
+        
+        except Exception as e:
+            span.record_error(e)
+            try:
+                await self.send({"id": turn_id, "text": f"[오류] {str(e)}", "done": True, "error": True})
+            except Exception:
+                pass  # 소켓이 이미 닫힘
+        
+        finally:
+            slot.release()
+            span.end()
+            metrics.REQUEST_DURATION.observe(
+                time.perf_counter() - start, endpoint="/chat/ws", status="200"
+            )
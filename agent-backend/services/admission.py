@@ -0,0 +1,160 @@
+"""
+어드미션 컨트롤 - 인스턴스당 동시 업스트림 스트림 수 제한
+
+트래픽이 몰리면 요청이 그대로 Agent Engine과 Discovery Engine 쿼터로 번진다.
+AdmissionController는 동시에 진행되는 스트림 수를 max_concurrent로 제한하고,
+초과 요청은 크기가 정해진 대기열에서 기다리게 한다.
+
+  - 대기열이 가득 차면 즉시 거절 (queue_full)
+  - queue_timeout 안에 자리가 나지 않으면 거절 (queue_timeout)
+  - 거절된 요청은 라우터에서 429 + Retry-After로 응답
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+import config
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 찼거나 대기 시간이 초과되어 요청을 받을 수 없음"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """동시 실행 수 제한 + 대기열 (이벤트 루프 스레드 전용)"""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        """
+        Args:
+            max_concurrent: 동시에 진행할 수 있는 스트림 수
+            max_queue: 자리를 기다릴 수 있는 요청 수
+            queue_timeout: 대기열에서 기다리는 최대 시간 (초)
+            retry_after: 거절 시 Retry-After 헤더 값 (초)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+
+        # 통계
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        self.max_waiting = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    async def acquire(self) -> "AdmissionSlot":
+        """
+        실행 슬롯 하나 확보
+
+        Returns:
+            슬롯 핸들 (스트림이 끝나면 release() 호출)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나 queue_timeout 초과
+        """
+        start = time.perf_counter()
+
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                raise AdmissionRejected("queue_full", self.retry_after)
+
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected["queue_timeout"] += 1
+                raise AdmissionRejected("queue_timeout", self.retry_after)
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        waited = time.perf_counter() - start
+        self.active += 1
+        self.admitted += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        return AdmissionSlot(self, waited)
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """게이지: 동시 실행 수, 대기열 깊이, 대기 시간"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "queue_depth_max": self.max_waiting,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "wait_ms": {
+                "avg": self._wait_seconds_total / self.admitted * 1000 if self.admitted else 0.0,
+                "max": self._wait_seconds_max * 1000,
+            },
+        }
+
+
+class AdmissionSlot:
+    """
+    확보한 슬롯 핸들
+
+    release()는 여러 번 불려도 한 번만 반환하므로 스트림 종료 시점과
+    응답 백그라운드 태스크 양쪽에서 안전하게 호출할 수 있다.
+    """
+
+    def __init__(self, controller: AdmissionController, waited: float):
+        self._controller = controller
+        self._released = False
+        self.waited = waited  # 대기열에서 기다린 시간 (초)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release()
+
+
+# 싱글톤 인스턴스
+_admission_instance: Optional[AdmissionController] = None
+_admission_lock = threading.Lock()
+
+def get_admission_controller() -> AdmissionController:
+    """
+    AdmissionController 싱글톤 인스턴스 반환
+
+    FastAPI dependency injection용 (동기 함수라 스레드풀에서 실행될 수 있어 락 사용)
+    """
+    global _admission_instance
+
+    if _admission_instance is None:
+        with _admission_lock:
+            if _admission_instance is None:
+                _admission_instance = AdmissionController(
+                    max_concurrent=config.ADMISSION_MAX_CONCURRENT,
+                    max_queue=config.ADMISSION_MAX_QUEUE,
+                    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                    retry_after=config.ADMISSION_RETRY_AFTER_SECONDS,
+                )
+
+    return _admission_instance
@@ -1,26 +1,115 @@
 """
 채팅 서비스 - Vertex AI Agent Engine과 통신
 """
+import asyncio
+import threading
 import time
 import uuid
+from collections import OrderedDict
 import vertexai
 from vertexai import agent_engines
-from typing import Generator, Dict, Any
+from typing import AsyncGenerator, AsyncIterator, Generator, Dict, Any, List, Optional
 import config
+from services import metrics
+from services.response_cache import ResponseCache, normalize_message
+from services.session_pool import SessionPool
+from services.single_flight import SingleFlight
+from services.streaming import coalesce_chunks, iterate_in_thread
+from services.tracing import NOOP_SPAN, Span, get_tracer, span_id_for_invocation, trace_id_for_session
+
+# 첫 턴 여부 / 캐시 응답 맥락을 추적하는 세션 수 상한
+_MAX_TRACKED_SESSIONS = 10000
+
+# 업스트림 평균 시간 EMA 가중치
+_UPSTREAM_AVG_ALPHA = 0.1
 
 class ChatService:
     """Agent Engine과 통신하는 서비스"""
     
-    def __init__(self):
-        """Vertex AI 및 Agent Engine 초기화"""
+    def __init__(self, engine: Optional[Any] = None):
+        """
+        Vertex AI 및 Agent Engine 초기화
+        
+        Args:
+            engine: 사용할 엔진 객체 (create_session, stream_query 제공).
+                None이면 config.AGENT_RESOURCE_ID의 Agent Engine에 연결
+                (AGENT_RUNTIME=local이면 로컬 ADK 런너)
+        """
+        # 단계별 초기화 소요 시간 (초) - 콜드 스타트 추적용
+        self.startup_timings: Dict[str, float] = {}
+        
+        if engine is None:
+            engine = self._connect_engine()
+        self.engine = engine
+        
+        # 미리 생성해 두는 세션 풀 (첫 acquire 시 백그라운드 리필 시작)
+        self.session_pool = SessionPool(
+            factory=self.create_new_chat,
+            min_size=config.SESSION_POOL_MIN_SIZE,
+            max_size=config.SESSION_POOL_MAX_SIZE,
+            ttl_seconds=config.SESSION_POOL_TTL_SECONDS,
+        )
+        
+        # 맥락 없는 첫 턴 답변 캐시
+        self.response_cache = ResponseCache(
+            max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=config.RESPONSE_CACHE_MAX_BYTES,
+            ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS,
+        )
+        
+        # 동시에 들어온 같은 첫 질문은 업스트림 스트림 하나를 공유
+        self.single_flight = SingleFlight(enabled=config.SINGLE_FLIGHT_ENABLED)
+        
+        # 이 인스턴스가 발급했고 아직 메시지가 없는 세션 (= 첫 턴 캐시 대상)
+        self._fresh_sessions: "OrderedDict[str, bool]" = OrderedDict()
+        # 캐시 / 싱글 플라이트로 답한 첫 질문 - 다음 턴에 맥락으로 붙여서 엔진에 전달
+        self._cached_turns: "OrderedDict[str, str]" = OrderedDict()
+        
+        # 끝까지 받은 업스트림 스트림의 평균 시간 (EMA) - 중단 시 아낀 시간 추정용
+        self._upstream_seconds_avg: Optional[float] = None
+        self._upstream_cancelled = 0
+        self._llm_seconds_saved = 0.0
+    
+    def _connect_engine(self) -> Any:
+        """Vertex AI 초기화 후 배포된 Agent Engine 핸들 반환"""
+        if config.FAKE_AGENT_ENGINE:
+            # 로컬 부하 테스트용 가짜 엔진 (Vertex AI 연결 없음)
+            from services.fake_engine import FakeAgentEngine
+            return FakeAgentEngine.from_config()
+        
+        if config.AGENT_RUNTIME == "local":
+            # goole_adk root_agent를 이 프로세스에서 실행 (원격 Agent Engine 홉 없음)
+            start = time.perf_counter()
+            from services.local_engine import LocalAgentEngine
+            engine = LocalAgentEngine.from_config()
+            self.startup_timings["local_runner_init"] = time.perf_counter() - start
+            return engine
+        
         # Vertex AI 초기화
+        start = time.perf_counter()
         vertexai.init(
             project=config.GOOGLE_CLOUD_PROJECT,
             location=config.VERTEX_AI_LOCATION
         )
+        self.startup_timings["vertexai_init"] = time.perf_counter() - start
         
         # 배포된 Agent Engine 가져오기
-        self.engine = agent_engines.get(config.AGENT_RESOURCE_ID)
+        start = time.perf_counter()
+        engine = agent_engines.get(config.AGENT_RESOURCE_ID)
+        self.startup_timings["engine_fetch"] = time.perf_counter() - start
+        
+        return engine
+    
+    async def acreate_new_chat(self) -> Dict[str, str]:
+        """
+        새 채팅 시작 (비동기) - 세션 풀에서 꺼내고, 비어 있으면 직접 생성
+        
+        Returns:
+            {"user_id": "anon_xxx", "session_id": "session_yyy"}
+        """
+        result = await self.session_pool.acquire()
+        _remember(self._fresh_sessions, result["session_id"], True)
+        return result
     
     def create_new_chat(self) -> Dict[str, str]:
         """
@@ -33,7 +122,13 @@ class ChatService:
         user_id = f"anon_{uuid.uuid4().hex[:8]}"
         
         # 세션 생성
-        session_response = self.engine.create_session(user_id=user_id)
+        start = time.perf_counter()
+        try:
+            session_response = self.engine.create_session(user_id=user_id)
+        except Exception as e:
+            metrics.UPSTREAM_ERRORS.inc(operation="create_session", error=type(e).__name__)
+            raise
+        metrics.SESSION_CREATE_DURATION.observe(time.perf_counter() - start)
         
         # 세션 ID 추출
         if isinstance(session_response, dict):
@@ -55,7 +150,7 @@ class ChatService:
         message: str
     ) -> Generator[str, None, None]:
         """
-        메시지 전송 및 스트리밍 응답
+        메시지 전송 및 스트리밍 응답 (동기)
         
         Args:
             user_id: 사용자 ID
@@ -66,24 +161,236 @@ class ChatService:
             Agent 응답 텍스트 (작은 청크로 스트리밍)
         """
         try:
-            # Reasoning Engine에 메시지 전송 (스트리밍)
-            for event in self.engine.stream_query(
-                user_id=user_id,
-                session_id=session_id,
-                message=message
-            ):
-                # 응답에서 텍스트 추출
-                text = self._extract_text(event)
-                if text:
-                    # 텍스트를 문자 단위로 나눠서 전송 (한글도 정상 처리)
-                    # 한 글자씩 전송 (프론트엔드에서 지연 처리)
-                    for char in text:
-                        yield char
+            for text in self._iter_text(user_id, session_id, message):
+                # 텍스트를 문자 단위로 나눠서 전송 (한글도 정상 처리)
+                # 한 글자씩 전송 (프론트엔드에서 지연 처리)
+                for char in text:
+                    yield char
         
         except Exception as e:
             # 에러 발생 시 에러 메시지 반환
             yield f"\n\n[오류] {str(e)}"
     
+    async def astream_message(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        parent: Optional[Span] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        메시지 전송 및 스트리밍 응답 (비동기)
+        
+        블로킹되는 Agent Engine 스트림은 전용 스레드에서 소비하므로
+        이벤트 루프를 막지 않는다. 청크 단위는 config.STREAM_FRAMING을 따른다.
+          - "coalesce": 바이트 예산 / 시간 창 단위로 묶어서 전송 (기본)
+          - "char": 한 글자씩 전송 (기존 방식)
+        
+        맥락 없는 첫 턴은 응답 캐시를 먼저 확인하고, 히트하면 엔진 호출 없이
+        같은 형식으로 캐시된 답변을 내보낸다. 캐시에 없더라도 같은 첫 질문이
+        이미 진행 중이면 그 업스트림 스트림을 함께 받는다 (싱글 플라이트).
+        
+        Args:
+            user_id: 사용자 ID
+            session_id: 세션 ID
+            message: 사용자 메시지
+            parent: 트레이스 부모 span (라우터의 요청 span)
+            
+        Yields:
+            Agent 응답 텍스트 청크
+        """
+        start = time.perf_counter()
+        first_turn = self._fresh_sessions.pop(session_id, False)
+        span = get_tracer().start_span(
+            "chat.stream",
+            parent=parent,
+            trace_id=trace_id_for_session(session_id),
+            attributes={"session_id": session_id, "first_turn": first_turn}
+        )
+        first_turn_key = normalize_message(message) if first_turn else None
+        
+        # 응답 출처: upstream(엔진 직접 호출) / cache(응답 캐시) / shared(싱글 플라이트 합류)
+        source = "upstream"
+        texts = None
+        
+        if first_turn_key and self.response_cache.enabled:
+            cached = self.response_cache.get(first_turn_key)
+            if cached is not None:
+                _remember(self._cached_turns, session_id, message)
+                texts = _replay(cached.text)
+                source = "cache"
+        
+        if texts is None and first_turn_key and self.single_flight.enabled:
+            # 같은 첫 질문이 진행 중이면 그 스트림에 합류
+            texts, leader = self.single_flight.subscribe(
+                first_turn_key,
+                lambda: self._upstream(user_id, session_id, message, first_turn_key, span)
+            )
+            if not leader:
+                _remember(self._cached_turns, session_id, message)
+                source = "shared"
+        elif texts is None:
+            upstream_message = self._with_cached_context(session_id, message)
+            texts = self._upstream(user_id, session_id, upstream_message, first_turn_key, span)
+        
+        span.set_attribute("source", source)
+        first_chunk_at = None
+        chars = 0
+        try:
+            async for chunk in self._frame(texts):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                    metrics.TIME_TO_FIRST_TOKEN.observe(first_chunk_at - start, source=source)
+                    span.set_attribute("ttft_ms", (first_chunk_at - start) * 1000)
+                chars += len(chunk)
+                yield chunk
+        
+        except Exception as e:
+            metrics.UPSTREAM_ERRORS.inc(operation="stream_query", error=type(e).__name__)
+            span.record_error(e)
+            yield f"\n\n[오류] {str(e)}"
+            return
+        
+        finally:
+            span.set_attribute("chars", chars)
+            span.end()
+        
+        duration = time.perf_counter() - start
+        metrics.STREAM_DURATION.observe(duration, source=source)
+        if chars and duration > 0:
+            metrics.CHARS_PER_SECOND.observe(chars / duration, source=source)
+    
+    async def _upstream(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        cache_key: Optional[str] = None,
+        parent: Optional[Span] = None
+    ) -> AsyncIterator[str]:
+        """
+        Agent Engine 스트림을 스레드에서 소비하며 텍스트 yield
+        
+        cache_key가 있으면 끝까지 받은 답변을 응답 캐시에 저장한다.
+        소비자가 중간에 떠나면(클라이언트 연결 끊김, WebSocket 취소) 스레드의
+        엔진 스트림을 닫고 아낀 시간을 추정해 메트릭에 더한다.
+        """
+        parts: List[str] = []
+        start = time.perf_counter()
+        
+        try:
+            with get_tracer().start_span("engine.stream_query", parent=parent) as span:
+                async for text in iterate_in_thread(
+                    lambda: self._iter_text(user_id, session_id, message, span)
+                ):
+                    parts.append(text)
+                    yield text
+        except (GeneratorExit, asyncio.CancelledError):
+            self._record_upstream_cancelled(time.perf_counter() - start)
+            raise
+        
+        duration = time.perf_counter() - start
+        self._record_upstream_completed(duration)
+        if cache_key:
+            self.response_cache.put(cache_key, "".join(parts), duration)
+    
+    def _record_upstream_completed(self, duration: float) -> None:
+        if self._upstream_seconds_avg is None:
+            self._upstream_seconds_avg = duration
+        else:
+            self._upstream_seconds_avg += _UPSTREAM_AVG_ALPHA * (duration - self._upstream_seconds_avg)
+    
+    def _record_upstream_cancelled(self, elapsed: float) -> None:
+        # 평균 시간이 아직 없으면(완료된 스트림 없음) 아낀 시간을 0으로 봄
+        saved = max(0.0, (self._upstream_seconds_avg or 0.0) - elapsed)
+        self._upstream_cancelled += 1
+        self._llm_seconds_saved += saved
+        metrics.UPSTREAM_CANCELLED.inc()
+        metrics.LLM_SECONDS_SAVED.inc(saved)
+    
+    def _frame(self, texts: AsyncIterator[str]) -> AsyncIterator[str]:
+        """config.STREAM_FRAMING에 맞게 텍스트를 전송 단위로 나누거나 묶음"""
+        if config.STREAM_FRAMING == "char":
+            return _split_chars(texts)
+        return coalesce_chunks(texts)
+    
+    def _with_cached_context(self, session_id: str, message: str) -> str:
+        """
+        직전 턴을 캐시로 답했다면 그 질문을 맥락으로 붙임
+        
+        캐시 히트 턴은 엔진 세션 기록에 남지 않으므로, 다음 질문이
+        첫 질문을 이어받을 수 있도록 한 번만 함께 보낸다.
+        """
+        previous = self._cached_turns.pop(session_id, None)
+        if previous is None:
+            return message
+        return f"(이전 질문: {previous} - 이미 답변함)\n{message}"
+    
+    def _iter_text(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        span: Span = NOOP_SPAN
+    ) -> Generator[str, None, None]:
+        """
+        Agent Engine 스트림에서 텍스트가 있는 이벤트만 골라 yield
+        
+        트레이싱이 켜져 있으면 이벤트마다 직전 이벤트 이후 기다린 구간을
+        engine.event span으로 남긴다 (라우팅 호출 / 도구 실행 / 답변 생성 구분용).
+        
+        Yields:
+            이벤트 단위 응답 텍스트
+        """
+        tracer = get_tracer()
+        invocations: Dict[str, Span] = {}
+        last_ns = time.time_ns()
+        
+        # Reasoning Engine에 메시지 전송 (스트리밍)
+        events = self.engine.stream_query(
+            user_id=user_id,
+            session_id=session_id,
+            message=message
+        )
+        
+        try:
+            for event in events:
+                now_ns = time.time_ns()
+                if tracer.enabled:
+                    _trace_event(tracer, span, invocations, event, last_ns, now_ns)
+                last_ns = now_ns
+                
+                # 응답에서 텍스트 추출
+                text = self._extract_text(event)
+                if text:
+                    yield text
+        
+        finally:
+            # 중간에 닫힌 경우 엔진 스트림도 바로 닫음
+            close = getattr(events, "close", None)
+            if close is not None:
+                close()
+            for invocation in invocations.values():
+                invocation.end(last_ns)
+    
+    def stats(self) -> Dict[str, Any]:
+        """서비스 내부 통계"""
+        stats = {
+            "session_pool": self.session_pool.stats(),
+            "response_cache": self.response_cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "upstream": {
+                "avg_seconds": self._upstream_seconds_avg,
+                "cancelled": self._upstream_cancelled,
+                "llm_seconds_saved": round(self._llm_seconds_saved, 3),
+            },
+        }
+        # AGENT_RUNTIME=local + sqlite 세션 저장소
+        store_stats = getattr(getattr(self.engine, "session_service", None), "stats", None)
+        if callable(store_stats):
+            stats["session_store"] = store_stats()
+        return stats
+    
     def _extract_text(self, event: Dict[str, Any]) -> str:
         """
         Agent Engine 응답 이벤트에서 텍스트 추출
@@ -107,19 +414,103 @@ class ChatService:
         
         return ""
 
+def _remember(tracked: OrderedDict, key: str, value: Any) -> None:
+    """크기 제한이 있는 OrderedDict에 추가 (넘치면 오래된 것부터 제거)"""
+    tracked[key] = value
+    tracked.move_to_end(key)
+    while len(tracked) > _MAX_TRACKED_SESSIONS:
+        tracked.popitem(last=False)
+
+def _trace_event(
+    tracer,
+    stream_span: Span,
+    invocations: Dict[str, Span],
+    event: Any,
+    start_ns: int,
+    end_ns: int
+) -> None:
+    """
+    엔진 이벤트 하나를 engine.event span으로 기록
+    
+    이벤트는 ADK invocation_id별 agent.invocation span 아래에 둔다. 이 span의 ID는
+    invocation_id에서 만들어지므로 goole_adk 쪽 LLM / 도구 span과 같은 부모를 공유한다.
+    """
+    if not isinstance(event, dict):
+        return
+    
+    parent = stream_span
+    invocation_id = event.get("invocation_id")
+    if invocation_id:
+        parent = invocations.get(invocation_id)
+        if parent is None:
+            parent = invocations[invocation_id] = tracer.start_span(
+                "agent.invocation",
+                parent=stream_span,
+                span_id=span_id_for_invocation(invocation_id),
+                start_ns=stream_span.start_ns or start_ns,
+                attributes={"invocation_id": invocation_id}
+            )
+    
+    attributes: Dict[str, Any] = {"author": event.get("author", ""), "kind": "other"}
+    functions = []
+    for part in (event.get("content") or {}).get("parts") or []:
+        if not isinstance(part, dict):
+            continue
+        if part.get("function_call"):
+            attributes["kind"] = "function_call"
+            functions.append(part["function_call"].get("name", ""))
+        elif part.get("function_response"):
+            attributes["kind"] = "function_response"
+            functions.append(part["function_response"].get("name", ""))
+        elif part.get("text"):
+            attributes["kind"] = "text"
+            attributes["text_chars"] = attributes.get("text_chars", 0) + len(part["text"])
+    if functions:
+        attributes["functions"] = ",".join(functions)
+    
+    tracer.start_span(
+        "engine.event", parent=parent, start_ns=start_ns, attributes=attributes
+    ).end(end_ns)
+
+async def _split_chars(texts: AsyncIterator[str]) -> AsyncIterator[str]:
+    """텍스트를 한 글자씩 나눠서 yield (char 프레이밍)"""
+    async for text in texts:
+        for char in text:
+            yield char
+
+async def _replay(text: str) -> AsyncIterator[str]:
+    """캐시된 답변을 스트림으로 변환"""
+    yield text
+
 # 싱글톤 인스턴스 (앱 시작 시 한 번만 초기화)
-_chat_service_instance = None
+_chat_service_instance: Optional[ChatService] = None
+_chat_service_lock = threading.Lock()
 
-def get_chat_service() -> ChatService:
+def init_chat_service() -> ChatService:
     """
-    ChatService 싱글톤 인스턴스 반환
+    ChatService 싱글톤 생성 (이미 있으면 그대로 반환)
     
-    FastAPI dependency injection용
+    앱 시작(lifespan)에서 호출되며, 백그라운드 초기화 중에 요청이 들어와도
+    락으로 기다리게 해서 인스턴스가 두 번 만들어지지 않도록 한다.
+    블로킹 호출이므로 이벤트 루프에서는 스레드로 실행할 것.
     """
     global _chat_service_instance
     
     if _chat_service_instance is None:
-        _chat_service_instance = ChatService()
+        with _chat_service_lock:
+            if _chat_service_instance is None:
+                _chat_service_instance = ChatService()
     
     return _chat_service_instance
 
+def get_chat_service() -> ChatService:
+    """
+    ChatService 싱글톤 인스턴스 반환
+    
+    FastAPI dependency injection용 (동기 함수라 스레드풀에서 실행됨)
+    """
+    return init_chat_service()
+
+def peek_chat_service() -> Optional[ChatService]:
+    """초기화를 유발하지 않고 현재 인스턴스 반환 (없으면 None)"""
+    return _chat_service_instance
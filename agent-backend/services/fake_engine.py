@@ -0,0 +1,128 @@
+"""
+가짜 Agent Engine - 쿼터 없이 로컬 부하 테스트를 하기 위한 대역
+
+vertexai agent_engines 핸들과 같은 create_session / stream_query를 제공한다.
+실제 엔진처럼 블로킹 제너레이터로 이벤트를 내보내므로 스레드 브리지, 코얼레싱,
+어드미션 컨트롤 등 백엔드 경로가 그대로 실행된다.
+
+이벤트 순서 (실제 루트 에이전트 → 하위 에이전트 흐름 흉내):
+  1. kangnam_assistant: transfer_to_agent function_call / function_response
+  2. (first_token_delay 동안 대기)
+  3. 하위 에이전트 텍스트 토큰을 tokens_per_second 속도로 전송
+
+error_rate 확률로 create_session 또는 stream_query 도중 RuntimeError를 낸다.
+"""
+
+import random
+import time
+import uuid
+from typing import Any, Dict, Generator, Optional
+import config
+
+
+class FakeEngineError(RuntimeError):
+    """주입된 엔진 오류"""
+
+
+class FakeAgentEngine:
+    """create_session / stream_query만 흉내 내는 가짜 엔진 (스레드 안전)"""
+
+    def __init__(
+        self,
+        first_token_delay: float = 0.8,
+        tokens_per_second: float = 40.0,
+        chars_per_token: int = 3,
+        answer_chars: int = 400,
+        session_delay: float = 0.3,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            first_token_delay: 메시지 수신부터 첫 텍스트 토큰까지 지연 (초)
+            tokens_per_second: 초당 텍스트 토큰(이벤트) 수 (0 이하면 지연 없음)
+            chars_per_token: 토큰당 글자 수
+            answer_chars: 답변 길이 (글자)
+            session_delay: create_session 지연 (초)
+            error_rate: 호출마다 오류를 낼 확률 (0~1)
+            seed: 오류 주입 난수 시드 (재현용)
+        """
+        self.first_token_delay = first_token_delay
+        self.tokens_per_second = tokens_per_second
+        self.chars_per_token = max(1, chars_per_token)
+        self.answer_chars = answer_chars
+        self.session_delay = session_delay
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_config(cls) -> "FakeAgentEngine":
+        """config.FAKE_ENGINE_* 값으로 생성"""
+        return cls(
+            first_token_delay=config.FAKE_ENGINE_FIRST_TOKEN_DELAY_MS / 1000,
+            tokens_per_second=config.FAKE_ENGINE_TOKENS_PER_SECOND,
+            chars_per_token=config.FAKE_ENGINE_CHARS_PER_TOKEN,
+            answer_chars=config.FAKE_ENGINE_ANSWER_CHARS,
+            session_delay=config.FAKE_ENGINE_SESSION_DELAY_MS / 1000,
+            error_rate=config.FAKE_ENGINE_ERROR_RATE,
+        )
+
+    def _should_fail(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def create_session(self, user_id: str) -> Dict[str, Any]:
+        time.sleep(self.session_delay)
+        if self._should_fail():
+            raise FakeEngineError("[fake engine] create_session 오류 주입")
+        return {"id": uuid.uuid4().hex, "user_id": user_id}
+
+    def stream_query(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str
+    ) -> Generator[Dict[str, Any], None, None]:
+        invocation_id = f"e-{uuid.uuid4()}"
+        answer = _make_answer(message, self.answer_chars)
+        tokens = [
+            answer[i:i + self.chars_per_token]
+            for i in range(0, len(answer), self.chars_per_token)
+        ]
+        # 실패할 위치: -1이면 첫 토큰 전, 그 외에는 해당 토큰 직전
+        fail_at = self._random.randrange(-1, len(tokens)) if self._should_fail() else None
+
+        # 라우팅 (루트 에이전트의 transfer_to_agent 호출)
+        time.sleep(self.first_token_delay / 2)
+        yield _event(invocation_id, "kangnam_assistant", {
+            "function_call": {"name": "transfer_to_agent", "args": {"agent_name": "fake_agent"}}
+        })
+        yield _event(invocation_id, "kangnam_assistant", {
+            "function_response": {"name": "transfer_to_agent", "response": {"result": None}}
+        })
+        time.sleep(self.first_token_delay / 2)
+
+        if fail_at == -1:
+            raise FakeEngineError("[fake engine] 첫 토큰 전 오류 주입")
+
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for index, token in enumerate(tokens):
+            if index == fail_at:
+                raise FakeEngineError("[fake engine] 스트리밍 중 오류 주입")
+            if index and interval:
+                time.sleep(interval)
+            yield _event(invocation_id, "fake_agent", {"text": token})
+
+
+def _event(invocation_id: str, author: str, part: Dict[str, Any]) -> Dict[str, Any]:
+    """Agent Engine stream_query 이벤트와 같은 모양의 dict"""
+    return {
+        "invocation_id": invocation_id,
+        "author": author,
+        "content": {"role": "model", "parts": [part]},
+    }
+
+
+def _make_answer(message: str, length: int) -> str:
+    """메시지를 포함한 고정 길이 답변"""
+    base = f"'{message[:30]}'에 대한 테스트 답변입니다. 강남대학교 정보를 안내해 드립니다. "
+    return (base * (length // len(base) + 1))[:length]
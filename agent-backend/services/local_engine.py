@@ -0,0 +1,149 @@
+"""
+로컬 ADK 런너 - goole_adk root_agent를 이 프로세스 안에서 실행하는 엔진
+
+기본 경로는 백엔드 → Vertex AI Agent Engine(원격) → ADK root_agent 이다.
+AGENT_RUNTIME=local 이면 root_agent를 직접 import해서 ADK Runner로 실행하므로
+원격 홉과 엔진 쪽 세션 저장(왕복)이 빠진다.
+
+vertexai agent_engines 핸들과 같은 create_session / stream_query(블로킹 제너레이터,
+dict 이벤트)를 제공하므로 ChatService의 스레드 브리지, 코얼레싱, 트레이싱 경로가
+그대로 실행된다.
+
+세션 저장소 (LOCAL_SESSION_BACKEND):
+  - "memory": ADK InMemorySessionService (재시작하면 대화 기록이 사라짐)
+  - "sqlite": SqliteSessionService - 메모리 LRU + write-behind SQLite 파일
+    (LOCAL_SESSION_DB_PATH, services/session_store.py)
+  - "adk-sqlite": ADK DatabaseSessionService + sqlite 파일 (이벤트마다 동기 기록)
+
+goole_adk 패키지는 저장소 루트에 있으므로 PYTHONPATH에 저장소 루트가 있어야 한다.
+"""
+
+import asyncio
+import contextvars
+import os
+from typing import Any, Dict, Generator, Optional
+import config
+
+# 지원하는 세션 저장소
+SESSION_BACKENDS = ("memory", "sqlite", "adk-sqlite")
+
+
+def create_session_service(backend: str, db_path: Optional[str] = None) -> Any:
+    """
+    ADK 세션 서비스 생성
+
+    Args:
+        backend: "memory", "sqlite" 또는 "adk-sqlite"
+        db_path: sqlite 파일 경로 (기본: config.LOCAL_SESSION_DB_PATH)
+
+    Raises:
+        ValueError: 알 수 없는 backend
+    """
+    if backend == "memory":
+        from google.adk.sessions import InMemorySessionService
+        return InMemorySessionService()
+
+    path = db_path or config.LOCAL_SESSION_DB_PATH
+
+    if backend == "sqlite":
+        from services.session_store import SqliteSessionService
+        return SqliteSessionService(
+            path,
+            hot_sessions=config.SESSION_STORE_HOT_SESSIONS,
+            max_events=config.SESSION_STORE_MAX_EVENTS,
+            flush_interval=config.SESSION_STORE_FLUSH_INTERVAL_MS / 1000,
+        )
+
+    if backend == "adk-sqlite":
+        from google.adk.sessions import DatabaseSessionService
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return DatabaseSessionService(db_url=f"sqlite:///{path}")
+
+    raise ValueError(f"알 수 없는 LOCAL_SESSION_BACKEND: {backend} (가능: {', '.join(SESSION_BACKENDS)})")
+
+
+def load_root_agent() -> Any:
+    """goole_adk.agent.root_agent import (저장소 루트가 PYTHONPATH에 있어야 함)"""
+    try:
+        from goole_adk.agent import root_agent
+    except ImportError as e:
+        raise RuntimeError(
+            "AGENT_RUNTIME=local 에는 goole_adk 패키지가 필요합니다. "
+            "저장소 루트를 PYTHONPATH에 추가하세요 (예: PYTHONPATH=.. uvicorn main:app)"
+        ) from e
+    return root_agent
+
+
+class LocalAgentEngine:
+    """ADK Runner를 감싼 Agent Engine 대역 (스레드 안전)"""
+
+    def __init__(self, agent: Any, session_service: Any, app_name: str = "kangnam_assistant"):
+        """
+        Args:
+            agent: 실행할 ADK 루트 에이전트
+            session_service: ADK 세션 서비스 (create_session_service 참고)
+            app_name: 세션 저장소의 app_name
+        """
+        from google.adk.runners import Runner
+
+        self.app_name = app_name
+        self.session_service = session_service
+        self.runner = Runner(app_name=app_name, agent=agent, session_service=session_service)
+
+    @classmethod
+    def from_config(cls) -> "LocalAgentEngine":
+        """config.LOCAL_* 값으로 생성"""
+        return cls(
+            agent=load_root_agent(),
+            session_service=create_session_service(config.LOCAL_SESSION_BACKEND),
+            app_name=config.LOCAL_APP_NAME,
+        )
+
+    def create_session(self, user_id: str) -> Dict[str, Any]:
+        # 워커 스레드에서 호출됨 (SessionPool / asyncio.to_thread)
+        session = asyncio.run(
+            self.session_service.create_session(app_name=self.app_name, user_id=user_id)
+        )
+        return {"id": session.id, "user_id": user_id}
+
+    def stream_query(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Runner.run_async를 이 스레드의 이벤트 루프에서 한 이벤트씩 진행하며 yield
+
+        동기 도구(검색 API 호출)가 루프를 막으므로 스트림마다 전용 루프를 쓴다.
+        모든 단계를 같은 contextvars 컨텍스트에서 실행해 ADK / 트레이싱의
+        컨텍스트 토큰이 단계 사이에서 어긋나지 않게 한다.
+        """
+        from google.genai import types
+
+        loop = asyncio.new_event_loop()
+        context = contextvars.copy_context()
+        events = self.runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+        )
+
+        try:
+            while True:
+                try:
+                    event = loop.run_until_complete(
+                        loop.create_task(events.__anext__(), context=context)
+                    )
+                except StopAsyncIteration:
+                    return
+                # Agent Engine이 보내는 이벤트와 같은 dict 형태
+                yield event.model_dump(mode="json", exclude_none=True)
+        finally:
+            # 중간에 닫히면 (클라이언트 이탈) 에이전트 실행도 여기서 중단
+            try:
+                loop.run_until_complete(loop.create_task(events.aclose(), context=context))
+            finally:
+                loop.close()
@@ -0,0 +1,283 @@
+"""
+메트릭 - Prometheus 텍스트 포맷으로 내보내는 카운터 / 게이지 / 히스토그램
+
+외부 라이브러리 없이 필요한 만큼만 구현한다. 모든 메트릭은 REGISTRY에 등록되고
+/metrics 엔드포인트가 REGISTRY.render() 결과를 그대로 반환한다.
+세션 생성은 워커 스레드에서도 기록되므로 메트릭마다 락을 둔다.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Prometheus 텍스트 포맷 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """메트릭 공통 (이름, 설명, 라벨)"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 (값 대신 콜백을 주면 스크레이프 시점에 읽음)"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, help_text)
+        self._callback = callback
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def _samples(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                value = float(self._callback())
+            except Exception:
+                return []
+        else:
+            value = self._value
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 라벨별 [버킷별 개수..., 합계]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 1)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-1] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 - 등록 순서대로 렌더링"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """같은 이름이 이미 있으면 기존 메트릭 반환 (모듈 재로드 대비)"""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, help_text, callback))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets, labelnames))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷 전체"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ============================================================================
+# 채팅 메트릭
+# ============================================================================
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+
+TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "chat_time_to_first_token_seconds",
+    "메시지 수신부터 첫 응답 청크까지 걸린 시간",
+    _LATENCY_BUCKETS,
+    labelnames=("source",),
+)
+
+STREAM_DURATION = REGISTRY.histogram(
+    "chat_stream_duration_seconds",
+    "한 턴의 전체 스트리밍 시간",
+    _LATENCY_BUCKETS,
+    labelnames=("source",),
+)
+
+CHARS_PER_SECOND = REGISTRY.histogram(
+    "chat_stream_chars_per_second",
+    "턴별 응답 글자 수 / 스트리밍 시간",
+    (10, 25, 50, 100, 200, 400, 800, 1600, 3200, 10000),
+    labelnames=("source",),
+)
+
+SESSION_CREATE_DURATION = REGISTRY.histogram(
+    "chat_session_create_seconds",
+    "Agent Engine create_session 호출 시간",
+    (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "chat_upstream_errors_total",
+    "Agent Engine 호출 실패 수",
+    labelnames=("operation", "error"),
+)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "chat_request_duration_seconds",
+    "채팅 API 요청 처리 시간 (스트리밍 응답은 마지막 이벤트까지)",
+    _LATENCY_BUCKETS,
+    labelnames=("endpoint", "status"),
+)
+
+ADMISSION_WAIT = REGISTRY.histogram(
+    "chat_admission_wait_seconds",
+    "동시 스트림 대기열에서 기다린 시간",
+    (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+
+ADMISSION_REJECTED = REGISTRY.counter(
+    "chat_admission_rejected_total",
+    "대기열 초과로 429 응답한 요청 수",
+    labelnames=("reason",),
+)
+
+CLIENT_DISCONNECTS = REGISTRY.counter(
+    "chat_client_disconnects_total",
+    "응답이 끝나기 전에 클라이언트가 연결을 끊은 턴 수",
+    labelnames=("endpoint",),
+)
+
+UPSTREAM_CANCELLED = REGISTRY.counter(
+    "chat_upstream_cancelled_total",
+    "끝나기 전에 중단한 Agent Engine 스트림 수",
+)
+
+LLM_SECONDS_SAVED = REGISTRY.counter(
+    "chat_llm_seconds_saved_total",
+    "업스트림 스트림을 일찍 중단해 아낀 시간 추정치 (완료된 스트림 평균 시간 - 중단 시점)",
+)
+
+RATE_LIMITED = REGISTRY.counter(
+    "chat_rate_limited_total",
+    "토큰 버킷이 비어 429로 거절한 요청 수",
+    labelnames=("endpoint", "scope"),
+)
@@ -0,0 +1,286 @@
+"""
+요청 빈도 제한 - user_id / 클라이언트 IP별 토큰 버킷
+
+/chat/new는 익명 user_id를 제한 없이 발급하고, /chat/message 한 번은 최소 두 번의
+Gemini 호출(루트 라우팅 + 하위 에이전트)로 이어진다. RateLimiter는 요청마다
+user_id 버킷과 IP 버킷을 함께 확인해 둘 다 토큰이 있을 때만 하나씩 꺼내고,
+어느 한쪽이라도 비어 있으면 (어느 버킷도 건드리지 않고) RateLimited를 낸다.
+
+  - 버킷은 분당 rate만큼 차고 최대 burst개까지 쌓인다.
+  - 메모리 버킷은 마지막 사용 순서로 보관하고, 다 찬 버킷(= 없는 것과 같음)은
+    앞에서부터 잘라낸다. 키 수가 max_keys를 넘으면 가장 오래된 것부터 버린다.
+  - RATE_LIMIT_SQLITE_PATH가 있으면 같은 호스트의 워커들이 SQLite 파일 하나로 버킷을 공유한다.
+    (Cloud Run 인스턴스 간 공유는 아님) 파일 잠금을 기다릴 수 있으므로 이벤트 루프 밖 스레드에서 확인한다.
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import config
+
+
+class RateLimited(Exception):
+    """토큰이 없어 요청을 받을 수 없음"""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(scope)
+        self.scope = scope  # "user" 또는 "ip"
+        self.retry_after = retry_after  # 다음 토큰까지 남은 시간 (초)
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class MemoryBucketStore:
+    """프로세스 메모리 토큰 버킷 (이벤트 루프 스레드 전용)"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key → [tokens, updated, full_at], 마지막 사용 순서
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, buckets: List[Tuple[str, float, float]], now: float) -> Optional[Tuple[int, float]]:
+        """
+        버킷 여러 개에서 토큰 하나씩 꺼내기 (모두 있을 때만)
+
+        Args:
+            buckets: [(key, 초당 rate, burst)]
+
+        Returns:
+            None이면 허용, 아니면 (비어 있는 버킷 순번, 다음 토큰까지 남은 시간(초))
+        """
+        levels = []
+        for i, (key, rate, burst) in enumerate(buckets):
+            bucket = self._buckets.get(key)
+            tokens = burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+            if tokens < 1:
+                # 거절은 어느 버킷의 상태도 바꾸지 않음
+                return i, (1 - tokens) / rate
+            levels.append(tokens)
+
+        for (key, rate, burst), tokens in zip(buckets, levels):
+            tokens -= 1
+            # 이 시각이 지나면 버킷이 다시 가득 참 (= 지워도 동작이 같음)
+            full_at = now + (burst - tokens) / rate
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = [tokens, now, full_at]
+            else:
+                bucket[:] = [tokens, now, full_at]
+                self._buckets.move_to_end(key)
+
+        self._evict(now)
+        return None
+
+    def _evict(self, now: float) -> None:
+        """가장 오래 안 쓴 버킷부터 다 찬 것 / 상한 초과분 제거 (호출당 O(제거 수))"""
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if len(self._buckets) > self.max_keys or now >= oldest[2]:
+                self._buckets.popitem(last=False)
+            else:
+                break
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SqliteBucketStore:
+    """SQLite 파일로 같은 호스트의 워커 간 공유하는 토큰 버킷 (잠금 대기가 있으므로 이벤트 루프 밖에서 호출)"""
+
+    # 이 횟수마다 다 찬 버킷을 정리
+    _PURGE_EVERY = 1000
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=1.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # 버킷 상태는 잃어도 되는 데이터 - fsync 생략
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+        self._calls = 0
+        # 버킷 수 (근사값) - 이 워커가 만든 버킷만 더하고, 정리할 때 파일 기준으로 다시 셈.
+        # len()은 이벤트 루프(/chat/stats, /metrics)에서 불리므로 잠금 / 쿼리 없이 이 값을 반환
+        self._count = self._db.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+    def take(self, buckets: List[Tuple[str, float, float]], now: float) -> Optional[Tuple[int, float]]:
+        """MemoryBucketStore.take과 같음 - 모든 버킷을 한 트랜잭션에서 확인 / 소비"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                levels = []
+                created = 0
+                for i, (key, rate, burst) in enumerate(buckets):
+                    row = self._db.execute(
+                        "SELECT tokens, updated FROM buckets WHERE key=?", (key,)
+                    ).fetchone()
+                    tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+                    if tokens < 1:
+                        self._db.execute("COMMIT")
+                        return i, (1 - tokens) / rate
+                    levels.append(tokens)
+                    created += row is None
+
+                for (key, rate, burst), tokens in zip(buckets, levels):
+                    tokens -= 1
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                        (key, tokens, now, now + (burst - tokens) / rate),
+                    )
+                count = self._count + created
+                self._calls += 1
+                if self._calls % self._PURGE_EVERY == 0:
+                    # 다시 가득 찬 버킷은 없는 것과 같으므로 삭제
+                    self._db.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                    count = self._db.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+                self._db.execute("COMMIT")
+                self._count = count
+                return None
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        """버킷 수 (근사값, 잠금 / 쿼리 없음 - 이벤트 루프에서 호출해도 막히지 않음)"""
+        return self._count
+
+
+class RateLimiter:
+    """user_id / IP 두 범위의 토큰 버킷"""
+
+    def __init__(
+        self,
+        user_per_minute: float,
+        user_burst: int,
+        ip_per_minute: float,
+        ip_burst: int,
+        store: Any,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            user_per_minute: user_id당 분당 요청 수
+            user_burst: user_id당 연속 허용 요청 수
+            ip_per_minute: IP당 분당 요청 수
+            ip_burst: IP당 연속 허용 요청 수
+            store: 버킷 저장소 (MemoryBucketStore / SqliteBucketStore)
+            enabled: False면 항상 허용
+        """
+        self.enabled = enabled
+        self.store = store
+        self._limits: Dict[str, Tuple[float, float]] = {
+            "user": (user_per_minute / 60, float(user_burst)),
+            "ip": (ip_per_minute / 60, float(ip_burst)),
+        }
+
+        # 통계
+        self.allowed = 0
+        self.limited: Dict[str, int] = {"user": 0, "ip": 0}
+
+    async def check(self, user_id: Optional[str], client_ip: Optional[str]) -> None:
+        """
+        요청 하나 허용 여부 확인 (두 버킷 모두 토큰이 있으면 각각 하나씩 소비)
+
+        IP 버킷도 확인하므로 user_id를 바꿔 가며 보내는 클라이언트도 IP에서 막히고,
+        user 버킷에서 거절된 요청은 IP 토큰을 쓰지 않는다.
+        SQLite 저장소는 워커 간 잠금을 기다릴 수 있으므로 스레드에서 확인한다.
+
+        Raises:
+            RateLimited: 어느 한쪽 버킷이 비어 있음
+        """
+        if not self.enabled:
+            return
+
+        scopes, buckets = [], []
+        for scope, key in (("ip", client_ip), ("user", user_id)):
+            rate, burst = self._limits[scope]
+            if key and rate > 0:
+                scopes.append(scope)
+                buckets.append((f"{scope}:{key}", rate, burst))
+        if not buckets:
+            self.allowed += 1
+            return
+
+        now = time.time()
+        if isinstance(self.store, SqliteBucketStore):
+            rejected = await asyncio.to_thread(self.store.take, buckets, now)
+        else:
+            rejected = self.store.take(buckets, now)
+        if rejected is not None:
+            index, wait = rejected
+            self.limited[scopes[index]] += 1
+            raise RateLimited(scopes[index], wait)
+
+        self.allowed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "store": "sqlite" if isinstance(self.store, SqliteBucketStore) else "memory",
+            "buckets": len(self.store),
+            "allowed": self.allowed,
+            "limited": dict(self.limited),
+        }
+
+
+def client_ip(headers: Any, peer: Optional[str]) -> Optional[str]:
+    """
+    클라이언트 IP
+
+    Cloud Run / 로드밸런서 뒤에서는 peer가 프록시 주소이므로 RATE_LIMIT_TRUST_FORWARDED이면
+    X-Forwarded-For에서 신뢰하는 프록시가 붙인 주소를 사용한다. 프록시는 받은 헤더 뒤에 주소를 붙이므로
+    오른쪽에서 RATE_LIMIT_TRUSTED_PROXY_HOPS번째가 클라이언트이고, 그보다 왼쪽은 클라이언트가
+    마음대로 보낼 수 있는 값이다 (첫 주소를 쓰면 요청마다 새 IP 버킷을 받을 수 있음).
+    """
+    if config.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = headers.get("x-forwarded-for")
+        entries = [e.strip() for e in forwarded.split(",") if e.strip()] if forwarded else []
+        if entries:
+            hops = max(1, config.RATE_LIMIT_TRUSTED_PROXY_HOPS)
+            return entries[max(0, len(entries) - hops)]
+    return peer
+
+
+# 싱글톤 인스턴스
+_rate_limiter_instance: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    RateLimiter 싱글톤 인스턴스 반환
+
+    FastAPI dependency injection용 (동기 함수라 스레드풀에서 실행될 수 있어 락 사용)
+    """
+    global _rate_limiter_instance
+
+    if _rate_limiter_instance is None:
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                if config.RATE_LIMIT_SQLITE_PATH:
+                    store = SqliteBucketStore(config.RATE_LIMIT_SQLITE_PATH)
+                else:
+                    store = MemoryBucketStore(config.RATE_LIMIT_MAX_KEYS)
+                _rate_limiter_instance = RateLimiter(
+                    user_per_minute=config.RATE_LIMIT_USER_PER_MINUTE,
+                    user_burst=config.RATE_LIMIT_USER_BURST,
+                    ip_per_minute=config.RATE_LIMIT_IP_PER_MINUTE,
+                    ip_burst=config.RATE_LIMIT_IP_BURST,
+                    store=store,
+                    enabled=config.RATE_LIMIT_ENABLED,
+                )
+
+    return _rate_limiter_instance
@@ -0,0 +1,131 @@
+"""
+응답 캐시 - 자주 나오는 첫 질문의 답변을 재사용
+
+많은 세션이 같은 질문("2024년 공과대학 졸업 요건", "샬롬관 어디야")으로 시작한다.
+이전 대화 맥락이 없는 첫 턴의 답변만 캐시하고, 키는 정규화한 메시지
+(NFC, 소문자, 구두점 제거, 공백 정리)를 사용한다.
+
+  - TTL이 지난 항목은 조회 시 제거
+  - 항목 수 / 총 바이트가 상한을 넘으면 가장 오래 쓰이지 않은 항목부터 제거 (LRU)
+"""
+
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """
+    캐시 키용 메시지 정규화
+
+    "2024년  공과대학 졸업요건?" 과 "2024년 공과대학 졸업요건" 이 같은 키가 되도록
+    NFC 정규화 → 소문자 → 구두점/기호 제거 → 공백 하나로 정리
+    """
+    text = unicodedata.normalize("NFC", message).lower()
+    text = "".join(
+        " " if unicodedata.category(ch)[0] in ("P", "S") else ch
+        for ch in text
+    )
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass
+class CachedResponse:
+    """캐시된 답변"""
+    text: str
+    upstream_seconds: float  # 원래 답변을 만드는 데 걸린 시간
+    expires_at: float
+    size: int
+
+
+class ResponseCache:
+    """TTL + LRU 응답 캐시 (이벤트 루프 스레드 전용)"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        """
+        Args:
+            max_entries: 최대 항목 수 (0 이하면 캐시 비활성화)
+            max_bytes: 캐시된 답변 총 크기 상한 (UTF-8 바이트)
+            ttl_seconds: 항목 유효 시간
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.latency_saved_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """캐시 조회 (히트 시 절약된 지연 시간 누적)"""
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.latency_saved_seconds += entry.upstream_seconds
+        return entry
+
+    def put(self, key: str, text: str, upstream_seconds: float) -> None:
+        """답변 저장 (답변 하나가 max_bytes보다 크면 저장하지 않음)"""
+        if not self.enabled or not text:
+            return
+
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = CachedResponse(
+            text=text,
+            upstream_seconds=upstream_seconds,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            size=size,
+        )
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (히트율, 절약된 지연 시간 등)"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "latency_saved_ms": self.latency_saved_seconds * 1000,
+        }
@@ -0,0 +1,177 @@
+"""
+세션 풀 - 익명 채팅 세션을 미리 만들어 두고 /chat/new에서 즉시 반환
+
+Agent Engine의 create_session은 원격 호출이라 새 사용자의 첫 화면이
+그 왕복 시간만큼 기다리게 된다. SessionPool은 백그라운드 태스크에서
+세션을 미리 만들어 두고, 요청이 오면 풀에서 꺼내 준다.
+풀이 비었을 때만 요청 안에서 (스레드로) 직접 생성한다.
+
+  - 풀 크기가 min_size 아래로 내려가면 max_size까지 다시 채움
+  - ttl_seconds보다 오래된 세션은 버림 (엔진 쪽 세션 만료 대비)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 세션 생성 실패 시 다음 재시도까지 대기 (초)
+_ERROR_BACKOFF_SECONDS = 5.0
+
+
+class SessionPool:
+    """미리 생성된 채팅 세션 풀"""
+
+    def __init__(
+        self,
+        factory: Callable[[], Dict[str, str]],
+        min_size: int,
+        max_size: int,
+        ttl_seconds: float,
+    ):
+        """
+        Args:
+            factory: 세션을 하나 만드는 블로킹 함수 ({"user_id", "session_id"} 반환)
+            min_size: 이 크기 아래로 내려가면 리필 시작
+            max_size: 풀 최대 크기 (0 이하면 풀 비활성화)
+            ttl_seconds: 풀에 보관할 수 있는 최대 시간
+        """
+        self._factory = factory
+        self.max_size = max(0, max_size)
+        self.min_size = min(max(1, min_size), self.max_size) if self.max_size else 0
+        self.ttl_seconds = ttl_seconds
+
+        self._items: Deque[Tuple[float, Dict[str, str]]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.refills = 0
+        self.refill_errors = 0
+        self._refill_seconds_total = 0.0
+        self._refill_seconds_last = 0.0
+        self._refill_seconds_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def size(self) -> int:
+        return len(self._items)
+
+    def start(self) -> None:
+        """백그라운드 리필 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if not self.enabled or self._task is not None:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self) -> None:
+        """백그라운드 리필 태스크 종료"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def acquire(self) -> Dict[str, str]:
+        """
+        세션 하나 반환 - 풀에 있으면 즉시, 없으면 직접 생성
+
+        Returns:
+            {"user_id": "anon_xxx", "session_id": "yyy"}
+        """
+        self.start()
+        self._prune()
+
+        if self._items:
+            _, chat = self._items.popleft()
+            self.hits += 1
+            if len(self._items) < self.min_size:
+                self._wakeup.set()
+            return chat
+
+        self.misses += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return await asyncio.to_thread(self._factory)
+
+    async def _maintain(self) -> None:
+        """풀을 채우고, 만료될 때까지 또는 리필 요청이 올 때까지 대기"""
+        while True:
+            self._wakeup.clear()
+            self._prune()
+
+            if len(self._items) < self.min_size:
+                await self._fill()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_expiry())
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fill(self) -> None:
+        """max_size까지 세션 생성"""
+        while len(self._items) < self.max_size:
+            start = time.perf_counter()
+            try:
+                chat = await asyncio.to_thread(self._factory)
+            except Exception as e:
+                self.refill_errors += 1
+                logger.warning(f"[SessionPool] 세션 미리 생성 실패: {e}")
+                await asyncio.sleep(_ERROR_BACKOFF_SECONDS)
+                return
+
+            elapsed = time.perf_counter() - start
+            self.refills += 1
+            self._refill_seconds_total += elapsed
+            self._refill_seconds_last = elapsed
+            self._refill_seconds_max = max(self._refill_seconds_max, elapsed)
+
+            self._items.append((time.monotonic(), chat))
+
+    def _prune(self) -> None:
+        """TTL이 지난 세션 제거 (생성 순서대로 들어 있으므로 앞에서부터)"""
+        now = time.monotonic()
+        while self._items and now - self._items[0][0] >= self.ttl_seconds:
+            self._items.popleft()
+            self.expired += 1
+
+    def _next_expiry(self) -> float:
+        """가장 오래된 세션이 만료될 때까지 남은 시간 (초)"""
+        if not self._items:
+            return self.ttl_seconds
+        return max(0.0, self._items[0][0] + self.ttl_seconds - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 통계 (히트율, 리필 지연 등)"""
+        requests = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": self.size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "expired": self.expired,
+            "refills": self.refills,
+            "refill_errors": self.refill_errors,
+            "refill_latency_ms": {
+                "last": self._refill_seconds_last * 1000,
+                "avg": self._refill_seconds_total / self.refills * 1000 if self.refills else 0.0,
+                "max": self._refill_seconds_max * 1000,
+            },
+        }
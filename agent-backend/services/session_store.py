@@ -0,0 +1,573 @@
+"""
+세션 저장소 - 로컬 ADK 런너(AGENT_RUNTIME=local)용 SQLite write-behind 세션 서비스
+
+로컬 런너의 대화 상태(세션 이벤트, search_subject_list가 남기는
+user:last_subject_search 같은 user 범위 상태)가 재시작 후에도 남도록 SQLite 파일에
+저장한다. 턴마다 디스크 왕복이 생기지 않도록:
+
+  - 최근 사용한 세션은 메모리 LRU(hot_sessions개)에 두고 get_session은 메모리에서 답한다.
+    LRU에 없을 때만 SQLite에서 읽는다.
+  - append_event는 메모리만 갱신하고 변경분을 쌓아 둔다. 백그라운드 스레드가
+    flush_interval마다 (또는 변경분이 flush_batch개 쌓이면) 한 트랜잭션으로 기록한다.
+    프로세스가 비정상 종료되면 마지막 flush 이후 변경분은 잃는다 (종료 시에는 close()가 flush).
+  - 세션 이벤트가 max_events를 넘으면 오래된 턴부터 사용자 메시지 경계 단위로 잘라낸다
+    (function_call / function_response 짝이 갈라지지 않도록). 잘린 이벤트는 다음
+    flush에서 DB에서도 지운다 (compaction).
+
+ADK InMemorySessionService와 같은 규칙으로 app: / user: 접두사 상태를 따로 저장하고
+세션을 돌려줄 때 합친다. temp: 상태는 저장하지 않는다.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+# (app_name, user_id, session_id)
+_Key = Tuple[str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+"""
+
+
+class _Entry:
+    """메모리에 올라온 세션 - events[i]의 DB seq는 first_seq + i"""
+
+    __slots__ = ("session", "first_seq")
+
+    def __init__(self, session: Session, first_seq: int):
+        self.session = session
+        self.first_seq = first_seq
+
+    @property
+    def next_seq(self) -> int:
+        return self.first_seq + len(self.session.events)
+
+
+class _Dirty:
+    """flush 대기 중인 세션 변경분"""
+
+    __slots__ = ("entry", "events", "created", "deleted")
+
+    def __init__(self, entry: _Entry):
+        self.entry = entry
+        self.events: List[Tuple[int, str]] = []  # (seq, 이벤트 JSON)
+        self.created = False  # 같은 ID의 이전 이벤트가 DB에 남아 있으면 지움
+        self.deleted = False
+
+
+class SqliteSessionService(BaseSessionService):
+    """SQLite 파일 + 메모리 LRU + write-behind ADK 세션 서비스 (스레드 안전)"""
+
+    def __init__(
+        self,
+        path: str,
+        hot_sessions: int = 1000,
+        max_events: int = 200,
+        flush_interval: float = 0.2,
+        flush_batch: int = 500,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로
+            hot_sessions: 메모리에 둘 세션 수 (user 상태 캐시도 같은 크기)
+            max_events: 세션당 보관할 이벤트 수 상한 (넘으면 오래된 턴부터 제거, 0이면 무제한)
+            flush_interval: write-behind 주기 (초, 0이면 append_event마다 즉시 기록)
+            flush_batch: 이만큼 변경분이 쌓이면 주기를 기다리지 않고 flush
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.hot_sessions = max(1, hot_sessions)
+        self.max_events = max_events
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        # 잠금 순서: _db_lock → _lock (세션 로드는 flush가 끝난 뒤에 읽음).
+        # app / user 상태는 _lock 안에서 같은 연결로 읽는다 (직렬화 모드 SQLite라 안전).
+        # flush가 가져간 user 상태는 COMMIT 전까지 _flushing_users에 남겨 DB의 이전 값을 읽지 않게 한다
+        self._db_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        self._hot: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._user_states: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._app_states: Dict[str, Dict[str, Any]] = {}
+
+        self._dirty: Dict[_Key, _Dirty] = {}
+        self._dirty_users: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # flush가 기록 중인 user 상태 (COMMIT / ROLLBACK까지)
+        self._flushing_users: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._dirty_apps: Dict[str, Dict[str, Any]] = {}
+        self._pending_events = 0
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._flushes = 0
+        self._flushed_events = 0
+        self._compacted_events = 0
+        self._last_flush_ms = 0.0
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="session-store-flush", daemon=True
+            )
+            self._flusher.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # BaseSessionService
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        key = (app_name, user_id, session_id)
+        entry = _Entry(session, 0)
+
+        with self._lock:
+            self._put_hot(key, entry)
+            self._mark_dirty(key, entry).created = True
+            copied = self._copy(entry.session)
+        self._after_write()
+        return self._merge_state(copied)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        entry = self._entry((app_name, user_id, session_id))
+        if entry is None:
+            return None
+
+        with self._lock:
+            copied = self._copy(entry.session)
+
+        if config:
+            if config.num_recent_events:
+                copied.events = copied.events[-config.num_recent_events:]
+            if config.after_timestamp:
+                copied.events = [e for e in copied.events if e.timestamp >= config.after_timestamp]
+
+        return self._merge_state(copied)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        self.flush()
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT session_id, state, last_update_time FROM sessions WHERE app_name=? AND user_id=?",
+                (app_name, user_id),
+            ).fetchall()
+
+        sessions = [
+            self._merge_state(Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                state=json.loads(state),
+                last_update_time=last_update_time,
+            ))
+            for session_id, state, last_update_time in rows
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            entry = self._hot.pop(key, None)
+            dirty = self._dirty.get(key)
+            if dirty is None:
+                dirty = self._dirty[key] = _Dirty(entry or _Entry(Session(
+                    app_name=app_name, user_id=user_id, id=session_id
+                ), 0))
+            dirty.deleted = True
+            dirty.events.clear()
+        self._after_write()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        # 호출자가 들고 있는 세션 사본 갱신
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        entry = self._entry(key)
+        if entry is None:
+            # 삭제된 세션 - 저장소에는 반영하지 않음
+            return event
+
+        data = event.model_dump_json(exclude_none=True)
+        with self._lock:
+            self._apply_scoped_state(session.app_name, session.user_id, event)
+
+            stored = entry.session
+            seq = entry.next_seq
+            self._update_state(stored, event)
+            stored.events.append(event)
+            stored.last_update_time = event.timestamp
+
+            dirty = self._mark_dirty(key, entry)
+            dirty.events.append((seq, data))
+            self._pending_events += 1
+            self._compact(entry)
+
+        self._after_write()
+        return event
+
+    # ------------------------------------------------------------------
+    # 메모리 LRU / 상태
+    # ------------------------------------------------------------------
+
+    def _entry(self, key: _Key) -> Optional[_Entry]:
+        """LRU에서 세션을 찾고, 없으면 SQLite에서 읽어 LRU에 올림"""
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+            dirty = self._dirty.get(key)
+            if dirty is not None:
+                # LRU에서 밀려났지만 아직 기록 전 - 메모리 사본을 다시 올림
+                if dirty.deleted:
+                    return None
+                self._put_hot(key, dirty.entry)
+                return dirty.entry
+
+        with self._db_lock:
+            # flush가 끝난 뒤 읽음 (기록 중인 변경분을 놓치지 않도록 다시 확인)
+            with self._lock:
+                entry = self._hot.get(key)
+                if entry is not None:
+                    return entry
+            entry = self._load(key)
+
+        if entry is None:
+            return None
+        with self._lock:
+            existing = self._hot.get(key)
+            if existing is not None:
+                return existing
+            self._put_hot(key, entry)
+        return entry
+
+    def _load(self, key: _Key) -> Optional[_Entry]:
+        """SQLite에서 세션 + 이벤트 읽기 (_db_lock 보유 상태에서 호출)"""
+        row = self._db.execute(
+            "SELECT state, last_update_time FROM sessions WHERE app_name=? AND user_id=? AND session_id=?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+
+        rows = self._db.execute(
+            "SELECT seq, data FROM events WHERE app_name=? AND user_id=? AND session_id=? ORDER BY seq",
+            key,
+        ).fetchall()
+        session = Session(
+            app_name=key[0],
+            user_id=key[1],
+            id=key[2],
+            state=json.loads(row[0]),
+            events=[Event.model_validate_json(data) for _, data in rows],
+            last_update_time=row[1],
+        )
+        return _Entry(session, rows[0][0] if rows else 0)
+
+    def _put_hot(self, key: _Key, entry: _Entry) -> None:
+        self._hot[key] = entry
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_sessions:
+            # 기록 전인 세션도 _dirty가 참조를 들고 있으므로 그냥 내보내도 안전
+            self._hot.popitem(last=False)
+
+    def _mark_dirty(self, key: _Key, entry: _Entry) -> _Dirty:
+        dirty = self._dirty.get(key)
+        if dirty is None or dirty.entry is not entry:
+            dirty = self._dirty[key] = _Dirty(entry)
+        return dirty
+
+    def _compact(self, entry: _Entry) -> None:
+        """이벤트 수가 상한을 넘으면 오래된 턴부터 제거 (사용자 메시지 경계에서 자름)"""
+        events = entry.session.events
+        if not self.max_events or len(events) <= self.max_events:
+            return
+
+        start = len(events) - self.max_events
+        cut = next((i for i in range(start, len(events)) if events[i].author == "user"), start)
+        del events[:cut]
+        entry.first_seq += cut
+        self._compacted_events += cut
+
+    @staticmethod
+    def _update_state(session: Session, event: Event) -> None:
+        if not event.actions or not event.actions.state_delta:
+            return
+        for key, value in event.actions.state_delta.items():
+            if not key.startswith(State.TEMP_PREFIX):
+                session.state[key] = value
+
+    def _apply_scoped_state(self, app_name: str, user_id: str, event: Event) -> None:
+        """app: / user: 상태 변경분 반영 (_lock 보유 상태에서 호출)"""
+        if not event.actions or not event.actions.state_delta:
+            return
+        for key, value in event.actions.state_delta.items():
+            if key.startswith(State.APP_PREFIX):
+                state = self._app_state(app_name)
+                state[key.removeprefix(State.APP_PREFIX)] = value
+                self._dirty_apps[app_name] = state
+            elif key.startswith(State.USER_PREFIX):
+                state = self._user_state(app_name, user_id)
+                state[key.removeprefix(State.USER_PREFIX)] = value
+                self._dirty_users[(app_name, user_id)] = state
+
+    def _app_state(self, app_name: str) -> Dict[str, Any]:
+        state = self._app_states.get(app_name)
+        if state is None:
+            row = self._db.execute("SELECT state FROM app_states WHERE app_name=?", (app_name,)).fetchone()
+            state = self._app_states[app_name] = json.loads(row[0]) if row else {}
+        return state
+
+    def _user_state(self, app_name: str, user_id: str) -> Dict[str, Any]:
+        key = (app_name, user_id)
+        state = self._user_states.get(key)
+        if state is None:
+            # 기록 전 / 기록 중인 변경분이 있으면 그것이 최신 (DB는 아직 이전 값일 수 있음)
+            state = self._dirty_users.get(key)
+        if state is None:
+            state = self._flushing_users.get(key)
+        if state is None:
+            row = self._db.execute(
+                "SELECT state FROM user_states WHERE app_name=? AND user_id=?", key
+            ).fetchone()
+            state = json.loads(row[0]) if row else {}
+        self._user_states[key] = state
+        self._user_states.move_to_end(key)
+        while len(self._user_states) > self.hot_sessions:
+            self._user_states.popitem(last=False)
+        return state
+
+    def _merge_state(self, session: Session) -> Session:
+        """세션 사본에 app: / user: 상태를 합침"""
+        with self._lock:
+            app_state = dict(self._app_state(session.app_name))
+            user_state = dict(self._user_state(session.app_name, session.user_id))
+        for key, value in app_state.items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    @staticmethod
+    def _copy(session: Session) -> Session:
+        """호출자용 사본 (이벤트 객체는 공유, 목록 / 상태는 복사)"""
+        return Session(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            id=session.id,
+            state=dict(session.state),
+            events=list(session.events),
+            last_update_time=session.last_update_time,
+        )
+
+    # ------------------------------------------------------------------
+    # write-behind
+    # ------------------------------------------------------------------
+
+    def _after_write(self) -> None:
+        if self.flush_interval <= 0:
+            self.flush()
+        elif self._pending_events >= self.flush_batch:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # 다음 주기에 다시 시도하도록 변경분은 flush()에서 되돌려 둠
+                time.sleep(self.flush_interval)
+
+    def flush(self) -> None:
+        """쌓인 변경분을 한 트랜잭션으로 기록"""
+        with self._db_lock:
+            with self._lock:
+                if not (self._dirty or self._dirty_users or self._dirty_apps):
+                    return
+                dirty, self._dirty = self._dirty, {}
+                users, self._dirty_users = self._dirty_users, {}
+                self._flushing_users = users
+                apps, self._dirty_apps = self._dirty_apps, {}
+                self._pending_events = 0
+
+                # 이벤트 루프 쪽 변경과 겹치지 않도록 잠금 안에서 직렬화
+                rows = []
+                for key, item in dirty.items():
+                    session = item.entry.session
+                    rows.append((
+                        key,
+                        item,
+                        json.dumps(session.state, ensure_ascii=False, default=str),
+                        session.last_update_time,
+                        item.entry.first_seq,
+                    ))
+                user_rows = [(app, user, json.dumps(state, ensure_ascii=False, default=str))
+                             for (app, user), state in users.items()]
+                app_rows = [(app, json.dumps(state, ensure_ascii=False, default=str))
+                            for app, state in apps.items()]
+
+            start = time.perf_counter()
+            events_written = 0
+            try:
+                self._db.execute("BEGIN")
+                for key, item, state, last_update_time, first_seq in rows:
+                    if item.deleted or item.created:
+                        self._db.execute(
+                            "DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?", key
+                        )
+                    if item.deleted:
+                        self._db.execute(
+                            "DELETE FROM sessions WHERE app_name=? AND user_id=? AND session_id=?", key
+                        )
+                        continue
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                        (*key, state, last_update_time),
+                    )
+                    event_rows = [(*key, seq, data) for seq, data in item.events if seq >= first_seq]
+                    self._db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)", event_rows)
+                    events_written += len(event_rows)
+                    if first_seq:
+                        # compaction으로 잘린 이벤트 삭제
+                        self._db.execute(
+                            "DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=? AND seq<?",
+                            (*key, first_seq),
+                        )
+                self._db.executemany("INSERT OR REPLACE INTO user_states VALUES (?, ?, ?)", user_rows)
+                self._db.executemany("INSERT OR REPLACE INTO app_states VALUES (?, ?)", app_rows)
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                with self._lock:
+                    self._restore(dirty, users, apps)
+                    self._flushing_users = {}
+                raise
+
+            with self._lock:
+                self._flushing_users = {}
+                self._flushes += 1
+                self._flushed_events += events_written
+                self._last_flush_ms = (time.perf_counter() - start) * 1000
+
+    def _restore(self, dirty: Dict[_Key, _Dirty], users: Dict, apps: Dict) -> None:
+        """실패한 flush의 변경분을 다음 flush 대상으로 되돌림 (_lock 보유 상태에서 호출)"""
+        for key, item in dirty.items():
+            newer = self._dirty.get(key)
+            if newer is None:
+                self._dirty[key] = item
+            elif newer.entry is item.entry and not newer.deleted:
+                # 실패한 변경분 뒤에 그사이 쌓인 변경분을 이어 붙임
+                item.events.extend(newer.events)
+                self._dirty[key] = item
+            # 그 외 (삭제 / 같은 ID로 다시 생성)는 새 변경분이 우선
+        for key, state in users.items():
+            self._dirty_users.setdefault(key, state)
+        for key, state in apps.items():
+            self._dirty_apps.setdefault(key, state)
+
+    def close(self) -> None:
+        """flush 스레드 종료 + 남은 변경분 기록"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "hot_sessions": len(self._hot),
+                "max_hot_sessions": self.hot_sessions,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "pending_sessions": len(self._dirty),
+                "flushes": self._flushes,
+                "flushed_events": self._flushed_events,
+                "compacted_events": self._compacted_events,
+                "last_flush_ms": round(self._last_flush_ms, 3),
+            }
@@ -0,0 +1,129 @@
+"""
+싱글 플라이트 - 동시에 들어온 같은 요청이 업스트림 스트림 하나를 공유
+
+수업 시간에 "졸업요건 물어봐" 같은 안내가 나가면 같은 첫 질문이 몇 초 안에
+수십 개 들어온다. 같은 키의 요청이 진행 중이면 새 업스트림 호출을 만들지 않고
+진행 중인 스트림에 합류해, 지금까지 받은 청크를 먼저 재생한 뒤 이후 청크를 함께 받는다.
+
+  - 업스트림은 특정 클라이언트가 아니라 별도 태스크가 소비 (첫 요청자가 나가도 계속)
+  - 구독자가 모두 떠나면 업스트림 태스크를 취소
+  - 스트림이 끝나면 키를 비움 (이후 요청은 응답 캐시 또는 새 호출로 처리)
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+class _Flight:
+    """진행 중인 업스트림 스트림 하나와 지금까지 받은 청크"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        """대기 중인 구독자 깨우기"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        """새 청크나 종료 신호가 올 때까지 대기"""
+        await self._changed.wait()
+
+
+class SingleFlight:
+    """키별로 업스트림 스트림을 하나만 실행하고 결과를 구독자에게 나눠 줌"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[str, _Flight] = {}
+
+        # 통계
+        self.leaders = 0  # 실제 업스트림 호출 수
+        self.followers = 0  # 진행 중인 스트림에 합류한 요청 수
+        self.prefix_replays = 0  # 이미 받은 청크를 재생받고 합류한 요청 수
+
+    def subscribe(
+        self,
+        key: str,
+        make_stream: Callable[[], AsyncIterator[str]],
+    ) -> Tuple[AsyncIterator[str], bool]:
+        """
+        key에 대한 스트림 구독
+
+        Args:
+            key: 요청 키 (같은 키끼리 업스트림 공유)
+            make_stream: 진행 중인 스트림이 없을 때 업스트림을 만드는 함수
+
+        Returns:
+            (청크 스트림, 업스트림을 직접 시작했는지 여부)
+        """
+        flight = self._flights.get(key)
+        leader = flight is None
+
+        if leader:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, make_stream()))
+            self.leaders += 1
+        else:
+            self.followers += 1
+            if flight.chunks:
+                self.prefix_replays += 1
+
+        return self._listen(key, flight), leader
+
+    async def _run(self, key: str, flight: _Flight, stream: AsyncIterator[str]) -> None:
+        """업스트림을 끝까지 소비하면서 청크를 쌓고 구독자에게 알림"""
+        try:
+            async for chunk in stream:
+                flight.chunks.append(chunk)
+                flight.notify()
+        except asyncio.CancelledError:
+            flight.error = ConnectionAbortedError("업스트림 스트림이 취소되었습니다.")
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.notify()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    async def _listen(self, key: str, flight: _Flight) -> AsyncIterator[str]:
+        """처음부터 청크를 재생하고, 이후 새 청크를 기다렸다가 yield"""
+        flight.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(flight.chunks):
+                    yield flight.chunks[index]
+                    index += 1
+
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+
+                await flight.wait()
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # 듣는 사람이 없으면 업스트림 중단
+                flight.task.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """싱글 플라이트 통계"""
+        return {
+            "enabled": self.enabled,
+            "active": len(self._flights),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "prefix_replays": self.prefix_replays,
+        }
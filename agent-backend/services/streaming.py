@@ -0,0 +1,271 @@
+"""
+스트리밍 유틸리티 - 동기 이터레이터를 이벤트 루프 밖에서 소비
+
+Agent Engine 클라이언트의 `stream_query`(그리고 `async_stream_query`까지)는
+내부적으로 동기 gRPC 스트림을 순회하므로, 이벤트 루프 안에서 직접 돌리면
+한 답변이 끝날 때까지 같은 워커의 다른 SSE 스트림과 /health가 모두 멈춘다.
+
+iterate_in_thread()는 동기 이터레이터를 전용 스레드 풀에서 돌리고,
+크기가 제한된 asyncio.Queue를 통해 이벤트 루프로 결과를 넘긴다.
+큐가 가득 차면 생산자 스레드가 대기하므로 느린 클라이언트가
+메모리를 무한정 쌓지 않는다 (backpressure).
+
+coalesce_chunks()는 텍스트 청크를 바이트 예산 / 시간 창 단위로 묶어
+SSE 이벤트 수(= JSON 인코딩 및 프레이밍 오버헤드)를 줄인다.
+타자기 효과는 프론트엔드가 받은 청크를 글자 단위로 나눠 처리한다.
+
+cancel_on_disconnect()는 SSE 클라이언트가 떠나면 스트림을 끊어
+업스트림 에이전트 실행(LLM 호출)과 워커 슬롯을 바로 돌려받는다.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+import config
+
+T = TypeVar("T")
+
+# 생산자 스레드가 큐 대기 중 중단 요청을 확인하는 주기 (초)
+_STOP_POLL_INTERVAL = 0.1
+
+# 스트림 종료 표시
+_END = object()
+
+# 업스트림 스트림 전용 스레드 풀 (anyio 기본 풀과 분리)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_stream_executor() -> ThreadPoolExecutor:
+    """업스트림 스트림 소비용 스레드 풀 싱글톤 반환"""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.STREAM_WORKER_THREADS,
+                    thread_name_prefix="upstream-stream",
+                )
+
+    return _executor
+
+
+async def iterate_in_thread(
+    make_iterable: Callable[[], Iterable[T]],
+    max_queue: Optional[int] = None,
+) -> AsyncIterator[T]:
+    """
+    동기 이터러블을 별도 스레드에서 소비하면서 비동기로 yield
+
+    Args:
+        make_iterable: 워커 스레드에서 호출되어 이터러블을 만드는 함수
+            (stream_query 호출 자체도 블로킹이므로 스레드 안에서 호출)
+        max_queue: 스레드와 이벤트 루프 사이 큐 크기 (기본: config.STREAM_QUEUE_SIZE)
+
+    Yields:
+        원본 이터러블의 항목
+
+    Raises:
+        이터러블에서 발생한 예외를 그대로 다시 발생
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue or config.STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        """큐에 넣을 때까지 대기. 소비자가 떠났으면 False"""
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:  # 이벤트 루프가 이미 종료됨
+            return False
+        while True:
+            try:
+                future.result(timeout=_STOP_POLL_INTERVAL)
+                return True
+            except FutureTimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+
+    def _produce() -> None:
+        iterator = None
+        try:
+            iterator = iter(make_iterable())
+            for item in iterator:
+                if stop.is_set() or not _put((item, None)):
+                    return
+        except BaseException as e:  # 소비자 쪽에서 다시 발생시킴
+            _put((_END, e))
+            return
+        finally:
+            # 중간에 멈춘 경우 원본 스트림(엔진 gRPC 스트림)을 GC를 기다리지 않고 바로 닫음
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+        _put((_END, None))
+
+    loop.run_in_executor(get_stream_executor(), _produce)
+
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # 소비자가 중간에 빠져도 생산자 스레드가 다음 항목에서 멈추도록
+        stop.set()
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[str],
+    max_bytes: Optional[int] = None,
+    interval_ms: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    텍스트 청크를 모아서 yield
+
+    버퍼가 max_bytes(UTF-8)에 도달하거나, 버퍼의 첫 청크가 들어온 뒤
+    interval_ms가 지나면 모인 텍스트를 한 번에 내보낸다.
+    업스트림이 멈춰 있어도 시간 창이 끝나면 전송한다.
+
+    Args:
+        chunks: 원본 텍스트 청크 스트림
+        max_bytes: 바이트 예산 (기본: config.STREAM_FLUSH_BYTES)
+        interval_ms: 시간 창 (기본: config.STREAM_FLUSH_INTERVAL_MS)
+
+    Yields:
+        묶인 텍스트
+    """
+    max_bytes = max_bytes or config.STREAM_FLUSH_BYTES
+    interval = (interval_ms if interval_ms is not None else config.STREAM_FLUSH_INTERVAL_MS) / 1000
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: List[str] = []
+    size = 0
+    deadline: Optional[float] = None
+    pending: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            # wait()는 타임아웃 시 pending을 취소하지 않으므로 업스트림이 유지됨
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                # 시간 창 만료 - 모인 만큼 전송
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+                continue
+
+            future, pending = pending, None
+            try:
+                text = future.result()
+            except StopAsyncIteration:
+                break
+
+            if not text:
+                continue
+            buffer.append(text)
+            size += len(text.encode("utf-8"))
+            if deadline is None:
+                deadline = loop.time() + interval
+
+            if size >= max_bytes:
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            # 진행 중인 __anext__ 취소 → 원본 제너레이터의 정리 코드 실행
+            # (취소가 전파된 뒤 반환 - 호출부의 aclose()와 겹치지 않도록)
+            pending.cancel()
+            await asyncio.wait({pending})
+        elif hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+class ClientDisconnected(Exception):
+    """스트리밍 도중 클라이언트 연결이 끊김"""
+
+
+async def cancel_on_disconnect(
+    items: AsyncIterator[T],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    poll_interval_ms: Optional[int] = None,
+) -> AsyncIterator[T]:
+    """
+    items를 그대로 중계하다가 클라이언트 연결이 끊기면 ClientDisconnected 발생
+
+    다음 항목을 기다리는 동안에도 poll_interval_ms마다 is_disconnected()를 확인하므로
+    첫 토큰 전(엔진이 라우팅 / 검색 중)에 떠난 클라이언트도 바로 감지한다.
+    연결이 끊기면 진행 중인 __anext__를 취소해 원본 제너레이터의 정리 코드
+    (업스트림 스트림 중단)를 실행한다.
+
+    Args:
+        items: 원본 스트림
+        is_disconnected: 연결 상태 확인 함수 (Starlette Request.is_disconnected)
+        poll_interval_ms: 확인 주기 (기본: config.DISCONNECT_POLL_INTERVAL_MS)
+
+    Raises:
+        ClientDisconnected: 클라이언트 연결이 끊김
+    """
+    interval = (poll_interval_ms or config.DISCONNECT_POLL_INTERVAL_MS) / 1000
+
+    loop = asyncio.get_running_loop()
+    iterator = items.__aiter__()
+    pending: Optional[asyncio.Future] = None
+    next_check = loop.time() + interval
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            done, _ = await asyncio.wait({pending}, timeout=max(0.0, next_check - loop.time()))
+
+            # 항목이 계속 들어와도 주기마다 한 번은 확인
+            if loop.time() >= next_check:
+                if await is_disconnected():
+                    raise ClientDisconnected()
+                next_check = loop.time() + interval
+
+            if not done:
+                continue
+
+            future, pending = pending, None
+            try:
+                item = future.result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        if pending is not None:
+            # 취소가 원본 제너레이터까지 전파된 뒤 반환 (호출부의 aclose()와 겹치지 않도록)
+            pending.cancel()
+            await asyncio.wait({pending})
+        elif hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+def sse_event(data: Dict[str, Any]) -> str:
+    """dict를 SSE data 프레임 문자열로 변환"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def ws_frame(data: Dict[str, Any]) -> str:
+    """dict를 WebSocket 텍스트 프레임용 compact JSON으로 변환"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,267 @@
+"""
+트레이싱 - 요청 / 엔진 이벤트 구간을 span으로 기록해 JSONL 파일로 내보냄
+
+느린 턴이 루트 에이전트의 라우팅 호출 때문인지, 하위 에이전트 LLM 호출 때문인지,
+검색 도구 때문인지 구분하기 위한 최소한의 트레이서. 라이브 컬렉터 없이
+파일만 남기고 오프라인으로 분석한다 (TRACE_EXPORT_PATH가 비어 있으면 비활성화).
+
+  - 포맷 "jsonl": span 하나당 한 줄 (평탄한 JSON)
+  - 포맷 "otlp": span 하나당 OTLP/JSON ExportTraceServiceRequest 한 줄
+    (OpenTelemetry Collector file exporter와 같은 형식)
+
+trace ID는 세션 ID에서, 에이전트 호출 span ID는 이벤트의 invocation_id에서
+결정적으로 만든다. goole_adk 쪽 트레이서(goole_adk/tracing.py)도 같은 규칙을 쓰므로
+두 파일을 합치면 백엔드 요청 → 엔진 이벤트 → 에이전트 LLM 호출 / 도구 실행이
+하나의 트레이스로 이어진다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+import config
+
+# OTLP status code
+_STATUS_UNSET = 0
+_STATUS_ERROR = 2
+
+
+def trace_id_for_session(session_id: str) -> str:
+    """세션 ID → trace ID (32 hex) - 한 대화의 모든 턴이 같은 트레이스에 속함"""
+    return hashlib.sha256(f"session:{session_id}".encode("utf-8")).hexdigest()[:32]
+
+
+def span_id_for_invocation(invocation_id: str) -> str:
+    """ADK invocation_id → 에이전트 호출 span ID (16 hex)"""
+    return hashlib.sha256(f"invocation:{invocation_id}".encode("utf-8")).hexdigest()[:16]
+
+
+class Span:
+    """구간 하나 - end() 시점에 익스포터로 기록"""
+
+    def __init__(
+        self,
+        tracer: Optional["Tracer"],
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_id: Optional[str],
+        start_ns: int,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = _STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = _STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        """구간 종료 (여러 번 불려도 한 번만 기록)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if self._tracer is not None:
+            self._tracer._export(self)
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if isinstance(exc, Exception):
+            self.record_error(exc)
+        elif exc is not None:
+            # 클라이언트 이탈 등으로 중간에 닫힘 (GeneratorExit / CancelledError)
+            self.set_attribute("cancelled", True)
+        self.end()
+
+
+class _NoopSpan(Span):
+    """트레이싱 비활성화 시 반환 - 호출부가 분기 없이 쓰도록"""
+
+    def __init__(self):
+        super().__init__(None, "", "", "", None, 0)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonlSpanExporter:
+    """끝난 span을 파일에 한 줄씩 추가 (여러 스레드에서 호출됨)"""
+
+    def __init__(self, path: str, fmt: str = "jsonl", service_name: str = "agent-backend"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.fmt = fmt
+        self.service_name = service_name
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        record = self._otlp(span) if self.fmt == "otlp" else self._flat(span)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _flat(self, span: Span) -> Dict[str, Any]:
+        return {
+            "service": self.service_name,
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_span_id": span.parent_id,
+            "name": span.name,
+            "start_ns": span.start_ns,
+            "end_ns": span.end_ns,
+            "duration_ms": (span.end_ns - span.start_ns) / 1e6,
+            "attributes": span.attributes,
+            "status": "error" if span.status == _STATUS_ERROR else "ok",
+            "status_message": span.status_message or None,
+        }
+
+    def _otlp(self, span: Span) -> Dict[str, Any]:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": span.status, "message": span.status_message},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": self.service_name}, "spans": [otlp_span]}],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer:
+    """span 생성기 (익스포터가 없으면 NOOP_SPAN만 반환)"""
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        trace_id: Optional[str] = None,
+        span_id: Optional[str] = None,
+        start_ns: Optional[int] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """
+        span 시작
+
+        Args:
+            name: 구간 이름
+            parent: 부모 span (있으면 trace ID를 물려받음)
+            trace_id: 부모가 없을 때 사용할 trace ID (없으면 무작위)
+            span_id: 고정 span ID (없으면 무작위)
+            start_ns: 시작 시각 (epoch ns, 없으면 지금)
+            attributes: 속성
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+
+        if parent is not None and parent is not NOOP_SPAN:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+        else:
+            parent_id = None
+
+        return Span(
+            self,
+            name,
+            trace_id or os.urandom(16).hex(),
+            span_id or os.urandom(8).hex(),
+            parent_id,
+            start_ns or time.time_ns(),
+            attributes,
+        )
+
+    def _export(self, span: Span) -> None:
+        try:
+            self.exporter.export(span)
+        except Exception:
+            # 트레이스 기록 실패가 요청을 깨뜨리지 않도록 무시
+            pass
+
+
+# 싱글톤 인스턴스
+_tracer_instance: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """
+    Tracer 싱글톤 반환
+
+    config.TRACE_EXPORT_PATH가 설정되어 있으면 그 파일로 내보내고,
+    비어 있으면 아무것도 기록하지 않는 트레이서를 반환한다.
+    """
+    global _tracer_instance
+
+    if _tracer_instance is None:
+        with _tracer_lock:
+            if _tracer_instance is None:
+                exporter = None
+                if config.TRACE_EXPORT_PATH:
+                    exporter = JsonlSpanExporter(
+                        config.TRACE_EXPORT_PATH,
+                        fmt=config.TRACE_EXPORT_FORMAT,
+                    )
+                _tracer_instance = Tracer(exporter)
+
+    return _tracer_instance
@@ -185,9 +185,9 @@ const AgentChat = () => {
         userId,
         sessionId,
         messageText,
-        // onChunk: 큐에 추가
+        // onChunk: 서버가 묶어 보낸 청크를 글자 단위로 나눠 큐에 추가 (타자기 효과)
         (chunk) => {
-          chunkQueueRef.current.push(chunk);
+          chunkQueueRef.current.push(...Array.from(chunk));
           
           if (!isProcessingRef.current) {
             processChunkQueue();
@@ -274,7 +274,7 @@ const AgentChat = () => {
         sessionId,
         question,
         (chunk) => {
-          chunkQueueRef.current.push(chunk);
+          chunkQueueRef.current.push(...Array.from(chunk));
           
           if (!isProcessingRef.current) {
             processChunkQueue();
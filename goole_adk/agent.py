@@ -17,6 +17,7 @@ from goole_adk.config import PROJECT_ID, VERTEX_AI_LOCATION
 
 # Safety Callback import
 from goole_adk.callbacks import safety_check_callback
+from goole_adk.tracing import trace_after_model, trace_after_tool, trace_before_model, trace_before_tool
 
 # Sub-Agents import
 from goole_adk.agents.graduation import graduation_agent
@@ -170,7 +171,12 @@ kangnam_agent = Agent(
         admission_agent,       # 입학 정보 agent (Placeholder)
     ],
     # 안전 콜백: LLM 호출 전 사용자 입력 검증 및 유해 콘텐츠 차단
-    before_model_callback=safety_check_callback
+    # (트레이싱 콜백을 먼저 두어 차단된 요청도 구간이 시작되도록 함)
+    before_model_callback=[trace_before_model, safety_check_callback],
+    # 트레이싱: 라우팅 LLM 호출 / transfer_to_agent 구간 기록 (TRACE_EXPORT_PATH 설정 시)
+    after_model_callback=trace_after_model,
+    before_tool_callback=trace_before_tool,
+    after_tool_callback=trace_after_tool,
 )
 
 # ADK가 찾는 기본 이름
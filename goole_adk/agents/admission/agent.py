@@ -8,6 +8,7 @@
 import vertexai
 from google.adk.agents import Agent
 from goole_adk.config import PROJECT_ID, VERTEX_AI_LOCATION
+from goole_adk.tracing import trace_after_model, trace_after_tool, trace_before_model, trace_before_tool
 
 # Vertex AI 초기화
 vertexai.init(project=PROJECT_ID, location=VERTEX_AI_LOCATION)
@@ -50,6 +51,11 @@ admission_agent = Agent(
     
     현재는 "입학 정보 기능은 준비 중입니다"라고 안내해주세요.
     ''',
-    tools=[]  # 추후 tools 추가
+    tools=[],  # 추후 tools 추가
+    # 트레이싱: LLM 호출 / 도구 실행 구간 기록 (TRACE_EXPORT_PATH 설정 시)
+    before_model_callback=trace_before_model,
+    after_model_callback=trace_after_model,
+    before_tool_callback=trace_before_tool,
+    after_tool_callback=trace_after_tool,
 )
 
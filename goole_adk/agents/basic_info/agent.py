@@ -7,6 +7,7 @@
 import vertexai
 from google.adk.agents import Agent
 from goole_adk.config import PROJECT_ID, VERTEX_AI_LOCATION
+from goole_adk.tracing import trace_after_model, trace_after_tool, trace_before_model, trace_before_tool
 from goole_adk.agents.basic_info.tools import ALL_BASIC_INFO_TOOLS
 
 # Vertex AI 초기화
@@ -187,6 +188,11 @@ basic_info_agent = Agent(
     검색 결과를 부드럽게 사람이 이야기하는 것처럼 자연스럽게 바꿔서 전달해주세요.
     딱딱한 정보 나열이 아닌, 친절한 안내원처럼 대화하세요.
     ''',
-    tools=ALL_BASIC_INFO_TOOLS
+    tools=ALL_BASIC_INFO_TOOLS,
+    # 트레이싱: LLM 호출 / 도구 실행 구간 기록 (TRACE_EXPORT_PATH 설정 시)
+    before_model_callback=trace_before_model,
+    after_model_callback=trace_after_model,
+    before_tool_callback=trace_before_tool,
+    after_tool_callback=trace_after_tool,
 )
 
@@ -0,0 +1,257 @@
+"""
+행정부서 연락처 로컬 디렉터리 - data/강남대 기본정보/행정부서 전화번호.jsonl
+
+부서마다 위치 / 대표 전화 / 팩스 / 직원(이름, 담당 업무, 전화, 이메일)이 들어 있는 JSONL을 처음 쓸 때
+한 번 읽어 부서명 / 연락처 조회를 네트워크 없이 응답한다.
+
+  - 부서: 이름 / 별칭(ALIASES) 정확히 일치 → 질의에 들어 있는 이름 → 관할 대학("공과대학 교학팀" → 교학2팀)
+  - 직원: 이름, 담당 업무 ("수강신청 담당자" → 수강신청 담당 직원과 그 부서)
+  - 오타 / 줄임: 부서 이름 / 별칭 2-gram 유사도 (Dice 계수)
+
+"연락처" / "전화번호" 같은 말은 떼고 찾는다. 찾지 못하면 빈 리스트를 반환하고,
+도구는 기존 Discovery Engine 검색으로 넘어간다.
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from goole_adk.config import LOCAL_DATA_DIR
+from goole_adk.local_index import compact_key, read_jsonl
+from goole_adk.result_projection import prune
+
+logger = logging.getLogger(__name__)
+
+ADMIN_DATA_FILE = os.path.join(LOCAL_DATA_DIR, "강남대 기본정보", "행정부서 전화번호.jsonl")
+
+# 부서 ID → 별칭 (학생들이 부르는 이름)
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "org-vice-president": ("부총장실",),
+    "org-university-headquarters": ("본부",),
+    "org-academic-grad": ("대학원 교학팀", "대학원 행정실", "대학원 사무실", "대학원 학사"),
+    "org-academic-interdisciplinary": ("자유전공 교학팀", "자전 교학팀", "자유전공학부 사무실"),
+    "org-academic-team-1": ("교학 1팀", "교학일팀", "제1교학팀"),
+    "org-academic-team-2": ("교학 2팀", "교학이팀", "제2교학팀"),
+    "org-academic-team-cham-injae": ("참인재 교학팀", "KNU참인재대학 교학팀", "교양 교학팀"),
+    "org-audit-team": ("감사실",),
+    "org-academic-affairs-office": ("교무처장실",),
+    "org-academic-affairs-team": ("학사팀", "교무과"),
+}
+
+# 질의에서 뗄 말 (긴 것부터)
+_FILLER_WORDS = sorted(
+    ("연락처", "전화번호", "전화", "번호", "팩스", "이메일", "메일", "위치", "어디", "알려줘", "알려주세요",
+     "담당자", "담당", "문의", "좀"),
+    key=len, reverse=True,
+)
+# 담당 업무 구분자 ("졸업, 교육과정" / "조교(주간)")
+_ROLE_SEPARATORS = re.compile(r"[\s,/()]+")
+# 부분 일치로 찾을 최소 글자 수 ("대학"처럼 짧은 이름이 다른 부서 질의에 걸리지 않도록)
+_MIN_CONTAINED_CHARS = 3
+_MIN_TERM_CHARS = 2
+# 2-gram 유사도로 인정할 최소 Dice 계수
+_MIN_SIMILARITY = 0.6
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def strip_fillers(query: str) -> str:
+    """정규화 + 연락처 관련 말 제거 ("교학1팀 전화번호 알려줘" → "교학1팀")"""
+    key = compact_key(query)
+    for word in _FILLER_WORDS:
+        key = key.replace(word, "")
+    return key
+
+
+def _role_terms(role: str) -> Set[str]:
+    return {compact_key(t) for t in _ROLE_SEPARATORS.split(role or "") if len(t) >= _MIN_TERM_CHARS}
+
+
+class AdminDirectory:
+    """행정부서 / 직원 인덱스 (읽기 전용, 스레드 안전)"""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        # 부서 ID → 응답 항목 (문서 순서)
+        self.departments: Dict[str, Dict[str, Any]] = {}
+        # 부서 이름 / 별칭 (정규화) → 부서 ID
+        self._names: Dict[str, str] = {}
+        # 관할 대학 (정규화) → 부서 ID
+        self._colleges: Dict[str, List[str]] = {}
+        # 상위 부서 ID → 하위 부서 ID
+        self._children: Dict[str, List[str]] = {}
+        # 직원 이름 / 담당 업무 단어 → (부서 ID, 직원)
+        self._by_member: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._by_role: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+
+        for doc in documents:
+            department_id = doc["id"]
+            metadata = doc.get("metadata", {})
+            name = metadata.get("name_kr") or department_id
+            self.departments[department_id] = prune({
+                "name": name,
+                "content": doc.get("content"),
+                "type": metadata.get("type"),
+                "location": metadata.get("location"),
+                "phone_main": metadata.get("phone_main"),
+                "fax": metadata.get("fax"),
+                "members": metadata.get("members"),
+                "related_colleges": metadata.get("related_colleges"),
+            })
+
+            for key in (name, *ALIASES.get(department_id, ())):
+                self._names.setdefault(compact_key(key), department_id)
+            for college in metadata.get("related_colleges") or ():
+                self._colleges.setdefault(compact_key(college), []).append(department_id)
+            if metadata.get("parent"):
+                self._children.setdefault(metadata["parent"], []).append(department_id)
+
+            for member in metadata.get("members") or ():
+                if member.get("name"):
+                    self._by_member.setdefault(compact_key(member["name"]), []).append((department_id, member))
+                for term in _role_terms(member.get("role")):
+                    self._by_role.setdefault(term, []).append((department_id, member))
+
+        # 하위 부서 이름 (상위 조직 항목에 표시)
+        for parent, children in self._children.items():
+            if parent in self.departments:
+                self.departments[parent]["teams"] = [self.departments[c]["name"] for c in children]
+
+        # 질의 안에서 찾을 이름 (긴 것부터)
+        self._contained_names = sorted(
+            (key for key in self._names if len(key) >= _MIN_CONTAINED_CHARS), key=len, reverse=True
+        )
+        self._name_bigrams: Dict[str, Set[str]] = {}
+        for key in self._names:
+            for bigram in _bigrams(key):
+                self._name_bigrams.setdefault(bigram, set()).add(key)
+
+    @classmethod
+    def load(cls, path: str = ADMIN_DATA_FILE) -> "AdminDirectory":
+        return cls(list(read_jsonl(path)))
+
+    def _with_teams(self, department_ids: List[str]) -> List[Dict[str, Any]]:
+        """부서 항목 - 연락처가 없는 상위 조직("대학원")이면 하위 부서 항목도 함께"""
+        items, seen = [], set()
+        for department_id in department_ids:
+            ids = [department_id]
+            if "phone_main" not in self.departments[department_id]:
+                ids.extend(self._children.get(department_id, []))
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    items.append(self.departments[i])
+        return items
+
+    def _similar(self, key: str) -> List[str]:
+        """2-gram 유사도(Dice)가 높은 부서 ID (높은 순)"""
+        query = _bigrams(key)
+        if not query:
+            return []
+        shared: Dict[str, int] = {}
+        for bigram in query:
+            for name in self._name_bigrams.get(bigram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        scored = sorted(
+            ((2 * count / (len(query) + len(_bigrams(name))), name) for name, count in shared.items()),
+            reverse=True,
+        )
+        ids: List[str] = []
+        for score, name in scored:
+            if score < _MIN_SIMILARITY:
+                break
+            # 앞에 말이 더 붙은 이름은 다른 부서 ("총장실" ≠ "부총장실")
+            if name != key and name.endswith(key):
+                continue
+            if self._names[name] not in ids:
+                ids.append(self._names[name])
+        return ids
+
+    def department(self, name: str) -> List[Dict[str, Any]]:
+        """부서명 조회 - 이름 / 별칭 정확히 일치 → 2-gram 유사도 (찾지 못하면 빈 리스트)"""
+        key = strip_fillers(name)
+        if not key:
+            return []
+        if key in self._names:
+            return self._with_teams([self._names[key]])
+        return self._with_teams(self._similar(key))
+
+    def _departments_in(self, key: str) -> Tuple[List[str], str]:
+        """질의에 들어 있는 부서 (이름 / 별칭 → 관할 대학), 부서 이름을 뗀 나머지와 함께"""
+        if key in self._names:
+            return [self._names[key]], ""
+        for name in self._contained_names:
+            if name in key:
+                return [self._names[name]], key.replace(name, "")
+        for college, department_ids in self._colleges.items():
+            if college in key:
+                return list(department_ids), key.replace(college, "")
+        return [], key
+
+    def _members_for(self, key: str, department_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        직원 이름 / 담당 업무로 찾은 직원을 부서별로 묶은 항목 (부서 항목의 members를 찾은 직원으로 바꿈)
+
+        담당 업무는 질의에 든 업무 단어가 가장 길게 일치한 직원만 ("컴퓨터공학 조교" → 컴퓨터공학 실습조교).
+        """
+        matches = [m for name, ms in self._by_member.items() if name in key for m in ms]
+        if not matches:
+            scores: Dict[int, int] = {}
+            found: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+            for term, members in self._by_role.items():
+                if term in key:
+                    for department_id, member in members:
+                        scores[id(member)] = scores.get(id(member), 0) + len(term)
+                        found[id(member)] = (department_id, member)
+            best = max(scores.values(), default=0)
+            matches = [found[m] for m in scores if scores[m] == best]
+        if department_ids is not None:
+            matches = [m for m in matches if m[0] in department_ids]
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for department_id, member in matches:
+            grouped.setdefault(department_id, []).append(member)
+        return [{**self.departments[d], "members": members} for d, members in grouped.items()]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        연락처 조회 - 부서 → 직원 이름 / 담당 업무 → 부서 이름 2-gram 유사도 순
+
+        부서를 찾았고 나머지에 직원 이름 / 담당 업무가 있으면("교학1팀 수강신청") 그 직원만 남긴다.
+        """
+        key = strip_fillers(query)
+        if not key:
+            return []
+        department_ids, rest = self._departments_in(key)
+        if department_ids:
+            if len(rest) >= _MIN_TERM_CHARS:
+                items = self._members_for(rest, department_ids)
+                if items:
+                    return items
+            return self._with_teams(department_ids)
+        return self._members_for(key) or self._with_teams(self._similar(key))
+
+
+# 싱글톤 인스턴스
+_directory_instance: Optional[AdminDirectory] = None
+_directory_lock = threading.Lock()
+_load_failed = False
+
+
+def get_admin_directory() -> Optional[AdminDirectory]:
+    """AdminDirectory 싱글톤 (처음 호출할 때 로드, 데이터 파일을 읽지 못하면 None - 원격 검색만 사용)"""
+    global _directory_instance, _load_failed
+
+    if _directory_instance is None and not _load_failed:
+        with _directory_lock:
+            if _directory_instance is None and not _load_failed:
+                try:
+                    _directory_instance = AdminDirectory.load()
+                except (OSError, ValueError, KeyError) as e:
+                    _load_failed = True
+                    logger.warning("[AdminDirectory] 로컬 행정부서 데이터 로드 실패 (%s): %s", ADMIN_DATA_FILE, e)
+
+    return _directory_instance
@@ -0,0 +1,323 @@
+"""
+건물 / 시설 로컬 인덱스 - data/강남대 기본정보/강남대위치정리.jsonl
+
+건물마다 시설 목록(층, 시설명, 호실 코드)이 들어 있는 JSONL을 처음 쓸 때 한 번 읽어
+건물명 / 층 / 시설명 / 호실 코드 조회를 네트워크 없이 응답한다.
+
+  - 건물: 한글 이름 / 별칭 / 호실 코드 접두사 ("샬롬관", "샬" → shalom-hall)
+  - 층: (건물, 층) → 시설 목록
+  - 시설명: 정확히 일치 → 2-gram 색인으로 부분 일치
+  - 호실 코드: "예B101호" → 예술관 B1층 B101호 (parse_room_code)
+
+데이터 파일에는 건물 ID(arts-hall 등)만 있으므로 한글 이름 / 별칭 / 호실 코드 접두사는 BUILDINGS 표에 둔다.
+찾지 못하면 None / 빈 리스트를 반환하고, 도구는 기존 Discovery Engine 검색으로 넘어간다.
+"""
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from goole_adk.config import LOCAL_DATA_DIR
+from goole_adk.local_index import compact_key, read_jsonl
+
+logger = logging.getLogger(__name__)
+
+FACILITY_DATA_FILE = os.path.join(LOCAL_DATA_DIR, "강남대 기본정보", "강남대위치정리.jsonl")
+
+# 건물 ID → (한글 이름, 호실 코드 접두사, 별칭)
+BUILDINGS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "arts-hall": ("예술관", "예", ()),
+    "simjeon-1-hall": ("심전1관", "생", ("구기숙사", "생활관")),
+    "simjeon-2-hall": ("심전2관", "", ("신기숙사", "기숙사")),
+    "simjeon-industry-coop-hall": ("심전산학관", "심산", ("산학관", "산학협력관", "평생교육원")),
+    "cheoneun-hall": ("천은관", "천", ()),
+    "uwon-hall": ("우원관", "우", ("우원기념관", "대강당")),
+    "shalom-hall": ("샬롬관", "샬", ()),
+    "seungri-hall": ("승리관", "승", ("학군단",)),
+    "gyeongcheon-hall": ("경천관", "경", ()),
+    "husaeng-hall": ("후생관", "후", ()),
+    "mokyang-hall": ("목양관", "목", ("체육관",)),
+    "humanities-social-hall": ("인문사회관", "인", ("인사관",)),
+    "education-hall": ("교육관", "교", ()),
+    "science-engineering-hall": ("이공관", "이", ()),
+    "library": ("도서관", "도", ("중앙도서관",)),
+    "main-building": ("본관", "본", ("대학본부",)),
+}
+
+# 시설명 부분 일치 최소 글자 수
+_MIN_PARTIAL_CHARS = 2
+# 호실 코드에서 건물 접두사를 뗀 나머지 (소문자, 공백 제거 후)
+_BASEMENT = re.compile(r"^(?:b|지하)(\d)")
+_FLOOR_WORD = re.compile(r"^(\d{1,2})층")
+_LOBBY = re.compile(r"^(\d{1,2})로비")
+_ROOM_NUMBER = re.compile(r"^(\d{3,4})(-\d+)?")
+# 층 입력 ("3층", "3", "03층", "지하1층", "B1", "b1층")
+_FLOOR_INPUT = re.compile(r"^(?:(b|지하)\s*)?(\d{1,2})\s*층?$")
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def format_floor(number: int, basement: bool = False) -> str:
+    """데이터의 층 표기 ("01층", "B1층")"""
+    return f"B{number}층" if basement else f"{number:02d}층"
+
+
+def parse_floor(floor: str) -> Optional[str]:
+    """"3층" / "3" / "지하1층" / "B1" → "03층" / "B1층" (알 수 없으면 None)"""
+    match = _FLOOR_INPUT.match(compact_key(floor))
+    if not match:
+        return None
+    return format_floor(int(match.group(2)), basement=match.group(1) is not None)
+
+
+def room_key(code: str) -> str:
+    """호실 코드 비교 키 ("승101호호" / "승 101호" / "승101" → "승101")"""
+    return re.sub(r"호+$", "", compact_key(code))
+
+
+@dataclass(frozen=True)
+class RoomCode:
+    """호실 코드 해석 결과"""
+
+    building_id: str
+    building: str
+    floor: Optional[str]
+    room: Optional[str]
+
+
+class FacilityIndex:
+    """건물 / 시설 인덱스 (읽기 전용, 스레드 안전)"""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        # 건물 ID → 응답 항목
+        self.buildings: Dict[str, Dict[str, Any]] = {}
+        # 건물 이름 / 별칭 / 접두사 (정규화) → 건물 ID, 긴 것부터 (호실 코드 앞부분 매칭용)
+        self._building_names: Dict[str, str] = {}
+        self._prefixes: List[Tuple[str, str]] = []
+        # 시설 항목
+        self.facilities: List[Dict[str, Any]] = []
+        self._by_floor: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._by_room: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._name_bigrams: Dict[str, Set[str]] = {}
+
+        for doc in documents:
+            building_id = doc["id"]
+            name, prefix, aliases = BUILDINGS.get(building_id, (building_id, "", ()))
+            metadata = doc.get("metadata", {})
+
+            for key in (name, building_id, *aliases):
+                self._building_names.setdefault(compact_key(key), building_id)
+            if prefix:
+                self._prefixes.append((compact_key(prefix), building_id))
+
+            by_floor: Dict[str, List[str]] = {}
+            for facility in metadata.get("facilities", []):
+                item = {
+                    "name": facility.get("name"),
+                    "room": facility.get("room"),
+                    "floor": facility.get("floor"),
+                    "building": name,
+                    "building_id": building_id,
+                }
+                self.facilities.append(item)
+                self._by_floor.setdefault((building_id, item["floor"]), []).append(item)
+                if item["room"]:
+                    self._by_room.setdefault(room_key(item["room"]), []).append(item)
+                if item["name"]:
+                    self._by_name.setdefault(compact_key(item["name"]), []).append(item)
+                by_floor.setdefault(item["floor"], []).append(f"{item['name']}({item['room']})")
+
+            self.buildings[building_id] = {
+                "building": name,
+                "building_id": building_id,
+                "content": doc.get("content"),
+                "naver_map_url": metadata.get("naverMapUrl"),
+                "kakao_map_url": metadata.get("kakaoMapUrl"),
+                # 층 순서: 지하 → 지상
+                "facilities": {floor: by_floor[floor] for floor in sorted(by_floor, key=_floor_order)},
+            }
+            self.buildings[building_id] = {k: v for k, v in self.buildings[building_id].items() if v}
+
+        # 호실 코드는 가장 긴 접두사부터 ("심산" 다음에 "심"이 있어도 올바르게)
+        self._prefixes.sort(key=lambda p: -len(p[0]))
+        self._building_name_list = sorted(self._building_names, key=len, reverse=True)
+        for key in self._by_name:
+            for bigram in _bigrams(key):
+                self._name_bigrams.setdefault(bigram, set()).add(key)
+
+    @classmethod
+    def load(cls, path: str = FACILITY_DATA_FILE) -> "FacilityIndex":
+        return cls(list(read_jsonl(path)))
+
+    def resolve_building(self, name: str) -> Optional[str]:
+        """건물 이름 / 별칭 / 호실 코드 접두사 → 건물 ID ("샬롬관", "샬롬", "샬" → shalom-hall)"""
+        key = compact_key(name)
+        if not key:
+            return None
+        if key in self._building_names:
+            return self._building_names[key]
+        for prefix, building_id in self._prefixes:
+            if key == prefix:
+                return building_id
+        # "샬롬" → "샬롬관" 처럼 이름의 앞부분 (유일할 때만)
+        matches = {bid for n, bid in self._building_names.items() if n.startswith(key)}
+        return matches.pop() if len(matches) == 1 else None
+
+    def _split_building(self, text: str, prefixes: bool = True) -> Tuple[Optional[str], str]:
+        """정규화한 text 앞의 건물 이름 / 별칭(/ 호실 코드 접두사)을 떼어 (건물 ID, 나머지) 반환"""
+        for name in self._building_name_list:
+            if text.startswith(name):
+                return self._building_names[name], text[len(name):]
+        if prefixes:
+            for prefix, building_id in self._prefixes:
+                if text.startswith(prefix):
+                    return building_id, text[len(prefix):]
+        return None, text
+
+    def parse_room_code(self, code: str) -> Optional[RoomCode]:
+        """
+        호실 코드 해석 - 건물 + 층 (+ 호실 번호)
+
+        "예B101호" → 예술관 B1층 B101, "샬1316" → 샬롬관 13층 1316, "이공관 519호" → 이공관 05층 519,
+        "천지하1호" → 천은관 B1층, "도01로비호" → 도서관 01층 로비. 건물을 모르면 None.
+        """
+        building_id, rest = self._split_building(compact_key(code))
+        if building_id is None:
+            return None
+        rest = re.sub(r"호+$", "", rest)
+
+        floor = room = None
+        match = _BASEMENT.match(rest)
+        if match:
+            floor, room = format_floor(int(match.group(1)), basement=True), rest.replace("b", "B", 1)
+        elif _FLOOR_WORD.match(rest):
+            floor = format_floor(int(_FLOOR_WORD.match(rest).group(1)))
+        elif _LOBBY.match(rest):
+            floor, room = format_floor(int(_LOBBY.match(rest).group(1))), "로비"
+        elif _ROOM_NUMBER.match(rest):
+            digits = _ROOM_NUMBER.match(rest).group(1)
+            floor, room = format_floor(int(digits[:-2])), rest
+        elif rest:
+            # 건물 이름 뒤에 호실이 아닌 말이 붙어 있음
+            return None
+        return RoomCode(building_id, self.buildings[building_id]["building"], floor, room)
+
+    def building(self, name: str) -> Optional[Dict[str, Any]]:
+        """건물 정보 (설명, 지도 링크, 층별 시설) - 모르는 건물이면 None"""
+        building_id = self.resolve_building(name)
+        return self.buildings.get(building_id) if building_id else None
+
+    def by_location(self, building: str, floor: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        건물(+ 층)의 시설 목록 - 건물 / 층을 해석하지 못하면 None
+
+        층이 없으면 건물 전체 시설 (층 순서).
+        """
+        building_id = self.resolve_building(building)
+        if building_id is None:
+            return None
+        if floor:
+            floor_key = parse_floor(floor)
+            if floor_key is None:
+                return None
+            return self._by_floor.get((building_id, floor_key), [])
+        return [
+            item
+            for floor_key in self.buildings[building_id].get("facilities", {})
+            for item in self._by_floor[(building_id, floor_key)]
+        ]
+
+    def by_room(self, code: str) -> List[Dict[str, Any]]:
+        """
+        호실 코드 조회 - 데이터에 있는 호실이면 그 시설, 없어도 코드를 해석할 수 있으면 건물 / 층만 담은 항목
+
+        "예B101호", "예b101", "샬롬관 1316호"처럼 건물 이름으로 적어도 된다.
+        """
+        if room_key(code) in self._by_room:
+            return self._by_room[room_key(code)]
+        parsed = self.parse_room_code(code)
+        if parsed is None or parsed.room is None:
+            return []
+        prefix = next((p for p, bid in self._prefixes if bid == parsed.building_id), "")
+        if room_key(prefix + parsed.room) in self._by_room:
+            return self._by_room[room_key(prefix + parsed.room)]
+        if (parsed.building_id, parsed.floor) not in self._by_floor:
+            # 건물에 없는 층 ("샬9999호")
+            return []
+        return [{
+            "room": code.strip(),
+            "floor": parsed.floor,
+            "building": parsed.building,
+            "building_id": parsed.building_id,
+        }]
+
+    def by_name(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        시설명 / 호실 코드 조회
+
+        호실 코드("예B101호")면 그 호실, 아니면 시설명 정확히 일치 → 부분 일치.
+        시설명으로 찾지 못했고 앞에 건물 이름이 있으면("샬롬관 학생식당") 그 건물의 시설에서 나머지로 찾는다.
+        """
+        key = compact_key(query)
+        if not key:
+            return []
+        items = self.by_room(query) or self._facilities_named(key)
+        if items:
+            return items[:limit]
+
+        building_id, rest = self._split_building(key, prefixes=False)
+        if building_id is None or not rest:
+            return []
+        items = [item for item in self._facilities_named(rest) if item["building_id"] == building_id]
+        return items[:limit]
+
+    def _facilities_named(self, key: str) -> List[Dict[str, Any]]:
+        if key in self._by_name:
+            return list(self._by_name[key])
+        if len(key) < _MIN_PARTIAL_CHARS:
+            return []
+        candidates: Optional[Set[str]] = None
+        for bigram in _bigrams(key):
+            names = self._name_bigrams.get(bigram, set())
+            candidates = names if candidates is None else candidates & names
+            if not candidates:
+                return []
+        # 짧은 이름(더 정확히 일치)부터
+        return [item for name in sorted((n for n in candidates if key in n), key=lambda n: (len(n), n)) for item in self._by_name[name]]
+
+
+def _floor_order(floor: str) -> Tuple[int, int]:
+    """"B1층" → (0, -1), "01층" → (1, 1)"""
+    match = re.match(r"^(B)?(\d+)", floor or "")
+    if not match:
+        return (2, 0)
+    number = int(match.group(2))
+    return (0, -number) if match.group(1) else (1, number)
+
+
+# 싱글톤 인스턴스
+_index_instance: Optional[FacilityIndex] = None
+_index_lock = threading.Lock()
+_load_failed = False
+
+
+def get_facility_index() -> Optional[FacilityIndex]:
+    """FacilityIndex 싱글톤 (처음 호출할 때 로드, 데이터 파일을 읽지 못하면 None - 원격 검색만 사용)"""
+    global _index_instance, _load_failed
+
+    if _index_instance is None and not _load_failed:
+        with _index_lock:
+            if _index_instance is None and not _load_failed:
+                try:
+                    _index_instance = FacilityIndex.load()
+                except (OSError, ValueError, KeyError) as e:
+                    _load_failed = True
+                    logger.warning("[FacilityIndex] 로컬 건물 / 시설 데이터 로드 실패 (%s): %s", FACILITY_DATA_FILE, e)
+
+    return _index_instance
@@ -1,13 +1,22 @@
 """
 강남대학교 건물/시설 정보 및 행정부서 연락처 검색 도구 (Vertex AI Search 기반)
+
+건물명 / 건물·층 / 시설명(호실 코드) 검색은 로컬 건물·시설 인덱스(facility_index.py),
+행정부서 / 연락처 검색은 로컬 행정부서 디렉터리(admin_directory.py)에서 먼저 찾고,
+찾지 못했을 때와 자유 입력형 건물 검색만 Vertex AI Search를 호출합니다.
 """
 
-import json
 from google.adk.tools import FunctionTool
-from google.auth import default
-from google.auth.transport.requests import Request
+from goole_adk.async_tools import async_tool
+from goole_adk.config import LOCAL_INDEX_ENABLED
+from goole_adk.local_index import local_response
+from goole_adk.result_projection import register_projection
+from goole_adk.search_client import vertex_ai_search
 from typing import Dict, Any, Optional
 
+from .admin_directory import get_admin_directory
+from .facility_index import get_facility_index
+
 # Vertex AI Search 엔진 endpoint - 건물/시설 정보
 BUILDING_SEARCH_ENDPOINT = (
     "https://discoveryengine.googleapis.com/v1alpha/"
@@ -16,6 +25,19 @@ BUILDING_SEARCH_ENDPOINT = (
     "servingConfigs/default_search:search"
 )
 
+# 위 엔진이 검색하는 데이터스토어 (캐시 무효화 단위 - data/강남대 기본정보/upload_building_to_ai_search.py)
+BUILDING_DATA_STORE_ID = "kangnam-univ-building-info-datastore"
+
+# 도구 응답에 남길 필드 - 건물/시설
+BUILDING_PROJECTION = register_projection("building", {
+    "building_id": "title",
+    "content": "fields.content",
+    "facilities": "fields.metadata.facilities",
+    "naver_map_url": "fields.metadata.naverMapUrl",
+    "kakao_map_url": "fields.metadata.kakaoMapUrl",
+    "snippet": "snippet",
+})
+
 # Vertex AI Search 엔진 endpoint - 행정부서 연락처
 ADMIN_SEARCH_ENDPOINT = (
     "https://discoveryengine.googleapis.com/v1alpha/"
@@ -24,76 +46,53 @@ ADMIN_SEARCH_ENDPOINT = (
     "servingConfigs/default_search:search"
 )
 
-# 공통 함수: Vertex AI Search API 호출
-def vertex_ai_search_request(query: str, endpoint: str, page_size: int = 10) -> Dict[str, Any]:
-    """
-    Vertex AI Search API를 curl 호출 형태로 실행하고 결과를 반환.
-    """
-    try:
-        # Google Auth 라이브러리로 access token 가져오기 (배포 환경 호환)
-        credentials, project = default()
-        if not credentials.valid:
-            credentials.refresh(Request())
-        token = credentials.token
-        
-        payload = {
-            "query": query,
-            "pageSize": page_size,
-            "queryExpansionSpec": {"condition": "AUTO"},
-            "spellCorrectionSpec": {"mode": "AUTO"},
-            "languageCode": "ko",
-            "userInfo": {"timeZone": "Asia/Seoul"}
-        }
-        
-        # API 호출
-        import requests
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        response = requests.post(endpoint, headers=headers, json=payload)
-        result = response.json()
-        
-        # 정리된 형태로 반환
-        if "results" in result:
-            formatted_results = []
-            for i, item in enumerate(result["results"], start=1):
-                doc = item.get("document", {})
-                structured = doc.get("structData", {})
-                formatted_results.append({
-                    "rank": i,
-                    "title": doc.get("id"),
-                    "snippet": item.get("snippet", ""),
-                    "fields": structured
-                })
-            
-            return {
-                "status": "success",
-                "count": len(formatted_results),
-                "query": query,
-                "results": formatted_results,
-                "message": f"'{query}'에 대한 검색 결과 {len(formatted_results)}개를 찾았습니다."
-            }
-        else:
-            return {
-                "status": "error",
-                "query": query,
-                "message": "검색 결과가 없습니다.",
-                "raw_response": result
-            }
-        
-    except Exception as e:
-        return {
-            "status": "error",
-            "query": query,
-            "message": str(e)
-        }
-        
+# 위 엔진이 검색하는 데이터스토어 (캐시 무효화 단위 - data/강남대 기본정보/upload_admin_to_ai_search.py)
+ADMIN_DATA_STORE_ID = "kangnam-univ-admin-contacts-datastore"
+
+# 도구 응답에 남길 필드 - 행정부서 연락처 (slug / parent 등 내부 식별자 제외)
+ADMIN_PROJECTION = register_projection("admin", {
+    "name": "fields.metadata.name_kr",
+    "content": "fields.content",
+    "type": "fields.metadata.type",
+    "location": "fields.metadata.location",
+    "phone_main": "fields.metadata.phone_main",
+    "fax": "fields.metadata.fax",
+    "members": "fields.metadata.members",
+    "related_colleges": "fields.metadata.related_colleges",
+    "snippet": "snippet",
+})
+
+# 데이터스토어별 응답 투영
+_PROJECTIONS = {
+    BUILDING_DATA_STORE_ID: BUILDING_PROJECTION,
+    ADMIN_DATA_STORE_ID: ADMIN_PROJECTION,
+}
+
+# 공통 함수: Vertex AI Search API 호출 (공용 검색 클라이언트 사용)
+def vertex_ai_search_request(query: str, endpoint: str, datastore: str, page_size: int = 10) -> Dict[str, Any]:
+    """
+    건물/시설 또는 행정부서 검색 엔진에 질의하고 결과를 반환.
+    """
+    return vertex_ai_search(endpoint, datastore, query, page_size=page_size, projection=_PROJECTIONS.get(datastore))
+
+def _facility_index():
+    """로컬 건물/시설 인덱스 (비활성화했거나 로드하지 못했으면 None)"""
+    return get_facility_index() if LOCAL_INDEX_ENABLED else None
+
+def _admin_directory():
+    """로컬 행정부서 디렉터리 (비활성화했거나 로드하지 못했으면 None)"""
+    return get_admin_directory() if LOCAL_INDEX_ENABLED else None
+
 def search_building_by_name(building_name: str) -> Dict[str, Any]:
     """
     건물명으로 검색합니다.
     """
-    return vertex_ai_search_request(f"{building_name}", BUILDING_SEARCH_ENDPOINT)
+    index = _facility_index()
+    if index is not None:
+        building = index.building(building_name)
+        if building is not None:
+            return local_response(building_name, [building], "건물 정보")
+    return vertex_ai_search_request(f"{building_name}", BUILDING_SEARCH_ENDPOINT, BUILDING_DATA_STORE_ID)
 
 def search_facility_by_location(building: str, floor: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -103,47 +102,82 @@ def search_facility_by_location(building: str, floor: Optional[str] = None) -> D
         query = f"{building} {floor}"
     else:
         query = f"{building} 시설"
-    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT)
+    index = _facility_index()
+    if index is not None:
+        items = index.by_location(building, floor)
+        if items:
+            return local_response(query, items, "시설")
+    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT, BUILDING_DATA_STORE_ID)
 
 def search_facility_by_name(facility_name: str) -> Dict[str, Any]:
     """
-    시설명으로 검색
+    시설명으로 검색 (호실 코드도 가능, 예: "예B101호")
     """
     query = f"{facility_name}"
-    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT)
+    index = _facility_index()
+    if index is not None:
+        items = index.by_name(facility_name)
+        if items:
+            return local_response(query, items, "시설")
+    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT, BUILDING_DATA_STORE_ID)
 
 def search_building_info(query: str) -> Dict[str, Any]:
     """
     자유 입력형 검색 (건물/시설)
     """
-    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT)
+    return vertex_ai_search_request(query, BUILDING_SEARCH_ENDPOINT, BUILDING_DATA_STORE_ID)
 
 def search_admin_department(query: str) -> Dict[str, Any]:
     """
     행정부서 및 연락처 검색
     """
-    return vertex_ai_search_request(query, ADMIN_SEARCH_ENDPOINT)
+    directory = _admin_directory()
+    if directory is not None:
+        items = directory.search(query)
+        if items:
+            return local_response(query, items, "행정부서 정보")
+    return vertex_ai_search_request(query, ADMIN_SEARCH_ENDPOINT, ADMIN_DATA_STORE_ID)
 
 def search_department_by_name(department_name: str) -> Dict[str, Any]:
     """
     부서명으로 검색
     """
-    return vertex_ai_search_request(f"{department_name}", ADMIN_SEARCH_ENDPOINT)
+    directory = _admin_directory()
+    if directory is not None:
+        items = directory.department(department_name)
+        if items:
+            return local_response(department_name, items, "행정부서 정보")
+    return vertex_ai_search_request(f"{department_name}", ADMIN_SEARCH_ENDPOINT, ADMIN_DATA_STORE_ID)
 
 def search_contact_info(query: str) -> Dict[str, Any]:
     """
-    연락처 정보 검색 (전화번호, 팩스, 위치)
+    연락처 정보 검색 (전화번호, 팩스, 위치, 담당자)
     """
-    return vertex_ai_search_request(f"{query} 연락처", ADMIN_SEARCH_ENDPOINT)
+    directory = _admin_directory()
+    if directory is not None:
+        items = directory.search(query)
+        if items:
+            return local_response(query, items, "연락처 정보")
+    # 질의를 그대로 전달 ("연락처"를 덧붙이면 "입학처 전화번호 연락처"처럼 검색어만 흐려짐)
+    return vertex_ai_search_request(query, ADMIN_SEARCH_ENDPOINT, ADMIN_DATA_STORE_ID)
+
 
+# 비동기 버전 - 모델이 한 단계에서 여러 도구를 호출하면 동시에 실행됨 (async_tools.py)
+search_building_info_async = async_tool(search_building_info)
+search_building_by_name_async = async_tool(search_building_by_name)
+search_facility_by_location_async = async_tool(search_facility_by_location)
+search_facility_by_name_async = async_tool(search_facility_by_name)
+search_admin_department_async = async_tool(search_admin_department)
+search_department_by_name_async = async_tool(search_department_by_name)
+search_contact_info_async = async_tool(search_contact_info)
 
-search_building_info_tool = FunctionTool(search_building_info)
-search_building_by_name_tool = FunctionTool(search_building_by_name)
-search_facility_by_location_tool = FunctionTool(search_facility_by_location)
-search_facility_by_name_tool = FunctionTool(search_facility_by_name)
-search_admin_department_tool = FunctionTool(search_admin_department)
-search_department_by_name_tool = FunctionTool(search_department_by_name)
-search_contact_info_tool = FunctionTool(search_contact_info)
+search_building_info_tool = FunctionTool(search_building_info_async)
+search_building_by_name_tool = FunctionTool(search_building_by_name_async)
+search_facility_by_location_tool = FunctionTool(search_facility_by_location_async)
+search_facility_by_name_tool = FunctionTool(search_facility_by_name_async)
+search_admin_department_tool = FunctionTool(search_admin_department_async)
+search_department_by_name_tool = FunctionTool(search_department_by_name_async)
+search_contact_info_tool = FunctionTool(search_contact_info_async)
 
 ALL_BASIC_INFO_TOOLS = [
     search_building_info_tool,
@@ -8,6 +8,7 @@ Vertex AI Search 기반 졸업이수학점 및 교양과목 정보 검색 전문
 import vertexai
 from google.adk.agents import Agent
 from goole_adk.config import PROJECT_ID, VERTEX_AI_LOCATION
+from goole_adk.tracing import trace_after_model, trace_after_tool, trace_before_model, trace_before_tool
 from .tools import ALL_GRADUATION_TOOLS
 
 # Vertex AI 초기화
@@ -239,6 +240,11 @@ graduation_agent = Agent(
     
     💡 핵심 원칙: "정확성 > 속도", "검색 기반 > 추측", "자연스러운 대화 흐름"
     ''',
-    tools=ALL_GRADUATION_TOOLS
+    tools=ALL_GRADUATION_TOOLS,
+    # 트레이싱: LLM 호출 / 도구 실행 구간 기록 (TRACE_EXPORT_PATH 설정 시)
+    before_model_callback=trace_before_model,
+    after_model_callback=trace_after_model,
+    before_tool_callback=trace_before_tool,
+    after_tool_callback=trace_after_tool,
 )
 
@@ -11,6 +11,9 @@ from .search_tools import (
     search_by_year_and_college,
     search_by_department,
     get_available_information,
+    search_graduation_requirements_async,
+    search_by_year_and_college_async,
+    search_by_department_async,
     search_graduation_requirements_tool,
     search_by_year_and_college_tool,
     search_by_department_tool,
@@ -32,6 +35,9 @@ __all__ = [
     'search_by_year_and_college',
     'search_by_department',
     'get_available_information',
+    'search_graduation_requirements_async',
+    'search_by_year_and_college_async',
+    'search_by_department_async',
     'search_graduation_requirements_tool',
     'search_by_year_and_college_tool',
     'search_by_department_tool',
@@ -0,0 +1,236 @@
+"""
+졸업요건 로컬 인덱스 - data/졸업요건/2017_2025_통합_졸업이수학점.json
+
+졸업요건 데이터는 패키지와 함께 배포되는 JSON 하나에 모두 들어 있으므로, 처음 쓸 때 한 번 읽어
+메모리 인덱스로 만들고 구조화된 조회(학년도 + 대학, 학과)는 네트워크 없이 응답한다.
+
+  - 학년도 → year_range 구간 ("2017~2020", "2021~2024", "2025 이후") - 구간 시작 연도로 이분 탐색
+  - year_range → 대학 → 계열 → 학부 / 학과 / 전공
+  - 학과 / 학부 / 전공 이름 → (year_range, 대학, 계열) 목록
+
+학년도 / 대학 / 학과를 찾지 못하면 None을 반환하고, 도구는 기존 Discovery Engine 검색으로 넘어간다.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from goole_adk.config import LOCAL_DATA_DIR
+from goole_adk.local_index import compact_key
+from goole_adk.result_projection import prune
+
+logger = logging.getLogger(__name__)
+
+GRADUATION_DATA_FILE = os.path.join(LOCAL_DATA_DIR, "졸업요건", "2017_2025_통합_졸업이수학점.json")
+
+# 카테고리별로 응답에 담을 항목 (그 외 카테고리는 모두)
+CATEGORY_SECTIONS = {
+    "졸업요건": ("졸업요건", "전공탐색", "비고"),
+    "교양이수표": ("교양이수표",),
+}
+ALL_SECTIONS = ("졸업요건", "교양이수표", "전공탐색", "비고")
+# 그 외 카테고리 이름
+ALL_CATEGORY = "전체"
+
+# 학년도 구간에 따라 이름이 바뀐 대학 (같은 그룹은 서로 대신 찾음)
+COLLEGE_GROUPS = (
+    ("공과대학", "ICT건설복지융합대학"),
+    ("글로벌인재대학", "글로벌문화콘텐츠대학"),
+)
+
+# 줄임말 → 대학 이름
+COLLEGE_ALIASES = {
+    "공대": "공과대학",
+    "사범대": "사범대학",
+    "예체능대": "예체능대학",
+    "경영대": "경영관리대학",
+    "복지대": "복지융합대학",
+}
+
+# "사회복지학전공(주)" → "사회복지학전공"
+_SUFFIX = re.compile(r"\([^)]*\)$")
+
+
+def normalize_name(name: str) -> str:
+    return compact_key(name)
+
+
+def _parse_year_range(year_range: str) -> Tuple[int, float]:
+    """"2017~2020" → (2017, 2020), "2025 이후" → (2025, inf)"""
+    numbers = [int(n) for n in re.findall(r"\d{4}", year_range)]
+    if "이후" in year_range or len(numbers) == 1:
+        return numbers[0], float("inf")
+    return numbers[0], numbers[1]
+
+
+class GraduationIndex:
+    """졸업요건 JSON의 메모리 인덱스 (읽기 전용, 스레드 안전)"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        # year_range → 대학 → 원본 항목
+        self.colleges: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # year_range 구간 (시작 연도 순)
+        self._ranges: List[Tuple[int, float, str]] = []
+        # 정규화한 학과 / 학부 / 전공 이름 → [(year_range, 대학, 계열, 학과 항목)]
+        self.departments: Dict[str, List[Tuple[str, str, str, Dict[str, Any]]]] = {}
+
+        for entry in entries:
+            year_range = entry["year_range"]
+            if year_range not in self.colleges:
+                start, end = _parse_year_range(year_range)
+                self._ranges.append((start, end, year_range))
+                self.colleges[year_range] = {}
+            self.colleges[year_range][entry["대학"]] = entry
+
+            for division in entry.get("계열", []):
+                for unit in division.get("학부및학과", []):
+                    names = [unit.get("학부"), unit.get("학과"), *unit.get("전공", [])]
+                    for name in filter(None, names):
+                        for key in {normalize_name(name), normalize_name(_SUFFIX.sub("", name))}:
+                            self.departments.setdefault(key, []).append(
+                                (year_range, entry["대학"], division.get("계열명"), unit)
+                            )
+
+        # year_range → 정규화한 대학 이름 → 대학 이름
+        self._college_names = {
+            year_range: {normalize_name(c): c for c in colleges} for year_range, colleges in self.colleges.items()
+        }
+        self._ranges.sort()
+        self._starts = [start for start, _, _ in self._ranges]
+        # 만든 응답 항목 (조합 수가 적으므로 모두 보관)
+        self._items: Dict[Tuple[str, str, str, Optional[int]], Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str = GRADUATION_DATA_FILE) -> "GraduationIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["data"])
+
+    @property
+    def year_ranges(self) -> List[str]:
+        return [year_range for _, _, year_range in self._ranges]
+
+    def year_range_for(self, year: int) -> Optional[str]:
+        """입학 연도가 속한 year_range (데이터 범위 밖이면 None)"""
+        i = bisect.bisect_right(self._starts, year) - 1
+        if i < 0:
+            return None
+        start, end, year_range = self._ranges[i]
+        return year_range if start <= year <= end else None
+
+    def resolve_college(self, year_range: str, college: str) -> Optional[str]:
+        """year_range에 있는 대학 이름으로 변환 (정확히 일치 → 줄임말 / 개명 전후 이름 → 유일한 부분 일치)"""
+        by_normalized = self._college_names.get(year_range, {})
+        name = normalize_name(college)
+        name = COLLEGE_ALIASES.get(name, name)
+
+        candidates = [name]
+        for group in COLLEGE_GROUPS:
+            names = [normalize_name(c) for c in group]
+            if name in names:
+                candidates.extend(names)
+        for candidate in candidates:
+            if candidate in by_normalized:
+                return by_normalized[candidate]
+
+        partial = [c for key, c in by_normalized.items() if name and (name in key or key in name)]
+        return partial[0] if len(partial) == 1 else None
+
+    def _item(
+        self,
+        entry: Dict[str, Any],
+        category: str,
+        division: Optional[str] = None,
+        department: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """응답 항목 (호출하는 쪽은 수정하지 않고 복사해서 씀)"""
+        if category not in CATEGORY_SECTIONS:
+            category = ALL_CATEGORY
+        key = (entry["year_range"], entry["대학"], category, id(department) if department is not None else None)
+        item = self._items.get(key)
+        if item is not None:
+            return item
+
+        item = {"year_range": entry["year_range"], "college": entry["대학"], "category": category}
+        if department is not None:
+            item.update(division=division, department=department)
+        else:
+            # 대학 전체: 계열별 학부 / 학과 목록
+            item["divisions"] = entry.get("계열")
+        item.update({section: entry.get(section) for section in CATEGORY_SECTIONS.get(category, ALL_SECTIONS)})
+        # null / 빈 값 제거 (2025 이후 데이터는 계열교양 등이 없음)
+        item = self._items[key] = prune(item)
+        return item
+
+    def by_year_and_college(self, year: int, college: str, category: str) -> Optional[Dict[str, Any]]:
+        """학년도 + 대학 조회 - 찾지 못하면 None"""
+        year_range = self.year_range_for(year)
+        if year_range is None:
+            return None
+        name = self.resolve_college(year_range, college)
+        if name is None:
+            return None
+        return self._item(self.colleges[year_range][name], category)
+
+    def by_department(self, department: str, year: Optional[int], category: str) -> List[Dict[str, Any]]:
+        """학과 / 학부 / 전공 조회 (year가 있으면 그 학년도 구간만) - 찾지 못하면 빈 리스트"""
+        name = normalize_name(department)
+        matches = self.departments.get(name) or self.departments.get(normalize_name(_SUFFIX.sub("", department)))
+        if not matches:
+            # "컴퓨터공학" → "컴퓨터공학부" 처럼 한쪽이 다른 쪽을 포함하는 이름 (가장 짧은 이름 하나)
+            partial = sorted(
+                (key for key in self.departments if name and (name in key or key in name)), key=len
+            )
+            matches = self.departments[partial[0]] if partial else []
+
+        if year is not None:
+            year_range = self.year_range_for(year)
+            matches = [m for m in matches if m[0] == year_range]
+
+        items, seen = [], set()
+        for year_range, college, division, unit in matches:
+            # 학부와 전공이 같은 항목을 가리키면 한 번만
+            if (year_range, college, id(unit)) in seen:
+                continue
+            seen.add((year_range, college, id(unit)))
+            items.append(self._item(self.colleges[year_range][college], category, division, unit))
+        return items
+
+    def available(self) -> Dict[str, Any]:
+        """year_range별 대학 / 학과 목록"""
+        return {
+            year_range: {
+                college: sorted({
+                    unit.get("학부") or unit.get("학과")
+                    for division in entry.get("계열", [])
+                    for unit in division.get("학부및학과", [])
+                })
+                for college, entry in self.colleges[year_range].items()
+            }
+            for year_range in self.year_ranges
+        }
+
+
+# 싱글톤 인스턴스
+_index_instance: Optional[GraduationIndex] = None
+_index_lock = threading.Lock()
+_load_failed = False
+
+
+def get_graduation_index() -> Optional[GraduationIndex]:
+    """GraduationIndex 싱글톤 (처음 호출할 때 로드, 데이터 파일을 읽지 못하면 None - 원격 검색만 사용)"""
+    global _index_instance, _load_failed
+
+    if _index_instance is None and not _load_failed:
+        with _index_lock:
+            if _index_instance is None and not _load_failed:
+                try:
+                    _index_instance = GraduationIndex.load()
+                except (OSError, ValueError, KeyError) as e:
+                    _load_failed = True
+                    logger.warning("[GraduationIndex] 로컬 졸업요건 데이터 로드 실패 (%s): %s", GRADUATION_DATA_FILE, e)
+
+    return _index_instance
@@ -5,18 +5,28 @@
   - 빠르고 정확한 메타데이터 기반 검색
   - 메타데이터 필터링 지원 (college, division, department, year_range, category)
 
+로컬 인덱스: graduation_index.py
+  - search_by_year_and_college / search_by_department / get_available_information은
+    패키지에 포함된 졸업요건 JSON의 메모리 인덱스로 응답 (찾지 못하면 Vertex AI Search로 검색)
+
 백업용: RAG (rag_search_tools.py)
   - 사용 안 함
   - 필요시 rag_search_tools.py에서 import하여 재활성화 가능
   - 예: from .rag_search_tools import ALL_RAG_GRADUATION_TOOLS
 """
 
-import json
+import re
+
 from google.adk.tools import FunctionTool
-from google.auth import default
-from google.auth.transport.requests import Request
+from goole_adk.async_tools import async_tool
+from goole_adk.config import LOCAL_INDEX_ENABLED
+from goole_adk.local_index import local_response
+from goole_adk.result_projection import register_projection
+from goole_adk.search_client import vertex_ai_search
 from typing import Dict, Optional, Any
 
+from .graduation_index import get_graduation_index
+
 # ============================================================================
 # Vertex AI Search 기반 검색 도구
 # ============================================================================
@@ -29,8 +39,22 @@ VERTEX_SEARCH_ENDPOINT = (
     "servingConfigs/default_search:search"
 )
 
+# 위 엔진이 검색하는 데이터스토어 (캐시 무효화 단위 - data/result/upload_graduation_AI_Search.py)
+DATA_STORE_ID = "kangnam-univ-graduation-requirements-datastore"
+
+
+# 도구 응답에 남길 필드 (content + 메타데이터 주요 필드, 중복 metadata / language / source_file 제외)
+GRADUATION_PROJECTION = register_projection("graduation", {
+    "content": "fields.content",
+    "college": "fields.metadata.college",
+    "division": "fields.metadata.division",
+    "department": "fields.metadata.department",
+    "year_range": "fields.metadata.year_range",
+    "category": "fields.metadata.category",
+})
+
 
-# 공통 함수: Vertex AI Search API 호출
+# 공통 함수: Vertex AI Search API 호출 (공용 검색 클라이언트 사용)
 def vertex_ai_search_request(query: str, page_size: int = 10) -> Dict[str, Any]:
     """
     Vertex AI Search API를 호출하고 결과를 반환합니다.
@@ -42,74 +66,23 @@ def vertex_ai_search_request(query: str, page_size: int = 10) -> Dict[str, Any]:
     Returns:
         검색 결과 딕셔너리
     """
-    try:
-        # Google Auth 라이브러리로 access token 가져오기 (배포 환경 호환)
-        credentials, project = default()
-        if not credentials.valid:
-            credentials.refresh(Request())
-        token = credentials.token
-        
-        payload = {
-            "query": query,
-            "pageSize": page_size,
-            "queryExpansionSpec": {"condition": "AUTO"},
-            "spellCorrectionSpec": {"mode": "AUTO"},
-            "languageCode": "ko",
-            "userInfo": {"timeZone": "Asia/Seoul"}
-        }
-        
-        # API 호출
-        import requests
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        response = requests.post(VERTEX_SEARCH_ENDPOINT, headers=headers, json=payload)
-        result = response.json()
-        
-        # 정리된 형태로 반환
-        if "results" in result:
-            formatted_results = []
-            for i, item in enumerate(result["results"], start=1):
-                doc = item.get("document", {})
-                structured = doc.get("structData", {})
-                
-                # content와 metadata 추출
-                content = structured.get("content", "")
-                metadata = structured.get("metadata", {})
-                
-                formatted_results.append({
-                    "rank": i,
-                    "content": content,
-                    "metadata": metadata,
-                    "college": metadata.get("college", "N/A"),
-                    "division": metadata.get("division", "N/A"),
-                    "department": metadata.get("department", "N/A"),
-                    "year_range": metadata.get("year_range", "N/A"),
-                    "category": metadata.get("category", "N/A")
-                })
-            
-            return {
-                "status": "success",
-                "count": len(formatted_results),
-                "query": query,
-                "results": formatted_results,
-                "message": f"'{query}'에 대한 검색 결과 {len(formatted_results)}개를 찾았습니다."
-            }
-        else:
-            return {
-                "status": "error",
-                "query": query,
-                "message": "검색 결과가 없습니다.",
-                "raw_response": result
-            }
-        
-    except Exception as e:
-        return {
-            "status": "error",
-            "query": query,
-            "message": f"검색 중 오류 발생: {str(e)}"
-        }
+    return vertex_ai_search(
+        VERTEX_SEARCH_ENDPOINT, DATA_STORE_ID, query, page_size=page_size, projection=GRADUATION_PROJECTION
+    )
+
+
+def _local_index():
+    """로컬 졸업요건 인덱스 (비활성화했거나 로드하지 못했으면 None)"""
+    return get_graduation_index() if LOCAL_INDEX_ENABLED else None
+
+
+def _parse_year(year: str) -> Optional[int]:
+    """"2024", "2024학번", "24학번" → 2024 (알 수 없으면 None)"""
+    match = re.search(r"\d{4}", str(year))
+    if match:
+        return int(match.group())
+    match = re.search(r"\d{2}", str(year))
+    return 2000 + int(match.group()) if match else None
 
 
 def search_graduation_requirements(query: str, page_size: Optional[int] = 10) -> Dict[str, Any]:
@@ -123,7 +96,7 @@ def search_graduation_requirements(query: str, page_size: Optional[int] = 10) ->
     Returns:
         검색 결과를 포함한 딕셔너리:
         - status: "success" 또는 "error"
-        - results: 검색된 문서 리스트 (content, metadata 포함)
+        - results: 검색된 문서 리스트 (content, college, division, department, year_range, category)
         - count: 결과 개수
         - query: 원본 질문
         - message: 상태 메시지
@@ -153,8 +126,10 @@ def search_by_year_and_college(
         검색 결과 딕셔너리
     """
     # 학년도 매핑
-    year_int = int(year)
-    if 2017 <= year_int <= 2020:
+    year_int = _parse_year(year)
+    if year_int is None:
+        year_range_query = year
+    elif 2017 <= year_int <= 2020:
         year_range_query = "2017~2020"
     elif 2021 <= year_int <= 2024:
         year_range_query = "2021~2024"
@@ -166,8 +141,13 @@ def search_by_year_and_college(
     # 구조화된 쿼리 생성
     query = f"{year_range_query} {college} {category}"
     
-    # 검색 실행
-    result = search_graduation_requirements(query=query, page_size=page_size)
+    # 로컬 인덱스에서 먼저 찾고, 없으면 Vertex AI Search
+    index = _local_index()
+    item = index.by_year_and_college(year_int, college, category) if index and year_int else None
+    if item is not None:
+        result = local_response(query, [item], "졸업요건 정보")
+    else:
+        result = search_graduation_requirements(query=query, page_size=page_size)
     
     # 결과에 검색 조건 추가
     if result["status"] == "success":
@@ -202,6 +182,15 @@ def search_by_department(
     else:
         query = f"{department} {category}"
     
+    # 로컬 인덱스에서 먼저 찾고, 없으면 Vertex AI Search
+    index = _local_index()
+    if index is not None:
+        year_int = _parse_year(year) if year else None
+        if not year or year_int:
+            items = index.by_department(department, year_int, category)
+            if items:
+                return local_response(query, items, "졸업요건 정보")
+
     return vertex_ai_search_request(query, page_size=5)
 
 
@@ -214,6 +203,31 @@ def get_available_information() -> Dict[str, Any]:
     Returns:
         사용 가능한 대학, 학년도 범위, 카테고리 정보
     """
+    index = _local_index()
+    if index is not None:
+        available = index.available()
+        colleges = list(dict.fromkeys(c for by_college in available.values() for c in by_college))
+        return {
+            "status": "success",
+            "available_data": {
+                "colleges": colleges,
+                "year_ranges": [f"{year_range} 입학자" for year_range in index.year_ranges],
+                "departments_by_year_range": available,
+                "categories": [
+                    "졸업요건 (기초교양, 계열교양, 균형교양, 전공학점, 최소졸업학점)",
+                    "교양이수표 (기초교양 과목, 계열교양 과목, 균형교양 요건)"
+                ],
+                "search_examples": [
+                    "2024년 입학생 복지융합대학 졸업 요건",
+                    "공과대학 기초교양 과목",
+                    "2019년 입학생 최소 졸업학점",
+                    "사범대학 교양이수표"
+                ]
+            },
+            "message": "강남대학교 졸업이수학점 및 교양과목 정보를 검색할 수 있습니다.",
+            "search_engine": "로컬 졸업요건 인덱스 + Vertex AI Search (Discovery Engine)"
+        }
+
     return {
         "status": "success",
         "available_data": {
@@ -246,11 +260,17 @@ def get_available_information() -> Dict[str, Any]:
     }
 
 
+# 비동기 버전 - 모델이 한 단계에서 여러 도구를 호출하면 동시에 실행됨 (async_tools.py)
+search_graduation_requirements_async = async_tool(search_graduation_requirements)
+search_by_year_and_college_async = async_tool(search_by_year_and_college)
+search_by_department_async = async_tool(search_by_department)
+
+
 # Google ADK FunctionTool로 변환
 # 이렇게 하면 AI Agent가 자동으로 이 함수들을 사용할 수 있습니다
-search_graduation_requirements_tool = FunctionTool(search_graduation_requirements)
-search_by_year_and_college_tool = FunctionTool(search_by_year_and_college)
-search_by_department_tool = FunctionTool(search_by_department)
+search_graduation_requirements_tool = FunctionTool(search_graduation_requirements_async)
+search_by_year_and_college_tool = FunctionTool(search_by_year_and_college_async)
+search_by_department_tool = FunctionTool(search_by_department_async)
 get_available_information_tool = FunctionTool(get_available_information)
 
 
@@ -0,0 +1,290 @@
+"""
+교수 디렉터리 - data/교수정보/*.jsonl 로컬 인덱스
+
+교수정보 JSONL(대학 / 학부별 파일)을 처음 쓸 때 한 번 읽어 교수 한 명당 레코드 하나로 만들고,
+이름 / 학과 / 연구분야 조회는 네트워크 없이 응답한다.
+
+  - 이름: 정확히 일치 → 접두사 (정렬한 이름 목록에서 이분 탐색, "김" → 김씨 교수 최대 20명)
+  - 학과: 대학 / 학부 / 전공 이름 (학부 소속은 파일의 교수 명단 인덱스(org_index) 기준)
+  - 연구분야: 키워드 / 담당 과목 역색인 + 키워드 2-gram 색인 (부분 일치도 전체를 훑지 않음)
+
+찾지 못하면 빈 리스트를 반환하고, 도구는 기존 Discovery Engine 검색으로 넘어간다.
+"""
+
+import bisect
+import glob
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from goole_adk.config import LOCAL_DATA_DIR
+from goole_adk.local_index import compact_key, read_jsonl
+from goole_adk.result_projection import is_placeholder
+
+logger = logging.getLogger(__name__)
+
+PROFESSOR_DATA_DIR = os.path.join(LOCAL_DATA_DIR, "교수정보")
+
+# 학과 이름 끝의 단위 ("컴퓨터공학부" / "컴퓨터공학과" / "컴퓨터공학전공" → "컴퓨터공학")
+_UNIT_SUFFIX = re.compile(r"(학부|학과|전공|과)$")
+# 이름 뒤 호칭
+_TITLE_SUFFIX = re.compile(r"(교수님|교수|님)$")
+# 연구분야 질의 구분자
+_FIELD_SEPARATORS = re.compile(r"[\s,/·]+")
+# 부분 일치로 찾을 최소 글자 수 (한 글자는 너무 많이 걸림)
+_MIN_PARTIAL_CHARS = 2
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _stem(name: str) -> str:
+    key = compact_key(name)
+    stem = _UNIT_SUFFIX.sub("", key)
+    return stem if len(stem) >= _MIN_PARTIAL_CHARS else key
+
+
+def _values(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """자리표시 값("정보없음")을 뺀 튜플"""
+    return tuple(v for v in values or () if isinstance(v, str) and not is_placeholder(v))
+
+
+def _value(value: Any) -> Optional[str]:
+    return None if value is None or is_placeholder(value) else value
+
+
+@dataclass(frozen=True)
+class ProfessorRecord:
+    """교수 한 명 (자리표시 값은 None / 빈 튜플)"""
+
+    professor_id: str
+    name: str
+    college: Optional[str]
+    department: Optional[str]
+    major: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    office: Optional[str]
+    degree: Optional[str]
+    keywords: Tuple[str, ...]
+    courses: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """도구 응답 항목 (값이 없는 필드 제외, 전공이 학부 이름과 같으면 생략)"""
+        item = {
+            "name": self.name,
+            "college": self.college,
+            "department": self.department,
+            "major": self.major if self.major != self.department else None,
+            "email": self.email,
+            "phone": self.phone,
+            "office": self.office,
+            "degree": self.degree,
+            "keywords": list(self.keywords),
+            "courses": list(self.courses),
+        }
+        return {k: v for k, v in item.items() if v}
+
+
+class ProfessorDirectory:
+    """교수 레코드 + 이름 / 학과 / 키워드 인덱스 (읽기 전용, 스레드 안전)"""
+
+    def __init__(self, records: List[ProfessorRecord]):
+        self.records = records
+        # 응답 항목 (레코드 순서와 같음)
+        self._items = {id(r): r.to_dict() for r in records}
+
+        # 이름 → 레코드 (동명이인 가능)
+        self._by_name: Dict[str, List[ProfessorRecord]] = {}
+        for record in records:
+            self._by_name.setdefault(compact_key(record.name), []).append(record)
+        self._names = sorted(self._by_name)
+
+        # 대학 / 학부 / 전공 이름 (정규화, 단위 뗀 이름) → 레코드
+        self._by_unit: Dict[str, List[ProfessorRecord]] = {}
+        for record in records:
+            keys = set()
+            for unit in (record.college, record.department, record.major):
+                if unit:
+                    keys.update((compact_key(unit), _stem(unit)))
+            for key in keys:
+                self._by_unit.setdefault(key, []).append(record)
+
+        # 키워드 / 담당 과목 → 레코드
+        self._by_keyword: Dict[str, List[ProfessorRecord]] = {}
+        for record in records:
+            for key in {compact_key(k) for k in record.keywords + record.courses}:
+                self._by_keyword.setdefault(key, []).append(record)
+        # 2-gram → 그 2-gram이 들어 있는 키워드
+        self._keyword_bigrams: Dict[str, Set[str]] = {}
+        for keyword in self._by_keyword:
+            for bigram in _bigrams(keyword):
+                self._keyword_bigrams.setdefault(bigram, set()).add(keyword)
+
+    @classmethod
+    def load(cls, directory: str = PROFESSOR_DATA_DIR) -> "ProfessorDirectory":
+        """디렉터리의 *.jsonl 읽기 - 교수 명단 인덱스(org_index)로 대학 / 학부를 채움"""
+        professors: List[Tuple[str, Dict[str, Any]]] = []
+        units: Dict[str, Tuple[str, str]] = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+            for doc in read_jsonl(path):
+                metadata = doc.get("metadata", {})
+                if metadata.get("entity") == "org_index":
+                    for professor_id in metadata.get("professor_ids", []):
+                        units[professor_id] = (metadata.get("college"), metadata.get("department"))
+                elif metadata.get("name_ko"):
+                    professors.append((doc.get("title", ""), metadata))
+
+        records = []
+        for title, metadata in professors:
+            professor_id = metadata.get("professor_id", "")
+            college, department = units.get(professor_id, (metadata.get("college"), metadata.get("department")))
+            # 제목: "양재형 교수 | 소프트웨어전공 | 종합 정보"
+            parts = [p.strip() for p in title.split("|")]
+            major = parts[1] if len(parts) > 1 else None
+            records.append(ProfessorRecord(
+                professor_id=professor_id,
+                name=metadata["name_ko"],
+                college=_value(college),
+                department=_value(department) or major,
+                major=_value(major),
+                email=_value(metadata.get("email")),
+                phone=_value(metadata.get("phone")),
+                office=_value(metadata.get("office")),
+                degree=_value(metadata.get("degree")),
+                keywords=_values(metadata.get("keywords")),
+                courses=_values(metadata.get("courses")),
+            ))
+        return cls(records)
+
+    def _to_items(self, records: Iterable[ProfessorRecord]) -> List[Dict[str, Any]]:
+        return [self._items[id(r)] for r in records]
+
+    def by_name(self, name: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """이름 조회 - 정확히 일치, 없으면 접두사 일치 ("김" → 김씨 교수, 최대 limit명)"""
+        key = _TITLE_SUFFIX.sub("", compact_key(name))
+        if not key:
+            return []
+        if key in self._by_name:
+            return self._to_items(self._by_name[key])
+
+        i = bisect.bisect_left(self._names, key)
+        records = []
+        while i < len(self._names) and self._names[i].startswith(key) and len(records) < limit:
+            records.extend(self._by_name[self._names[i]])
+            i += 1
+        return self._to_items(records[:limit])
+
+    def _unit(self, name: str) -> List[ProfessorRecord]:
+        """대학 / 학부 / 전공 이름 → 레코드 (정확히 일치 → 단위 뗀 이름 → 부분 일치한 단위 모두)"""
+        key = compact_key(name)
+        records = self._by_unit.get(key) or self._by_unit.get(_stem(name))
+        if records:
+            return records
+        stem = _stem(name)
+        if len(stem) < _MIN_PARTIAL_CHARS:
+            return []
+        seen, records = set(), []
+        for unit_key, unit_records in self._by_unit.items():
+            if stem in unit_key:
+                for record in unit_records:
+                    if id(record) not in seen:
+                        seen.add(id(record))
+                        records.append(record)
+        return records
+
+    def by_department(self, college: str, department: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        학과 조회 - department가 있으면 그 학부 / 전공, 없으면 college(대학 또는 학부 이름) 전체
+
+        department와 college를 함께 주면 college에 속한 교수로 좁힌다 (college가 맞지 않으면 department만 사용).
+        """
+        if not department:
+            return self._to_items(self._unit(college))
+
+        records = self._unit(department)
+        if college:
+            in_college = {id(r) for r in self._unit(college)}
+            narrowed = [r for r in records if id(r) in in_college]
+            records = narrowed or records
+        return self._to_items(records)
+
+    def _matching_keywords(self, term: str) -> Dict[str, int]:
+        """term과 일치하는 키워드 → 점수 (같으면 2, 한쪽이 다른 쪽에 포함되면 1)"""
+        matches: Dict[str, int] = {}
+        # term을 포함하는 키워드: term의 2-gram을 모두 가진 키워드 중에서 확인
+        candidates: Optional[Set[str]] = None
+        for bigram in _bigrams(term):
+            keywords = self._keyword_bigrams.get(bigram, set())
+            candidates = keywords if candidates is None else candidates & keywords
+            if not candidates:
+                break
+        for keyword in candidates or ():
+            if term in keyword:
+                matches[keyword] = 1
+        # term에 포함되는 키워드: term의 부분 문자열 (2자 이상)
+        for i in range(len(term)):
+            for j in range(i + _MIN_PARTIAL_CHARS, len(term) + 1):
+                if term[i:j] in self._by_keyword:
+                    matches.setdefault(term[i:j], 1)
+        if term in self._by_keyword:
+            matches[term] = 2
+        return matches
+
+    def by_research_field(self, field: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        연구분야 / 담당 과목 조회 - 질의 단어마다 일치하는 키워드를 찾아 많이 일치한 교수 순
+
+        단어가 키워드와 정확히 같으면 2점, 키워드에 포함되면(또는 키워드를 포함하면) 1점.
+        """
+        terms = [compact_key(t) for t in _FIELD_SEPARATORS.split(field) if t]
+        # 질의 전체도 한 단어로 ("인공 지능" → "인공지능")
+        whole = compact_key(field)
+        if whole and whole not in terms:
+            terms.append(whole)
+
+        scores: Dict[int, int] = {}
+        records: Dict[int, ProfessorRecord] = {}
+        for term in terms:
+            if len(term) < _MIN_PARTIAL_CHARS:
+                continue
+            matched: Dict[int, int] = {}
+            for keyword, score in self._matching_keywords(term).items():
+                for record in self._by_keyword[keyword]:
+                    records[id(record)] = record
+                    matched[id(record)] = max(matched.get(id(record), 0), score)
+            for key, score in matched.items():
+                scores[key] = scores.get(key, 0) + score
+
+        ranked = sorted(scores, key=lambda key: (-scores[key], records[key].name))
+        return self._to_items(records[key] for key in ranked[:limit])
+
+
+# 싱글톤 인스턴스
+_directory_instance: Optional[ProfessorDirectory] = None
+_directory_lock = threading.Lock()
+_load_failed = False
+
+
+def get_professor_directory() -> Optional[ProfessorDirectory]:
+    """ProfessorDirectory 싱글톤 (처음 호출할 때 로드, 데이터를 읽지 못하면 None - 원격 검색만 사용)"""
+    global _directory_instance, _load_failed
+
+    if _directory_instance is None and not _load_failed:
+        with _directory_lock:
+            if _directory_instance is None and not _load_failed:
+                try:
+                    directory = ProfessorDirectory.load()
+                    if not directory.records:
+                        raise ValueError("교수 레코드 없음")
+                    _directory_instance = directory
+                    logger.info("[ProfessorDirectory] 교수 %d명 로드", len(directory.records))
+                except (OSError, ValueError, KeyError) as e:
+                    _load_failed = True
+                    logger.warning("[ProfessorDirectory] 로컬 교수정보 로드 실패 (%s): %s", PROFESSOR_DATA_DIR, e)
+
+    return _directory_instance
@@ -1,13 +1,20 @@
 """
 강남대학교 교수정보 검색 도구 (Vertex AI Search 기반)
+
+이름 / 학과 / 연구분야 검색은 로컬 교수 디렉터리(professor_directory.py)에서 먼저 찾고,
+찾지 못했을 때와 자유 입력형 검색만 Vertex AI Search를 호출합니다.
 """
 
-import json
 from google.adk.tools import FunctionTool
-from google.auth import default
-from google.auth.transport.requests import Request
+from goole_adk.async_tools import async_tool
+from goole_adk.config import LOCAL_INDEX_ENABLED
+from goole_adk.local_index import local_response
+from goole_adk.result_projection import register_projection
+from goole_adk.search_client import vertex_ai_search
 from typing import Dict, Any, Optional
 
+from .professor_directory import get_professor_directory
+
 # Vertex AI Search 엔진 endpoint
 VERTEX_SEARCH_ENDPOINT = (
     "https://discoveryengine.googleapis.com/v1alpha/"
@@ -16,75 +23,47 @@ VERTEX_SEARCH_ENDPOINT = (
     "servingConfigs/default_search:search"
 )
 
-# 공통 함수: Vertex AI Search API 호출
+# 위 엔진이 검색하는 데이터스토어 (캐시 무효화 단위 - data/교수정보/upload_professor_AI_Search.py)
+DATA_STORE_ID = "kangnam-univ-professor-info-datastore"
+
+# 도구 응답에 남길 필드 (text는 metadata를 문장으로 풀어 쓴 중복이므로 제외)
+PROFESSOR_PROJECTION = register_projection("professor", {
+    "title": "fields.title",
+    "name": "fields.metadata.name_ko",
+    "college": "fields.metadata.college",
+    "department": "fields.metadata.department",
+    "email": "fields.metadata.email",
+    "phone": "fields.metadata.phone",
+    "office": "fields.metadata.office",
+    "degree": "fields.metadata.degree",
+    "keywords": "fields.metadata.keywords",
+    "courses": "fields.metadata.courses",
+    "professor_names": "fields.metadata.professor_names",
+    "snippet": "snippet",
+})
+
+# 공통 함수: Vertex AI Search API 호출 (공용 검색 클라이언트 사용)
 def vertex_ai_search_request(query: str, page_size: int = 10) -> Dict[str, Any]:
     """
-    Vertex AI Search API를 curl 호출 형태로 실행하고 결과를 반환.
+    교수정보 검색 엔진에 질의하고 결과를 반환.
     """
-    try:
-        # Google Auth 라이브러리로 access token 가져오기 (배포 환경 호환)
-        credentials, project = default()
-        if not credentials.valid:
-            credentials.refresh(Request())
-        token = credentials.token
-        
-        payload = {
-            "query": query,
-            "pageSize": page_size,
-            "queryExpansionSpec": {"condition": "AUTO"},
-            "spellCorrectionSpec": {"mode": "AUTO"},
-            "languageCode": "ko",
-            "userInfo": {"timeZone": "Asia/Seoul"}
-        }
-        
-        # API 호출
-        import requests
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        response = requests.post(VERTEX_SEARCH_ENDPOINT, headers=headers, json=payload)
-        result = response.json()
-        
-        # 정리된 형태로 반환
-        if "results" in result:
-            formatted_results = []
-            for i, item in enumerate(result["results"], start=1):
-                doc = item.get("document", {})
-                structured = doc.get("structData", {})
-                formatted_results.append({
-                    "rank": i,
-                    "title": doc.get("id"),
-                    "snippet": item.get("snippet", ""),
-                    "fields": structured
-                })
-            
-            return {
-                "status": "success",
-                "count": len(formatted_results),
-                "query": query,
-                "results": formatted_results,
-                "message": f"'{query}'에 대한 검색 결과 {len(formatted_results)}개를 찾았습니다."
-            }
-        else:
-            return {
-                "status": "error",
-                "query": query,
-                "message": "검색 결과가 없습니다.",
-                "raw_response": result
-            }
-        
-    except Exception as e:
-        return {
-            "status": "error",
-            "query": query,
-            "message": str(e)
-        }
-        
+    return vertex_ai_search(
+        VERTEX_SEARCH_ENDPOINT, DATA_STORE_ID, query, page_size=page_size, projection=PROFESSOR_PROJECTION
+    )
+
+def _local_directory():
+    """로컬 교수 디렉터리 (비활성화했거나 로드하지 못했으면 None)"""
+    return get_professor_directory() if LOCAL_INDEX_ENABLED else None
+
 def search_professor_by_name(query: str) -> Dict[str, Any]:
     """
     교수 이름으로 검색합니다.
     """
+    directory = _local_directory()
+    if directory is not None:
+        items = directory.by_name(query)
+        if items:
+            return local_response(query, items, "교수 정보")
     return vertex_ai_search_request(f"{query} 교수")
 
 def search_professor_by_department(college: str, department: Optional[str] = None) -> Dict[str, Any]:
@@ -95,6 +74,11 @@ def search_professor_by_department(college: str, department: Optional[str] = Non
         query = f"{college} {department} 교수"
     else:
         query = f"{college} 교수"
+    directory = _local_directory()
+    if directory is not None:
+        items = directory.by_department(college, department)
+        if items:
+            return local_response(query, items, "교수 정보")
     return vertex_ai_search_request(query)
 
 def search_professor_by_research_field(research_field: str) -> Dict[str, Any]:
@@ -102,6 +86,11 @@ def search_professor_by_research_field(research_field: str) -> Dict[str, Any]:
     연구분야로 교수 검색
     """
     query = f"{research_field} 연구 교수"
+    directory = _local_directory()
+    if directory is not None:
+        items = directory.by_research_field(research_field)
+        if items:
+            return local_response(query, items, "교수 정보")
     return vertex_ai_search_request(query)
 
 def search_professor_info(query: str) -> Dict[str, Any]:
@@ -111,10 +100,16 @@ def search_professor_info(query: str) -> Dict[str, Any]:
     return vertex_ai_search_request(query)
 
 
-search_professor_info_tool = FunctionTool(search_professor_info)
-search_professor_by_name_tool = FunctionTool(search_professor_by_name)
-search_professor_by_department_tool = FunctionTool(search_professor_by_department)
-search_professor_by_research_field_tool = FunctionTool(search_professor_by_research_field)
+# 비동기 버전 - 모델이 한 단계에서 여러 도구를 호출하면 동시에 실행됨 (async_tools.py)
+search_professor_info_async = async_tool(search_professor_info)
+search_professor_by_name_async = async_tool(search_professor_by_name)
+search_professor_by_department_async = async_tool(search_professor_by_department)
+search_professor_by_research_field_async = async_tool(search_professor_by_research_field)
+
+search_professor_info_tool = FunctionTool(search_professor_info_async)
+search_professor_by_name_tool = FunctionTool(search_professor_by_name_async)
+search_professor_by_department_tool = FunctionTool(search_professor_by_department_async)
+search_professor_by_research_field_tool = FunctionTool(search_professor_by_research_field_async)
 
 ALL_PROFESSOR_TOOLS = [
     search_professor_info_tool,
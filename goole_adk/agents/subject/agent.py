@@ -7,6 +7,7 @@
 import vertexai
 from google.adk.agents import Agent
 from goole_adk.config import PROJECT_ID, VERTEX_AI_LOCATION
+from goole_adk.tracing import trace_after_model, trace_after_tool, trace_before_model, trace_before_tool
 from .tools import ALL_SUBJECT_TOOLS
 
 # Vertex AI 초기화
@@ -183,6 +184,11 @@ subject_agent = Agent(
     
     자세한 주차별 계획이 궁금하시면 말씀해주세요!
     ''',
-    tools=ALL_SUBJECT_TOOLS
+    tools=ALL_SUBJECT_TOOLS,
+    # 트레이싱: LLM 호출 / 도구 실행 구간 기록 (TRACE_EXPORT_PATH 설정 시)
+    before_model_callback=trace_before_model,
+    after_model_callback=trace_after_model,
+    before_tool_callback=trace_before_tool,
+    after_tool_callback=trace_after_tool,
 )
 
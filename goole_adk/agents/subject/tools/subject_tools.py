@@ -9,7 +9,9 @@ import re
 from datetime import datetime
 from bs4 import BeautifulSoup
 from google.adk.tools import FunctionTool, ToolContext
+from goole_adk.async_tools import async_tool
 from typing import Dict, Any, Optional, List
+from goole_adk.tracing import traced
 
 
 # 강남대학교 강의계획서 시스템 Base URL
@@ -20,6 +22,7 @@ BASE_URL = "https://app.kangnam.ac.kr/knumis/sbr"
 # [Helper Functions] - reserch.py에서 가져온 파서 함수들
 # ==================================================================
 
+@traced("parse_syllabus_html")
 def parse_syllabus_html(html: str) -> Dict[str, Any]:
     """
     강의계획서 상세 HTML을 파싱하여 JSON(dict) 형태로 반환합니다.
@@ -216,6 +219,7 @@ def parse_syllabus_html(html: str) -> Dict[str, Any]:
     return data
 
 
+@traced("parse_course_list")
 def parse_course_list(html: str) -> List[Dict[str, str]]:
     """과목 목록 HTML을 파싱하여 과목 정보 리스트를 반환합니다."""
     soup = BeautifulSoup(html, "html.parser")
@@ -539,8 +543,12 @@ def get_subject_syllabus_detail(
 # ADK FunctionTool로 변환
 # ==================================================================
 
-search_subject_list_tool = FunctionTool(search_subject_list)
-get_subject_syllabus_detail_tool = FunctionTool(get_subject_syllabus_detail)
+# 비동기 버전 - 모델이 한 단계에서 여러 도구를 호출하면 동시에 실행됨 (async_tools.py)
+search_subject_list_async = async_tool(search_subject_list)
+get_subject_syllabus_detail_async = async_tool(get_subject_syllabus_detail)
+
+search_subject_list_tool = FunctionTool(search_subject_list_async)
+get_subject_syllabus_detail_tool = FunctionTool(get_subject_syllabus_detail_async)
 
 ALL_SUBJECT_TOOLS = [
     search_subject_list_tool,
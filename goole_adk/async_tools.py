@@ -0,0 +1,56 @@
+"""
+비동기 도구 래퍼 - 블로킹 도구를 전용 스레드 풀에서 실행
+
+ADK는 모델이 한 응답에서 함수 호출 여러 개를 내면 도구마다 태스크를 만들어 asyncio.gather로
+실행하지만, 동기 도구는 이벤트 루프를 막으므로 결국 하나씩 차례로 실행된다.
+async_tool()로 감싼 도구는 코루틴 함수가 되어 본문(검색 API 호출 등)을 스레드 풀에서 실행하므로
+같은 단계의 도구 호출들이 동시에 진행된다.
+
+  - 이름 / docstring / 시그니처는 원래 함수 그대로 (모델이 보는 도구 선언이 바뀌지 않음)
+  - contextvars를 복사해 실행하므로 트레이싱 span(@traced)이 도구 span 아래에 이어짐
+  - HTTP 호출은 기존 공용 클라이언트(search_client.py)의 keep-alive 연결 풀과 토큰 캐시를 그대로 사용
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from goole_adk.config import TOOL_EXECUTOR_THREADS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """도구 실행 스레드 풀 (프로세스 전체 공유, 처음 쓸 때 생성)"""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=TOOL_EXECUTOR_THREADS, thread_name_prefix="adk-tool"
+                )
+
+    return _executor
+
+
+def async_tool(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    블로킹 도구 함수의 비동기 버전
+
+    Example:
+        search_professor_info_async = async_tool(search_professor_info)
+        FunctionTool(search_professor_info_async)  # 도구 이름은 search_professor_info
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            get_tool_executor(),
+            functools.partial(context.run, func, *args, **kwargs),
+        )
+    return wrapper
@@ -0,0 +1,193 @@
+"""
+Google 자격 증명 공급자 - access token 캐시 + 만료 전 백그라운드 갱신
+
+도구 호출마다 google.auth.default()를 실행하고 만료된 토큰을 동기로 갱신하면
+검색 API 호출 앞에 자격 증명 탐색 / 토큰 발급 왕복이 붙는다.
+CredentialProvider는 프로세스 전체에서
+
+  - default()를 한 번만 실행하고 access token을 캐시
+  - 만료 AUTH_REFRESH_AHEAD_SECONDS 전에 백그라운드 스레드가 미리 갱신
+  - 캐시 토큰이 없거나 곧 만료되면 호출자가 직접 갱신하되, 락으로 한 번만 실행
+    (동시에 들어온 호출자들은 같은 갱신 결과를 기다림)
+
+호출자가 갱신을 기다려야 했던 횟수 / 시간은 stats()와 실행 중인 span의 auth_wait_ms로 남는다.
+"""
+
+import logging
+import math
+import threading
+import time
+from datetime import timezone
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from google.auth import default
+from google.auth.transport.requests import Request
+
+from goole_adk.config import AUTH_REFRESH_AHEAD_SECONDS
+from goole_adk.tracing import annotate
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+# 남은 유효 시간이 이보다 짧은 토큰은 쓰지 않고 갱신을 기다림 (초)
+_MIN_VALIDITY_SECONDS = 60
+
+# 백그라운드 갱신이 실패했거나 발급처가 같은 토큰을 돌려줬을 때 다시 시도할 때까지 (초)
+_RETRY_SECONDS = 30
+
+
+class CredentialProvider:
+    """access token 캐시와 백그라운드 갱신 (스레드 안전)"""
+
+    def __init__(self, refresh_ahead: float = AUTH_REFRESH_AHEAD_SECONDS, scopes=SCOPES):
+        """
+        Args:
+            refresh_ahead: 만료 몇 초 전에 백그라운드 갱신할지
+            scopes: default()에 넘길 OAuth 범위
+        """
+        self.refresh_ahead = refresh_ahead
+        self.scopes = scopes
+
+        self._credentials: Any = None
+        # (token, 만료 시각 epoch 초) - 한 번에 교체해서 읽는 쪽이 락 없이 일관된 값을 봄
+        self._cached: Tuple[Optional[str], float] = (None, 0.0)
+        # 토큰 발급 요청도 keep-alive 세션 재사용
+        self._request = Request(requests.Session())
+        self._refresh_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.refreshes = 0
+        self.background_refreshes = 0
+        self.failures = 0
+
+    def token(self) -> str:
+        """
+        유효한 access token 반환
+
+        캐시 토큰이 충분히 남아 있으면 바로 반환하고, 아니면 갱신이 끝날 때까지 기다린다.
+
+        Raises:
+            google.auth.exceptions.GoogleAuthError: 자격 증명 탐색 / 토큰 발급 실패
+        """
+        with self._stats_lock:
+            self.calls += 1
+
+        token, expires_at = self._cached
+        if token and time.time() < expires_at - _MIN_VALIDITY_SECONDS:
+            return token
+
+        start = time.perf_counter()
+        with self._refresh_lock:
+            # 기다리는 동안 다른 호출자가 이미 갱신했을 수 있음
+            token, expires_at = self._cached
+            if not (token and time.time() < expires_at - _MIN_VALIDITY_SECONDS):
+                self._refresh_locked()
+                token = self._cached[0]
+        waited = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.waits += 1
+            self.wait_seconds += waited
+        annotate(auth_wait_ms=round(waited * 1000, 1))
+        return token
+
+    def invalidate(self, token: str) -> None:
+        """서버가 거절한 토큰 폐기 (다음 token() 호출이 새로 발급)"""
+        with self._refresh_lock:
+            if self._cached[0] == token:
+                self._cached = (None, 0.0)
+
+    def _refresh_locked(self) -> None:
+        """토큰 갱신 (_refresh_lock을 잡은 상태에서 호출)"""
+        try:
+            if self._credentials is None:
+                self._credentials, _ = default(scopes=self.scopes)
+            self._credentials.refresh(self._request)
+        except Exception:
+            with self._stats_lock:
+                self.failures += 1
+            raise
+
+        expiry = self._credentials.expiry
+        if expiry is None:
+            expires_at = math.inf
+        else:
+            # google.auth의 expiry는 tz 없는 UTC
+            expires_at = expiry.replace(tzinfo=timezone.utc).timestamp()
+        self._cached = (self._credentials.token, expires_at)
+
+        with self._stats_lock:
+            self.refreshes += 1
+        self._start_refresher()
+
+    def _start_refresher(self) -> None:
+        """백그라운드 갱신 스레드 시작 (한 번만)"""
+        if self._refresher is None and self._cached[1] != math.inf:
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="credential-refresher", daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """만료 refresh_ahead초 전마다 토큰 갱신"""
+        while True:
+            delay = self._cached[1] - self.refresh_ahead - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._refresh_lock:
+                # 그 사이 호출자가 갱신했으면 다음 주기로
+                if self._cached[1] - self.refresh_ahead - time.time() > 0:
+                    continue
+                try:
+                    self._refresh_locked()
+                except Exception as e:
+                    logger.warning("[Auth] 백그라운드 토큰 갱신 실패: %s", e)
+                else:
+                    with self._stats_lock:
+                        self.background_refreshes += 1
+
+            # 실패했거나 메타데이터 서버가 아직 기존 토큰을 주면 바로 다시 돌지 않도록 대기
+            if self._cached[1] - self.refresh_ahead - time.time() <= 0:
+                time.sleep(_RETRY_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        """토큰 요청 / 대기 / 갱신 통계"""
+        expires_at = self._cached[1]
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "waits": self.waits,
+                "wait_ratio": round(self.waits / self.calls, 4) if self.calls else 0.0,
+                "wait_ms_total": round(self.wait_seconds * 1000, 1),
+                "refreshes": self.refreshes,
+                "background_refreshes": self.background_refreshes,
+                "failures": self.failures,
+                "expires_in_seconds": (
+                    round(expires_at - time.time()) if self._cached[0] and expires_at != math.inf else None
+                ),
+            }
+
+
+# 싱글톤 인스턴스
+_provider_instance: Optional[CredentialProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_credential_provider() -> CredentialProvider:
+    """CredentialProvider 싱글톤 인스턴스 반환"""
+    global _provider_instance
+
+    if _provider_instance is None:
+        with _provider_lock:
+            if _provider_instance is None:
+                _provider_instance = CredentialProvider()
+
+    return _provider_instance
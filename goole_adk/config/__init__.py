@@ -54,4 +54,46 @@ GCS_LIST_BLOBS_MAX_RESULTS = 100  # Max results for blob listing
 
 # Logging configuration
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
\ No newline at end of file
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Tracing - LLM 호출 / 도구 실행 span을 기록할 파일 (비어 있으면 비활성화)
+TRACE_EXPORT_PATH = os.environ.get("TRACE_EXPORT_PATH", "")
+TRACE_EXPORT_FORMAT = os.environ.get("TRACE_EXPORT_FORMAT", "jsonl")  # "jsonl" 또는 "otlp"
+
+# Discovery Engine 검색 클라이언트 (search_client.py) - 모든 Agent가 keep-alive 세션 하나를 공유
+SEARCH_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("SEARCH_CONNECT_TIMEOUT_SECONDS", "3"))
+SEARCH_READ_TIMEOUT_SECONDS = float(os.environ.get("SEARCH_READ_TIMEOUT_SECONDS", "10"))
+SEARCH_MAX_RETRIES = int(os.environ.get("SEARCH_MAX_RETRIES", "2"))  # 첫 시도 제외
+SEARCH_BACKOFF_BASE_MS = float(os.environ.get("SEARCH_BACKOFF_BASE_MS", "200"))
+SEARCH_BACKOFF_MAX_MS = float(os.environ.get("SEARCH_BACKOFF_MAX_MS", "2000"))
+SEARCH_POOL_MAXSIZE = int(os.environ.get("SEARCH_POOL_MAXSIZE", "16"))  # 호스트당 유지할 연결 수
+
+# 검색 결과 캐시 (search_cache.py) - 키: 엔드포인트 + 정규화한 검색어 + page_size
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "2048"))  # 0이면 비활성화
+SEARCH_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+SEARCH_CACHE_TTL_SECONDS = float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "21600"))  # 6시간
+# 디스크 계층 (SQLite 파일, 비우면 메모리만) - 콜드 스타트 후에도 유지
+# SEARCH_DATA_VERSIONS_URI 없이 켜면 데이터를 다시 임포트해도 항목이 무효화되지 않고
+# SEARCH_CACHE_PERSIST_TTL_SECONDS(기본 7일)가 지날 때까지 이전 결과가 남음
+SEARCH_CACHE_SQLITE_PATH = os.environ.get("SEARCH_CACHE_SQLITE_PATH", "")
+SEARCH_CACHE_PERSIST_TTL_SECONDS = float(os.environ.get("SEARCH_CACHE_PERSIST_TTL_SECONDS", "604800"))  # 7일
+# 데이터스토어별 데이터 버전 파일 (data_version.py) - 임포트 스크립트가 올리고 Agent가 주기적으로 읽음
+# 비우면 버전 확인 안 함 (캐시 항목은 TTL로만 만료) - 예: gs://{GCS_BUCKET_NAME}/rag_data/search_data_versions.json
+SEARCH_DATA_VERSIONS_URI = os.environ.get("SEARCH_DATA_VERSIONS_URI", "")
+SEARCH_DATA_VERSION_CHECK_SECONDS = float(os.environ.get("SEARCH_DATA_VERSION_CHECK_SECONDS", "300"))
+
+# 도구 응답 투영 (result_projection.py) - snippet / content 등 텍스트 필드 최대 글자 수 (0이면 자르지 않음)
+PROJECTION_MAX_TEXT_CHARS = int(os.environ.get("PROJECTION_MAX_TEXT_CHARS", "1200"))
+
+# 로컬 데이터 인덱스 - 패키지에 함께 배포되는 data/ 파일을 메모리에 올려 구조화된 조회를 네트워크 없이 처리
+# (찾지 못한 조회와 자유 입력형 검색만 Discovery Engine 사용)
+LOCAL_DATA_DIR = os.environ.get(
+    "LOCAL_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+LOCAL_INDEX_ENABLED = os.environ.get("LOCAL_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# 비동기 도구 실행 스레드 수 (async_tools.py) - 한 단계에서 동시에 실행할 수 있는 블로킹 도구 호출 수
+TOOL_EXECUTOR_THREADS = int(os.environ.get("TOOL_EXECUTOR_THREADS", str(SEARCH_POOL_MAXSIZE)))
+
+# Google 자격 증명 (auth.py) - access token을 만료 몇 초 전에 백그라운드로 갱신할지
+AUTH_REFRESH_AHEAD_SECONDS = float(os.environ.get("AUTH_REFRESH_AHEAD_SECONDS", "300"))
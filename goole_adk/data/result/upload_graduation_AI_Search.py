@@ -11,6 +11,12 @@
 
 from google.api_core.client_options import ClientOptions
 from google.cloud import discoveryengine
+import os
+import sys
+
+# 저장소 루트 (goole_adk 패키지 import용 - 데이터 버전 기록)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from goole_adk.data_version import bump_data_version
 
 PROJECT_ID = "kangnam-backend"
 LOCATION = "global"
@@ -68,6 +74,14 @@ def import_graduation_docs():
         print("=" * 60)
         print(f"📊 결과: {result}")
         print("=" * 60)
+
+        # 검색 결과 캐시에서 이 데이터스토어 항목만 무효화
+        version = bump_data_version(DATA_STORE_ID)
+        if version is None:
+            print("⚠️ SEARCH_DATA_VERSIONS_URI가 설정되지 않아 검색 결과 캐시를 무효화하지 않았습니다 "
+                  "(Agent와 같은 값으로 설정하고 다시 실행하거나, 캐시 항목이 TTL로 만료될 때까지 기다리세요)")
+        else:
+            print(f"🔖 데이터 버전 갱신: {DATA_STORE_ID} → {version}")
         
         print("\n🎉 졸업요건 데이터가 성공적으로 임포트되었습니다!")
         print("\n🔍 메타데이터 검색 가능 필드:")
@@ -9,6 +9,11 @@ from google.api_core.client_options import ClientOptions
 from google.cloud import discoveryengine
 from google.cloud import storage
 import os
+import sys
+
+# 저장소 루트 (goole_adk 패키지 import용 - 데이터 버전 기록)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from goole_adk.data_version import bump_data_version
 
 PROJECT_ID = "kangnam-backend"
 LOCATION = "global"
@@ -89,6 +94,14 @@ def import_building_docs():
     print("\n✅ 데이터 가져오기 완료!")
     print(result)
 
+    # 검색 결과 캐시에서 이 데이터스토어 항목만 무효화
+    version = bump_data_version(DATA_STORE_ID)
+    if version is None:
+        print("⚠️ SEARCH_DATA_VERSIONS_URI가 설정되지 않아 검색 결과 캐시를 무효화하지 않았습니다 "
+              "(Agent와 같은 값으로 설정하고 다시 실행하거나, 캐시 항목이 TTL로 만료될 때까지 기다리세요)")
+    else:
+        print(f"🔖 데이터 버전 갱신: {DATA_STORE_ID} → {version}")
+
 if __name__ == "__main__":
     # Step 1: GCS 업로드
     upload_to_gcs()
@@ -0,0 +1,202 @@
+"""
+데이터스토어 데이터 버전 - 검색 결과 캐시 무효화 기준
+
+검색 결과 캐시(search_cache.py)의 항목은 (데이터스토어, 데이터 버전)으로 구분된다.
+데이터 임포트 스크립트(goole_adk/data/**/upload_*_AI_Search.py, upload_*_to_ai_search.py)가
+임포트를 마치면 bump_data_version()으로 해당 데이터스토어의 버전만 올리고,
+실행 중인 Agent는 SEARCH_DATA_VERSIONS_URI를 주기적으로 읽어 바뀐 데이터스토어의 캐시만 버린다.
+
+버전 파일은 {"데이터스토어 ID": "버전 문자열"} JSON이며 gs://bucket/object 또는 로컬 경로를 쓸 수 있다.
+SEARCH_DATA_VERSIONS_URI를 설정한 경우에만 사용하며 (기본은 비어 있음 - 요청 경로에서 GCS를 읽지 않음),
+파일이 없거나 읽지 못하면 마지막으로 읽은 버전(처음이면 "0")을 그대로 쓴다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from goole_adk.config import SEARCH_DATA_VERSION_CHECK_SECONDS, SEARCH_DATA_VERSIONS_URI
+
+logger = logging.getLogger(__name__)
+
+# 버전 파일이 없거나 데이터스토어 항목이 없을 때
+DEFAULT_VERSION = "0"
+
+# 런타임에서 버전 파일 읽기 타임아웃 (연결, 응답) - 재시도 없이 한 번만 시도
+_FETCH_TIMEOUT = (1.0, 2.0)
+
+
+def _split_gcs_uri(uri: str):
+    bucket, _, name = uri[len("gs://"):].partition("/")
+    return bucket, name
+
+
+class DataVersions:
+    """데이터스토어별 현재 데이터 버전 (주기적으로 버전 파일을 다시 읽음, 스레드 안전)"""
+
+    def __init__(self, uri: str = SEARCH_DATA_VERSIONS_URI, check_interval: float = SEARCH_DATA_VERSION_CHECK_SECONDS):
+        """
+        Args:
+            uri: 버전 파일 (gs://... 또는 로컬 경로, 비우면 항상 DEFAULT_VERSION)
+            check_interval: 버전 파일을 다시 읽는 주기 (초)
+        """
+        self.uri = uri
+        self.check_interval = check_interval
+
+        self._versions: Dict[str, str] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        # 통계
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    def current(self, datastore: str) -> str:
+        """
+        데이터스토어의 현재 버전
+
+        처음 한 번은 버전 파일을 읽을 때까지 기다리고, 이후에는 주기가 지나면
+        백그라운드 스레드가 다시 읽는 동안 마지막 값을 반환한다.
+        """
+        if not self.uri:
+            return DEFAULT_VERSION
+
+        if self._checked_at is None:
+            with self._lock:
+                if self._checked_at is None:
+                    self._refresh()
+        elif time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                threading.Thread(target=self._background_refresh, name="data-version-check", daemon=True).start()
+
+        return self._versions.get(datastore, DEFAULT_VERSION)
+
+    def _background_refresh(self) -> None:
+        try:
+            self._refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _refresh(self) -> None:
+        """버전 파일 읽기 - 실패하면 기존 버전 유지"""
+        self.fetches += 1
+        try:
+            versions = self._fetch()
+        except Exception as e:
+            self.fetch_errors += 1
+            logger.warning("[DataVersion] 버전 파일 읽기 실패 (%s): %s", self.uri, e)
+        else:
+            if versions != self._versions:
+                logger.info("[DataVersion] 데이터 버전: %s", versions)
+            self._versions = versions
+        self._checked_at = time.monotonic()
+
+    def _fetch(self) -> Dict[str, str]:
+        if not self.uri.startswith("gs://"):
+            if not os.path.exists(self.uri):
+                return {}
+            with open(self.uri, encoding="utf-8") as f:
+                return {str(k): str(v) for k, v in json.load(f).items()}
+
+        # 런타임: 검색 클라이언트의 keep-alive 세션과 토큰 캐시로 GCS JSON API 호출
+        from goole_adk.auth import get_credential_provider
+        from goole_adk.search_client import get_search_client
+
+        bucket, name = _split_gcs_uri(self.uri)
+        response = get_search_client().session.get(
+            f"https://storage.googleapis.com/storage/v1/b/{bucket}/o/{quote(name, safe='')}",
+            params={"alt": "media"},
+            headers={"Authorization": f"Bearer {get_credential_provider().token()}"},
+            timeout=_FETCH_TIMEOUT,
+        )
+        if response.status_code == 404:
+            return {}
+        response.raise_for_status()
+        return {str(k): str(v) for k, v in response.json().items()}
+
+    def snapshot(self) -> Dict[str, str]:
+        return dict(self._versions)
+
+
+def bump_data_version(datastore: str, uri: str = SEARCH_DATA_VERSIONS_URI) -> Optional[str]:
+    """
+    데이터스토어의 데이터 버전을 새로 발급해 버전 파일에 기록 (임포트 스크립트에서 호출)
+
+    다른 데이터스토어의 버전은 그대로 두므로 해당 데이터스토어의 캐시 항목만 무효화된다.
+    gs:// 파일은 generation 조건부 업로드로 동시에 실행된 스크립트끼리 덮어쓰지 않는다.
+
+    Returns:
+        새 버전 문자열 (UTC 타임스탬프) - uri가 비어 있으면 None (기록하지 않음 = 캐시 무효화 안 됨)
+    """
+    if not uri:
+        return None
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+
+    if not uri.startswith("gs://"):
+        versions = {}
+        if os.path.exists(uri):
+            with open(uri, encoding="utf-8") as f:
+                versions = json.load(f)
+        versions[datastore] = version
+        directory = os.path.dirname(uri)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(uri, "w", encoding="utf-8") as f:
+            json.dump(versions, f, ensure_ascii=False, indent=2)
+        return version
+
+    from google.api_core.exceptions import NotFound, PreconditionFailed
+    from google.cloud import storage
+
+    bucket_name, name = _split_gcs_uri(uri)
+    blob = storage.Client().bucket(bucket_name).blob(name)
+    for _ in range(5):
+        try:
+            blob.reload()
+            generation = blob.generation
+            versions = json.loads(blob.download_as_text(if_generation_match=generation))
+        except NotFound:
+            generation = 0  # 아직 없을 때만 생성
+            versions = {}
+        except PreconditionFailed:
+            continue
+        versions[datastore] = version
+        try:
+            blob.upload_from_string(
+                json.dumps(versions, ensure_ascii=False, indent=2),
+                content_type="application/json",
+                if_generation_match=generation,
+            )
+            return version
+        except PreconditionFailed:
+            # 그 사이 다른 스크립트가 기록함 - 다시 읽어서 재시도
+            continue
+
+    raise RuntimeError(f"데이터 버전 기록 실패 (동시 갱신 충돌): {uri}")
+
+
+# 싱글톤 인스턴스
+_versions_instance: Optional[DataVersions] = None
+_versions_lock = threading.Lock()
+
+
+def get_data_versions() -> DataVersions:
+    """DataVersions 싱글톤 인스턴스 반환"""
+    global _versions_instance
+
+    if _versions_instance is None:
+        with _versions_lock:
+            if _versions_instance is None:
+                _versions_instance = DataVersions()
+
+    return _versions_instance
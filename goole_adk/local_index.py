@@ -0,0 +1,52 @@
+"""
+로컬 데이터 인덱스 공용 함수
+
+졸업요건 / 교수 / 건물·행정부서 도구는 패키지에 포함된 data/ 파일을 메모리 인덱스로 만들어
+구조화된 조회를 네트워크 없이 처리한다 (각 Agent의 tools/*_index.py, *_directory.py).
+여기에는 인덱스들이 같이 쓰는 데이터 읽기와 도구 응답 형태만 둔다.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, Iterator, List
+
+from goole_adk.tracing import annotate
+
+logger = logging.getLogger(__name__)
+
+# 응답의 source 값 (Vertex AI Search 결과와 구분)
+LOCAL_SOURCE = "local_index"
+
+_SPACES = re.compile(r"\s+")
+
+
+def compact_key(text: str) -> str:
+    """인덱스 키: 공백 제거 + 소문자 ("샬롬 관" → "샬롬관")"""
+    return _SPACES.sub("", text or "").lower()
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """JSONL 파일의 객체들 (빈 줄 무시)"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def local_response(query: str, items: List[Dict[str, Any]], label: str = "검색 결과") -> Dict[str, Any]:
+    """
+    로컬 인덱스 결과를 검색 도구 응답 형태로 (vertex_ai_search()와 같은 키 - cached는 항상 False + source)
+
+    items는 인덱스가 보관하는 dict일 수 있으므로 복사해서 rank를 붙인다.
+    """
+    annotate(local_index=True)
+    return {
+        "status": "success",
+        "count": len(items),
+        "query": query,
+        "results": [{"rank": i, **item} for i, item in enumerate(items, start=1)],
+        "message": f"'{query}'에 대한 {label} {len(items)}개를 찾았습니다.",
+        "cached": False,
+        "source": LOCAL_SOURCE
+    }
@@ -0,0 +1,183 @@
+"""
+검색 결과 투영(projection) - 도구 응답을 모델에 필요한 필드만 남겨 줄임
+
+도구 응답은 매 단계 Gemini 입력으로 다시 들어가므로, 검색 결과 항목의 불필요한 필드가
+그대로 입력 토큰과 지연 시간이 된다. 도구마다 필드 화이트리스트(Projection)를 두고
+
+  - 화이트리스트에 없는 필드(원본 structData 전체, 중복 metadata, source_file 등) 제거
+  - None / 빈 값 / "정보없음" 같은 자리표시 값 제거 (리스트 안의 항목도)
+  - 긴 텍스트 필드(snippet, content 등)는 PROJECTION_MAX_TEXT_CHARS자로 자름
+
+호출마다 줄어든 바이트 / 추정 토큰 수를 span(annotate)에 기록하고 도구별로 누적한다 (projection_stats()).
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from goole_adk.config import PROJECTION_MAX_TEXT_CHARS
+from goole_adk.tracing import annotate
+
+logger = logging.getLogger(__name__)
+
+# 값이 없음을 뜻하는 자리표시 문자열 (데이터 원본에서 쓰는 표기들)
+PLACEHOLDER_VALUES = frozenset({"", "정보없음", "정보 없음", "없음", "N/A", "n/a", "-", "null", "None"})
+
+# 잘린 텍스트 끝에 붙는 표시
+TRUNCATION_MARK = "…"
+
+
+def is_placeholder(value: Any) -> bool:
+    return isinstance(value, str) and value.strip() in PLACEHOLDER_VALUES
+
+
+def prune(value: Any) -> Any:
+    """None / 자리표시 값 / 빈 컨테이너를 재귀적으로 제거 (모두 비면 None)"""
+    if isinstance(value, Mapping):
+        pruned = {k: prune(v) for k, v in value.items()}
+        pruned = {k: v for k, v in pruned.items() if v is not None}
+        return pruned or None
+    if isinstance(value, (list, tuple)):
+        pruned = [prune(v) for v in value]
+        pruned = [v for v in pruned if v is not None]
+        return pruned or None
+    if value is None or is_placeholder(value):
+        return None
+    return value
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    대략적인 토큰 수 추정 (토크나이저 호출 없이)
+
+    ASCII는 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰으로 센다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _lookup(item: Mapping[str, Any], path: str) -> Any:
+    """점으로 구분한 경로의 값 ("fields.metadata.college")"""
+    value: Any = item
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part)
+    return value
+
+
+class Projection:
+    """도구 하나의 결과 항목 화이트리스트 (출력 필드 → 원본 경로)"""
+
+    def __init__(
+        self,
+        name: str,
+        fields: Mapping[str, str],
+        text_fields: Sequence[str] = ("snippet", "content"),
+        max_text_chars: Optional[int] = None,
+    ):
+        """
+        Args:
+            name: 통계 / 캐시 키에 쓰는 이름 (도구 모듈 단위)
+            fields: {출력 필드: 원본 경로} - 원본은 format_document() 결과 기준 ("fields.metadata.name_ko")
+            text_fields: 길이 상한을 적용할 출력 필드
+            max_text_chars: 텍스트 필드 최대 글자 수 (기본: PROJECTION_MAX_TEXT_CHARS, 0 이하면 자르지 않음)
+        """
+        self.name = name
+        self.fields = dict(fields)
+        self.text_fields = frozenset(text_fields)
+        self.max_text_chars = PROJECTION_MAX_TEXT_CHARS if max_text_chars is None else max_text_chars
+
+        # 통계
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.tokens_saved = 0
+        self.truncated = 0
+
+    def project(self, item: Mapping[str, Any]) -> Dict[str, Any]:
+        """결과 항목 하나를 화이트리스트 필드만 남긴 dict로 변환 (rank는 유지)"""
+        projected: Dict[str, Any] = {}
+        if "rank" in item:
+            projected["rank"] = item["rank"]
+
+        for key, path in self.fields.items():
+            value = prune(_lookup(item, path))
+            if value is None:
+                continue
+            if key in self.text_fields and isinstance(value, str) and 0 < self.max_text_chars < len(value):
+                value = value[: self.max_text_chars].rstrip() + TRUNCATION_MARK
+                with self._lock:
+                    self.truncated += 1
+            # 다른 필드와 같은 값이면 중복 제거 (예: title == name)
+            if any(value == v for k, v in projected.items() if k != "rank"):
+                continue
+            projected[key] = value
+        return projected
+
+    def apply(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """결과 목록 투영 + 줄어든 바이트 / 추정 토큰 수 기록 (span, 누적 통계)"""
+        projected = [self.project(item) for item in results]
+
+        before = json.dumps(results, ensure_ascii=False)
+        after = json.dumps(projected, ensure_ascii=False)
+        bytes_in = len(before.encode("utf-8"))
+        bytes_out = len(after.encode("utf-8"))
+        tokens_saved = max(0, estimate_tokens(before) - estimate_tokens(after))
+
+        with self._lock:
+            self.calls += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.tokens_saved += tokens_saved
+
+        annotate(
+            projection=self.name,
+            result_bytes=bytes_out,
+            result_bytes_saved=bytes_in - bytes_out,
+            result_tokens_saved=tokens_saved,
+        )
+        logger.debug(
+            "[Projection] %s: %d → %d bytes (추정 %d 토큰 절감)", self.name, bytes_in, bytes_out, tokens_saved
+        )
+        return projected
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "saved_ratio": round(1 - self.bytes_out / self.bytes_in, 3) if self.bytes_in else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "avg_tokens_saved": round(self.tokens_saved / self.calls, 1) if self.calls else 0.0,
+                "truncated_fields": self.truncated,
+            }
+
+
+# 이름 → Projection (도구 모듈이 import될 때 등록)
+_projections: Dict[str, Projection] = {}
+_registry_lock = threading.Lock()
+
+
+def register_projection(
+    name: str,
+    fields: Mapping[str, str],
+    text_fields: Sequence[str] = ("snippet", "content"),
+    max_text_chars: Optional[int] = None,
+) -> Projection:
+    """Projection 생성 후 등록 (같은 이름이면 기존 것 반환 - 모듈 재로드 대비)"""
+    with _registry_lock:
+        if name not in _projections:
+            _projections[name] = Projection(name, fields, text_fields, max_text_chars)
+        return _projections[name]
+
+
+def projection_stats() -> Dict[str, Dict[str, Any]]:
+    """도구별 누적 통계 (호출 수, 줄어든 바이트 / 추정 토큰 수 등)"""
+    with _registry_lock:
+        projections = list(_projections.values())
+    return {projection.name: projection.stats() for projection in projections}
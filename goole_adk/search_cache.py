@@ -0,0 +1,282 @@
+"""
+검색 결과 캐시 - Discovery Engine 검색 응답 재사용
+
+졸업요건 / 교수 / 건물·행정부서 데이터는 1년에 몇 번만 바뀌므로, 같은 검색어의 결과를
+보관해 네트워크 호출 없이 돌려준다. 성공한 검색 결과만 저장한다.
+
+키는 (데이터스토어, 데이터 버전, 엔드포인트, 응답 투영, page_size, 정규화한 검색어)이다.
+데이터 임포트 스크립트가 데이터스토어 버전을 올리면(data_version.py) 그 데이터스토어의
+항목만 더 이상 맞지 않게 되고, 디스크 계층에서는 다음 조회 때 일괄 삭제된다.
+
+  - 메모리 계층: TTL + 항목 수 / 총 바이트 상한, 가장 오래 쓰이지 않은 항목부터 제거 (LRU)
+  - 디스크 계층 (SEARCH_CACHE_SQLITE_PATH): 콜드 스타트 후에도 남는 SQLite 파일.
+    메모리에서 미스하면 조회하고, 히트하면 메모리로 올린다.
+  - 값은 JSON 문자열로 보관 (도구가 결과 dict를 고쳐도 캐시가 오염되지 않음)
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from goole_adk.config import (
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_PERSIST_TTL_SECONDS,
+    SEARCH_CACHE_SQLITE_PATH,
+    SEARCH_CACHE_TTL_SECONDS,
+)
+from goole_adk.data_version import get_data_versions
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 검색어 정규화
+
+    "샬롬관  위치?" 와 "샬롬관 위치" 가 같은 키가 되도록
+    NFC 정규화 → 소문자 → 구두점/기호 제거 → 공백 하나로 정리
+    """
+    text = unicodedata.normalize("NFC", query).lower()
+    text = "".join(
+        " " if unicodedata.category(ch)[0] in ("P", "S") else ch
+        for ch in text
+    )
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def cache_key(endpoint: str, query: str, page_size: int, variant: str = "") -> str:
+    """variant: 같은 검색이라도 응답 형태가 다른 경우 구분 (도구 응답 투영 이름 등)"""
+    return f"{endpoint}|{variant}|{page_size}|{normalize_query(query)}"
+
+
+class DiskCache:
+    """SQLite 파일 캐시 계층 (스레드 안전, 연결 하나를 락으로 공유)"""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # 잃어도 다시 검색하면 되는 데이터 - fsync 최소화
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, datastore TEXT NOT NULL, version TEXT NOT NULL, "
+            "data TEXT NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_datastore ON entries (datastore, version)")
+        self._lock = threading.Lock()
+        # 만료 항목 정리 (시작할 때 한 번)
+        self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM entries WHERE key=? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, datastore: str, version: str, data: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, datastore, version, data, time.time() + self.ttl_seconds),
+            )
+
+    def purge_other_versions(self, datastore: str, version: str) -> int:
+        """데이터스토어의 현재 버전이 아닌 항목 삭제 - 삭제한 항목 수 반환"""
+        with self._lock:
+            return self._db.execute(
+                "DELETE FROM entries WHERE datastore=? AND version<>?", (datastore, version)
+            ).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class SearchCache:
+    """TTL + LRU 검색 결과 캐시 + 선택적 디스크 계층 (스레드 안전 - 비동기 도구는 스레드 풀에서 실행됨)"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        disk: Optional[DiskCache] = None,
+        versions: Any = None,
+    ):
+        """
+        Args:
+            max_entries: 메모리 계층 최대 항목 수 (0 이하면 메모리 계층 비활성화)
+            max_bytes: 메모리 계층 결과(JSON) 총 크기 상한 (UTF-8 바이트)
+            ttl_seconds: 메모리 계층 항목 유효 시간
+            disk: 디스크 계층 (없으면 메모리만)
+            versions: 데이터스토어 버전 조회 (기본: get_data_versions())
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk = disk
+        self.versions = versions or get_data_versions()
+
+        # key → (JSON, 만료 시각, 바이트 수)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # 디스크 계층을 마지막으로 정리한 버전 (데이터스토어별)
+        self._purged_versions: Dict[str, str] = {}
+
+        # 통계
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.disk is not None
+
+    def versioned_key(self, datastore: str, key: str) -> Tuple[str, str]:
+        """(현재 버전, 버전이 들어간 키) - 버전이 바뀌었으면 디스크의 옛 버전 항목 정리"""
+        version = self.versions.current(datastore)
+        if self.disk is not None and self._purged_versions.get(datastore) != version:
+            self._purged_versions[datastore] = version
+            removed = self.disk.purge_other_versions(datastore, version)
+            if removed:
+                self.invalidated += removed
+                logger.info("[SearchCache] %s 버전 %s - 디스크 항목 %d개 무효화", datastore, version, removed)
+        return version, f"{datastore}@{version}|{key}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (key는 versioned_key 결과) - 히트하면 결과 사본 반환"""
+        data = None
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                data = entry[0]
+
+        if data is None and self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._put_memory(key, data)
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        return json.loads(data)
+
+    def put(self, key: str, datastore: str, version: str, result: Dict[str, Any]) -> None:
+        """검색 결과 저장 (메모리 계층은 하나가 max_bytes보다 크면 저장하지 않음)"""
+        if not self.enabled:
+            return
+
+        data = json.dumps(result, ensure_ascii=False)
+        self._put_memory(key, data)
+        if self.disk is not None:
+            self.disk.put(key, datastore, version, data)
+
+    def _put_memory(self, key: str, data: str) -> None:
+        if self.max_entries <= 0:
+            return
+
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (data, time.monotonic() + self.ttl_seconds, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (히트율, 제거 수, 디스크 계층 등)"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidated": self.invalidated,
+                "data_versions": self.versions.snapshot(),
+            }
+        if self.disk is not None:
+            stats["disk_entries"] = len(self.disk)
+        return stats
+
+
+# 싱글톤 인스턴스
+_cache_instance: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """SearchCache 싱글톤 인스턴스 반환"""
+    global _cache_instance
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                disk = None
+                if SEARCH_CACHE_SQLITE_PATH:
+                    try:
+                        disk = DiskCache(SEARCH_CACHE_SQLITE_PATH, SEARCH_CACHE_PERSIST_TTL_SECONDS)
+                    except sqlite3.Error as e:
+                        # 디스크 캐시를 못 열어도 검색은 동작해야 함
+                        logger.warning("[SearchCache] 디스크 캐시 비활성화 (%s): %s", SEARCH_CACHE_SQLITE_PATH, e)
+                _cache_instance = SearchCache(
+                    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+                    max_bytes=SEARCH_CACHE_MAX_BYTES,
+                    ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+                    disk=disk,
+                )
+
+    return _cache_instance
@@ -0,0 +1,291 @@
+"""
+Discovery Engine(Vertex AI Search) 공용 검색 클라이언트
+
+졸업요건 / 교수 / 기본정보 Agent의 검색 도구가 모두 이 모듈을 사용합니다.
+
+  - 프로세스 전체가 requests.Session 하나를 공유해 keep-alive 연결을 재사용
+    (도구 호출마다 TCP / TLS 핸드셰이크를 새로 하지 않음)
+  - 호출마다 연결 / 응답 타임아웃 (SEARCH_CONNECT_TIMEOUT_SECONDS, SEARCH_READ_TIMEOUT_SECONDS)
+  - 연결 오류, 타임아웃, 429 / 5xx는 지수 백오프 + full jitter로 재시도 (SEARCH_MAX_RETRIES)
+  - 요청 / 재시도 / 실패 수와 연결 풀 상태(새로 연 연결 수, 유휴 연결 수)를 stats()로 제공
+
+검색 결과 항목은 format_item(기본: format_document)으로 정리한 뒤, 도구가 projection을 넘기면
+필요한 필드만 남깁니다(result_projection.py - 자리표시 값 제거, 텍스트 길이 상한).
+성공한 검색 결과는 search_cache.py의 캐시(메모리 TTL / LRU + 선택적 SQLite 디스크 계층)에
+데이터스토어 버전과 함께 보관되며, 응답의 cached 필드로 구분됩니다.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from goole_adk.auth import get_credential_provider
+from goole_adk.result_projection import Projection
+from goole_adk.search_cache import cache_key, get_search_cache
+
+from goole_adk.config import (
+    SEARCH_BACKOFF_BASE_MS,
+    SEARCH_BACKOFF_MAX_MS,
+    SEARCH_CONNECT_TIMEOUT_SECONDS,
+    SEARCH_MAX_RETRIES,
+    SEARCH_POOL_MAXSIZE,
+    SEARCH_READ_TIMEOUT_SECONDS,
+)
+from goole_adk.tracing import annotate, traced
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class SearchClient:
+    """keep-alive 연결 풀을 공유하는 Discovery Engine 검색 클라이언트 (스레드 안전)"""
+
+    def __init__(
+        self,
+        connect_timeout: float = SEARCH_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = SEARCH_READ_TIMEOUT_SECONDS,
+        max_retries: int = SEARCH_MAX_RETRIES,
+        backoff_base: float = SEARCH_BACKOFF_BASE_MS / 1000,
+        backoff_max: float = SEARCH_BACKOFF_MAX_MS / 1000,
+        pool_maxsize: int = SEARCH_POOL_MAXSIZE,
+    ):
+        """
+        Args:
+            connect_timeout: 연결 타임아웃 (초)
+            read_timeout: 응답 타임아웃 (초)
+            max_retries: 첫 시도 이후 재시도 횟수
+            backoff_base: 첫 재시도 백오프 상한 (초, 시도마다 2배)
+            backoff_max: 백오프 최대값 (초)
+            pool_maxsize: 호스트당 유지할 keep-alive 연결 수 (동시 도구 호출 수 이상 권장)
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        # 재시도는 직접 처리 (urllib3 재시도는 jitter / 메트릭이 없음)
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """attempt번째 재시도 전 대기 시간 - full jitter, 429의 Retry-After는 상한 안에서 존중"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def post_json(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        endpoint에 JSON POST 후 응답 JSON 반환 (재시도 포함)
+
+        재시도하지 않는 4xx 응답은 본문 JSON을 그대로 반환한다 (호출하는 쪽에서 error 처리).
+
+        Raises:
+            requests.RequestException: 재시도를 모두 소진한 연결 오류 / 타임아웃 / 429·5xx
+        """
+        start = time.perf_counter()
+        # 캐시된 access token (만료 전에 백그라운드로 갱신됨)
+        credentials = get_credential_provider()
+        token = credentials.token()
+        attempt = 0
+        reauthorized = False
+        try:
+            while True:
+                response = None
+                with self._stats_lock:
+                    self.attempts += 1
+                try:
+                    response = self.session.post(
+                        endpoint,
+                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                        json=payload,
+                        timeout=self.timeout,
+                    )
+                    if response.status_code == 401 and not reauthorized:
+                        # 캐시 토큰이 서버에서 폐기된 경우 - 한 번만 새로 발급받아 재시도
+                        credentials.invalidate(token)
+                        token = credentials.token()
+                        reauthorized = True
+                        continue
+                    if response.status_code not in RETRY_STATUS:
+                        annotate(attempts=attempt + 1, http_status=response.status_code)
+                        return response.json()
+                    response.raise_for_status()
+                except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                    if isinstance(e, requests.Timeout):
+                        with self._stats_lock:
+                            self.timeouts += 1
+                    if attempt >= self.max_retries:
+                        with self._stats_lock:
+                            self.failures += 1
+                        annotate(attempts=attempt + 1, http_status=getattr(response, "status_code", None))
+                        raise
+                    delay = self._backoff(attempt, response)
+
+                attempt += 1
+                with self._stats_lock:
+                    self.retries += 1
+                time.sleep(delay)
+        finally:
+            with self._stats_lock:
+                self.requests += 1
+                self.total_seconds += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 / 재시도 통계 + 연결 풀 상태"""
+        opened = reused = idle = 0
+        for key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            # num_connections: 새로 연 연결 수, num_requests: 풀을 거친 요청 수
+            opened += pool.num_connections
+            reused += max(0, pool.num_requests - pool.num_connections)
+            # 풀 큐에는 빈 자리(None)도 들어 있으므로 실제 연결만 셈
+            idle += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "avg_ms": round(self.total_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+                "pool": {
+                    "connections_opened": opened,
+                    "requests_on_reused_connections": reused,
+                    "idle_connections": idle,
+                },
+            }
+
+
+# 싱글톤 인스턴스
+_client_instance: Optional[SearchClient] = None
+_client_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """SearchClient 싱글톤 인스턴스 반환 (도구 호출은 여러 스레드에서 동시에 올 수 있음)"""
+    global _client_instance
+
+    if _client_instance is None:
+        with _client_lock:
+            if _client_instance is None:
+                _client_instance = SearchClient()
+
+    return _client_instance
+
+
+def format_document(item: Dict[str, Any]) -> Dict[str, Any]:
+    """기본 결과 항목 포맷: 문서 ID, 스니펫, 구조화 필드 (교수 / 기본정보 Agent)"""
+    doc = item.get("document", {})
+    return {
+        "title": doc.get("id"),
+        "snippet": item.get("snippet", ""),
+        "fields": doc.get("structData", {})
+    }
+
+
+@traced("vertex_ai_search_request")
+def vertex_ai_search(
+    endpoint: str,
+    datastore: str,
+    query: str,
+    format_item: Callable[[Dict[str, Any]], Dict[str, Any]] = format_document,
+    page_size: int = 10,
+    projection: Optional[Projection] = None,
+) -> Dict[str, Any]:
+    """
+    Vertex AI Search API를 호출하고 도구 응답 형태로 정리해 반환합니다.
+
+    Args:
+        endpoint: servingConfigs/...:search 엔드포인트
+        datastore: 엔진이 검색하는 데이터스토어 ID (캐시 무효화 단위, data_version.py)
+        query: 검색 질문
+        format_item: 검색 결과 항목(result) → 도구 응답 항목 (rank는 여기서 붙임, 기본: format_document)
+        page_size: 반환할 결과 개수 (기본값: 10)
+        projection: 결과 항목 필드 화이트리스트 (없으면 format_item 결과 그대로)
+
+    Returns:
+        {"status", "count", "query", "results", "message", "cached"} - 실패 시 status "error"
+        (cached: 검색 결과 캐시에서 꺼낸 결과인지)
+    """
+    cache = get_search_cache()
+    cached = None
+    if cache.enabled:
+        variant = projection.name if projection is not None else ""
+        version, key = cache.versioned_key(datastore, cache_key(endpoint, query, page_size, variant))
+        cached = cache.get(key)
+    annotate(cached=cached is not None)
+    if cached is not None:
+        # 정규화 전 검색어가 달랐을 수 있으므로 이번 호출 기준으로 다시 채움
+        cached["query"] = query
+        cached["message"] = f"'{query}'에 대한 검색 결과 {cached['count']}개를 찾았습니다."
+        cached["cached"] = True
+        return cached
+
+    payload = {
+        "query": query,
+        "pageSize": page_size,
+        "queryExpansionSpec": {"condition": "AUTO"},
+        "spellCorrectionSpec": {"mode": "AUTO"},
+        "languageCode": "ko",
+        "userInfo": {"timeZone": "Asia/Seoul"}
+    }
+
+    try:
+        result = get_search_client().post_json(endpoint, payload)
+
+        if "results" not in result:
+            return {
+                "status": "error",
+                "query": query,
+                "message": "검색 결과가 없습니다.",
+                "raw_response": result,
+                "cached": False
+            }
+
+        formatted_results = [
+            {"rank": i, **format_item(item)}
+            for i, item in enumerate(result["results"], start=1)
+        ]
+        if projection is not None:
+            formatted_results = projection.apply(formatted_results)
+        response = {
+            "status": "success",
+            "count": len(formatted_results),
+            "query": query,
+            "results": formatted_results,
+            "message": f"'{query}'에 대한 검색 결과 {len(formatted_results)}개를 찾았습니다.",
+            "cached": False
+        }
+        # 성공한 결과만 캐시
+        if cache.enabled:
+            cache.put(key, datastore, version, response)
+        return response
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "query": query,
+            "message": f"검색 중 오류 발생: {str(e)}",
+            "cached": False
+        }
@@ -0,0 +1,281 @@
+"""
+ADK Agent 트레이싱 콜백 (Tracing Callbacks)
+
+에이전트 LLM 호출(before/after_model_callback)과 도구 실행(before/after_tool_callback)을
+span으로 기록해 JSONL 파일로 내보냅니다. TRACE_EXPORT_PATH가 비어 있으면 아무것도
+기록하지 않습니다.
+
+trace ID는 세션 ID에서, 부모 span ID는 invocation_id에서 결정적으로 만들어
+agent-backend의 트레이서(agent-backend/services/tracing.py)와 같은 규칙을 따릅니다.
+두 쪽 파일을 합치면 백엔드 요청 → 엔진 이벤트 → LLM 호출 / 도구 실행 →
+도구 내부 HTTP 호출(@traced)이 하나의 트레이스로 이어집니다.
+"""
+
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from goole_adk.config import TRACE_EXPORT_FORMAT, TRACE_EXPORT_PATH
+
+SERVICE_NAME = "goole-adk"
+
+# 끝나지 않은 LLM / 도구 span 보관 상한 (after 콜백이 불리지 않은 경우 대비)
+_MAX_PENDING = 1000
+
+
+def trace_id_for_session(session_id: str) -> str:
+    """세션 ID → trace ID (agent-backend와 같은 규칙)"""
+    return hashlib.sha256(f"session:{session_id}".encode("utf-8")).hexdigest()[:32]
+
+
+def span_id_for_invocation(invocation_id: str) -> str:
+    """ADK invocation_id → 에이전트 호출 span ID (agent-backend와 같은 규칙)"""
+    return hashlib.sha256(f"invocation:{invocation_id}".encode("utf-8")).hexdigest()[:16]
+
+
+# ============================================================================
+# Span / 익스포터
+# ============================================================================
+
+class Span:
+    """구간 하나 - end() 시점에 파일로 기록"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def end(self) -> None:
+        _export(self, time.time_ns())
+
+
+_file = None
+_file_lock = threading.Lock()
+
+
+def _export(span: Span, end_ns: int) -> None:
+    """끝난 span을 한 줄로 추가 (jsonl: 평탄한 JSON, otlp: OTLP/JSON)"""
+    global _file
+
+    if TRACE_EXPORT_FORMAT == "otlp":
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [
+                {"key": k, "value": {"stringValue": str(v)}} for k, v in span.attributes.items()
+            ],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        record = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [otlp_span]}],
+            }]
+        }
+    else:
+        record = {
+            "service": SERVICE_NAME,
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_span_id": span.parent_id,
+            "name": span.name,
+            "start_ns": span.start_ns,
+            "end_ns": end_ns,
+            "duration_ms": (end_ns - span.start_ns) / 1e6,
+            "attributes": span.attributes,
+            "status": "error" if span.error else "ok",
+            "status_message": span.error,
+        }
+
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    try:
+        with _file_lock:
+            if _file is None:
+                directory = os.path.dirname(TRACE_EXPORT_PATH)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                _file = open(TRACE_EXPORT_PATH, "a", encoding="utf-8", buffering=1)
+            _file.write(line + "\n")
+    except OSError:
+        # 트레이스 기록 실패가 에이전트 실행을 깨뜨리지 않도록 무시
+        pass
+
+
+# 도구 실행 중인 span - 도구 내부의 @traced 함수가 부모로 사용
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "goole_adk_current_span", default=None
+)
+
+# 진행 중인 span (LLM: (invocation_id, agent_name), 도구: function_call_id)
+_pending: "OrderedDict[Any, Any]" = OrderedDict()
+
+
+def _remember(key: Any, value: Any) -> None:
+    _pending[key] = value
+    while len(_pending) > _MAX_PENDING:
+        _pending.popitem(last=False)
+
+
+def _start(name: str, context: Any, attributes: Dict[str, Any]) -> Span:
+    """콜백 컨텍스트의 세션 / invocation 기준으로 span 시작"""
+    session = context.session
+    attributes = {"session_id": session.id, "invocation_id": context.invocation_id, **attributes}
+    return Span(
+        name,
+        trace_id_for_session(session.id),
+        span_id_for_invocation(context.invocation_id),
+        attributes,
+    )
+
+
+# ============================================================================
+# LLM 호출 콜백
+# ============================================================================
+
+def trace_before_model(callback_context, llm_request):
+    """LLM 호출 시작 (before_model_callback) - 항상 None 반환"""
+    if not TRACE_EXPORT_PATH:
+        return None
+
+    span = _start("llm.call", callback_context, {
+        "agent": callback_context.agent_name,
+        "model": getattr(llm_request, "model", None) or "",
+    })
+    _remember((callback_context.invocation_id, callback_context.agent_name), span)
+    return None
+
+
+def trace_after_model(callback_context, llm_response):
+    """LLM 호출 종료 (after_model_callback) - 호출한 함수 / 토큰 수 기록"""
+    if not TRACE_EXPORT_PATH:
+        return None
+
+    span = _pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    if span is None:
+        return None
+
+    content = getattr(llm_response, "content", None)
+    calls = [
+        part.function_call.name
+        for part in (getattr(content, "parts", None) or [])
+        if getattr(part, "function_call", None)
+    ]
+    if calls:
+        span.attributes["function_calls"] = ",".join(calls)
+
+    usage = getattr(llm_response, "usage_metadata", None)
+    if usage is not None:
+        span.attributes["prompt_tokens"] = getattr(usage, "prompt_token_count", None)
+        span.attributes["output_tokens"] = getattr(usage, "candidates_token_count", None)
+
+    if getattr(llm_response, "error_code", None):
+        span.error = f"{llm_response.error_code}: {llm_response.error_message}"
+
+    span.end()
+    return None
+
+
+# ============================================================================
+# 도구 실행 콜백
+# ============================================================================
+
+def trace_before_tool(tool, args, tool_context):
+    """도구 실행 시작 (before_tool_callback) - 항상 None 반환"""
+    if not TRACE_EXPORT_PATH:
+        return None
+
+    span = _start(f"tool.{tool.name}", tool_context, {
+        "agent": tool_context.agent_name,
+        "args": json.dumps(args, ensure_ascii=False, default=str)[:500],
+    })
+    token = _current_span.set(span)
+    _remember(tool_context.function_call_id, (span, token))
+    return None
+
+
+def trace_after_tool(tool, args, tool_context, tool_response):
+    """도구 실행 종료 (after_tool_callback) - 결과 상태 / 개수 기록"""
+    if not TRACE_EXPORT_PATH:
+        return None
+
+    pending = _pending.pop(tool_context.function_call_id, None)
+    if pending is None:
+        return None
+
+    span, token = pending
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        _current_span.set(None)
+
+    if isinstance(tool_response, dict):
+        span.attributes["status"] = tool_response.get("status", "")
+        if "count" in tool_response:
+            span.attributes["count"] = tool_response["count"]
+        if tool_response.get("status") == "error":
+            span.error = str(tool_response.get("message", ""))
+
+    span.end()
+    return None
+
+
+# ============================================================================
+# 도구 내부 구간
+# ============================================================================
+
+def traced(name: str) -> Callable:
+    """
+    도구 내부 함수(검색 API 호출 등)를 실행 중인 도구 span의 하위 span으로 기록
+
+    도구 밖(테스트 스크립트 등)에서 호출되면 새 트레이스로 기록한다.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACE_EXPORT_PATH:
+                return func(*args, **kwargs)
+
+            parent = _current_span.get()
+            span = Span(
+                name,
+                parent.trace_id if parent else os.urandom(16).hex(),
+                parent.span_id if parent else None,
+                {},
+            )
+            token = _current_span.set(span)
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, dict) and result.get("status") == "error":
+                    span.error = str(result.get("message", ""))
+                return result
+            except Exception as e:
+                span.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                _current_span.reset(token)
+                span.end()
+        return wrapper
+    return decorator
+
+
+def annotate(**attributes: Any) -> None:
+    """실행 중인 span(@traced 또는 도구 span)에 속성 추가 - 트레이싱이 꺼져 있으면 무시"""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)